@@ -1,120 +1,265 @@
 import os
-import cv2
+import re
+import json
 import time
 import base64
-import subprocess
 import threading
 import queue
 from random import choice
 from datetime import datetime
-from PIL import Image
 import io
-import ollama
-import pyttsx3
-import speech_recognition as sr
 from dotenv import load_dotenv
+from ollama_backend import get_backend
+from metrics import get_metrics
+from observation_pipeline import ObservationPipeline
+from inference_scheduler import INTERACTIVE, ON_DEMAND, PERIODIC, RequestCancelled, RequestScheduler
+from singleflight import SingleFlight, request_key
+from observation_memory import ObservationMemory
+from change_detector import FrameChangeDetector
+from analysis_cache import AnalysisCache, context_key
+from streaming_speech import StreamingSpeechParser
+from frame_encoder import FrameEncoder, ResolutionPolicy, image_size
+from camera_sources import open_camera
+from speech_backends import RecognitionWorker, create_speech_backend
+from audio_capture import AudioCapture, open_audio_stream
+from mic_calibration import MicCalibration, device_key
+from temporal_analysis import FrameHistory, MosaicBuilder, mosaic_prompt, temporal_prompt
+from startup import CAMERA_INIT_TIMEOUT, MIC_INIT_TIMEOUT, TTS_INIT_TIMEOUT, WARMUP_TIMEOUT, \
+    ComponentInitializer
+from tts_worker import NARRATION, REPLY, TTS_BACKEND, start_tts
+from lazy_import import lazy_import
+
+cv2 = lazy_import('cv2')
+np = lazy_import('numpy')
+Image = lazy_import('PIL.Image')
+sr = lazy_import('speech_recognition')
 
 # Load environment variables
 load_dotenv()
 
 CAPTURE_INTERVAL = int(os.getenv('CAPTURE_INTERVAL', 2))  # Faster observations
 MODEL_NAME = os.getenv('MODEL_NAME', 'llama3.2-vision')
+CAMERA_SOURCE = os.getenv('CAMERA_SOURCE', '0')  # Device index, RTSP/HTTP URL or video file
 USE_SAY_COMMAND = os.getenv('USE_SAY_COMMAND', 'true').lower() == 'true'
 ENABLE_TTS = os.getenv('ENABLE_TTS', 'true').lower() == 'true'
+WARMUP_MODEL = os.getenv('WARMUP_MODEL', 'true').lower() == 'true'
+PIPELINE_MODE = os.getenv('PIPELINE_MODE', 'false').lower() == 'true'
+PIPELINE_CAPTURE_INTERVAL = float(os.getenv('PIPELINE_CAPTURE_INTERVAL', 0.1))
+CHANGE_GATING = os.getenv('CHANGE_GATING', 'true').lower() == 'true'
+CHANGE_MAD_THRESHOLD = float(os.getenv('CHANGE_MAD_THRESHOLD', 4.0))
+CHANGE_MOTION_THRESHOLD = float(os.getenv('CHANGE_MOTION_THRESHOLD', 0.02))
+CHANGE_MAX_SKIPS = int(os.getenv('CHANGE_MAX_SKIPS', 15))
+ANALYSIS_CACHE = os.getenv('ANALYSIS_CACHE', 'true').lower() == 'true'
+ANALYSIS_CACHE_SIZE = int(os.getenv('ANALYSIS_CACHE_SIZE', 128))
+ANALYSIS_CACHE_TTL = float(os.getenv('ANALYSIS_CACHE_TTL', 600))
+ANALYSIS_CACHE_DISTANCE = int(os.getenv('ANALYSIS_CACHE_DISTANCE', 6))
+ANALYSIS_CACHE_FILE = os.getenv('ANALYSIS_CACHE_FILE') or None
+STREAM_RESPONSES = os.getenv('STREAM_RESPONSES', 'false').lower() == 'true'
+FAST_ENCODE = os.getenv('FAST_ENCODE', 'true').lower() == 'true'
+JPEG_QUALITY = int(os.getenv('JPEG_QUALITY', 75))
+RESOLUTION_MODE = os.getenv('RESOLUTION_MODE', 'fixed').lower()  # 'fixed' or 'auto'
+MAX_IMAGE_SIDE = int(os.getenv('MAX_IMAGE_SIDE', 0))  # 0 = camera resolution
+PIXEL_BUDGET = int(os.getenv('PIXEL_BUDGET', 0))  # Max pixels per image, 0 = unlimited
+LATENCY_TARGET = float(os.getenv('LATENCY_TARGET', 3.0))  # Seconds per analysis in auto mode
+ANALYSIS_LOG = os.getenv('ANALYSIS_LOG') or None  # Optional JSONL log of analyses
+
+TEMPORAL_MODE = os.getenv('TEMPORAL_MODE', 'off').lower()  # 'off', 'multi' (several images) or 'mosaic' (one grid)
+TEMPORAL_FRAMES = int(os.getenv('TEMPORAL_FRAMES', 4))  # Frames per request, including the current one
+TEMPORAL_SELECTION = os.getenv('TEMPORAL_SELECTION', 'recent').lower()  # 'recent' or 'keyframes'
+TEMPORAL_INTERVAL = float(os.getenv('TEMPORAL_INTERVAL', 1.0))  # Min seconds between frames in the window
+KEYFRAME_THRESHOLD = float(os.getenv('KEYFRAME_THRESHOLD', 8.0))  # Grey-level change that makes a keyframe
+MOSAIC_PIXEL_BUDGET = int(os.getenv('MOSAIC_PIXEL_BUDGET', 786432))  # Pixels in the mosaic image (1024x768)
+AUDIO_CAPTURE_MODE = os.getenv('AUDIO_CAPTURE_MODE', 'listen').lower()  # 'listen' (per phrase) or 'stream' (VAD)
+PERIODIC_HOLDOFF = float(os.getenv('PERIODIC_HOLDOFF', 3))  # Seconds observations hold off after you speak
 
-# Model check function removed for simpler startup
+# Fallback lines said word for word, rendered into the speech cache at startup
+FIXED_PHRASES = [
+    "I'm analyzing what I see.",
+    "Observation complete.",
+    "I'm not sure how to respond to that.",
+    "Sorry, that took me too long to think about.",
+]
+
+# Questions answered from a frame captured there and then, rather than from the last observation
+LOOK_REQUEST = re.compile(r"\b(what do you see|what can you see|what's happening|what is happening|look at|"
+                          r"describe)\b", re.IGNORECASE)
 
 class AIEyeAssistant:
-    def __init__(self, demo_mode=False):
+    def __init__(self, demo_mode=False, background_listening=True, camera_source=CAMERA_SOURCE):
         print("🤖 Initializing AI Eye Assistant...")
 
+        self.backend = get_backend()  # One shared Ollama client
+        self.metrics = get_metrics()  # Per-stage latency histograms and counters
+        # Model calls take turns: replies to the user, then "what do you see", then scheduled observations
+        self.requests = RequestScheduler(holdoff=PERIODIC_HOLDOFF, metrics=self.metrics)
+
         self.demo_mode = demo_mode
         self.cap = None
+        self.camera_lock = threading.Lock()  # The observation loop and on-demand looks share the camera
+        self.observing = None  # Frame the periodic observation is analyzing right now
+        self.scene_flights = SingleFlight()  # Identical scene analyses in flight run once
+        self.answering = None  # Question being answered, so a repeat of it isn't answered twice
+        self.repeats_skipped = 0
+        self.latest_frame = None  # Most recent webcam frame, shown by the main thread in pipeline mode
         self.previous_analysis = None
         self.observation_count = 0
-        self.activity_history = []  # Track recent activities for better predictions
+        # Recent observations plus a rolling summary of older ones, the history replies are given
+        self.memory = ObservationMemory(summarize=self.summarize_observations)
+        self.last_analysis_info = {}  # How the latest analysis was produced (model, gated, ...)
+        self.change_detector = None
+        if CHANGE_GATING:
+            self.change_detector = FrameChangeDetector(
+                mad_threshold=CHANGE_MAD_THRESHOLD,
+                motion_threshold=CHANGE_MOTION_THRESHOLD,
+                max_skips=CHANGE_MAX_SKIPS,
+            )
+        self.analysis_cache = None
+        if ANALYSIS_CACHE:
+            self.analysis_cache = AnalysisCache(
+                max_entries=ANALYSIS_CACHE_SIZE,
+                ttl=ANALYSIS_CACHE_TTL,
+                max_distance=ANALYSIS_CACHE_DISTANCE,
+                path=ANALYSIS_CACHE_FILE,
+            )
         self.use_say_command = USE_SAY_COMMAND
         self.enable_tts = ENABLE_TTS
-        self.tts_engine = None
+        self.tts = None  # TTSWorker: one thread and one long-lived engine speak everything
+        self.stream_responses = STREAM_RESPONSES
+        # Encode webcam frames straight to JPEG bytes instead of BGR → PIL → base64
+        self.frame_encoder = FrameEncoder(JPEG_QUALITY) if FAST_ENCODE else None
+        self.frame_buffer = None  # Reused capture buffer for the serial loop
+        self.resolution_policy = ResolutionPolicy(
+            mode=RESOLUTION_MODE,
+            max_side=MAX_IMAGE_SIDE,
+            pixel_budget=PIXEL_BUDGET,
+            latency_target=LATENCY_TARGET,
+        )
+        self.frame_history = None  # Recent frames sent together in temporal mode
+        self.mosaic_builder = MosaicBuilder(MOSAIC_PIXEL_BUDGET) if TEMPORAL_MODE == 'mosaic' else None
+        if TEMPORAL_MODE in ('multi', 'mosaic'):
+            self.frame_history = FrameHistory(
+                size=TEMPORAL_FRAMES,
+                selection=TEMPORAL_SELECTION,
+                min_interval=TEMPORAL_INTERVAL,
+                keyframe_threshold=KEYFRAME_THRESHOLD,
+            )
 
         # Speech recognition setup
         self.recognizer = sr.Recognizer()
         self.microphone = sr.Microphone()
         self.speech_queue = queue.Queue()
         self.listening = False
+        self.mic_calibration = MicCalibration()  # Per-device energy threshold reused across restarts
+        self.mic_key = None
+        # The recognition engine loads once here; phrases are transcribed off the capture thread
+        self.speech_backend = create_speech_backend(recognizer=self.recognizer)
+        self.recognition_worker = None
+        self.audio_capture = None  # Continuous stream + VAD in AUDIO_CAPTURE_MODE=stream
 
-        print("🎤 Setting up speech recognition...")
-        # Initialize speech recognition
-        self.init_speech_recognition()
+        if not self.enable_tts:
+            print("🔇 Text-to-Speech disabled")
 
-        # Start listening thread
-        self.start_listening()
+        if demo_mode:
+            print("🎨 Running in DEMO mode - using test images instead of webcam")
 
-        # Show TTS status
+        # Camera, microphone, speech engine and model start together and report as each comes up;
+        # the model keeps loading in the background (multi-camera mode manages its own cameras)
+        initializer = ComponentInitializer(self.metrics)
+        if not demo_mode and camera_source is not None:
+            initializer.add('Camera', lambda: open_camera(camera_source), CAMERA_INIT_TIMEOUT,
+                            fallback=self.camera_unavailable, late=lambda opened: opened[0].release())
+        initializer.add('Microphone', self.init_speech_recognition, MIC_INIT_TIMEOUT,
+                        fallback=self.microphone_unavailable)
         if self.enable_tts:
-            tts_method = "macOS 'say' command" if self.use_say_command else "pyttsx3"
-            print(f"🔊 Text-to-Speech enabled using {tts_method}")
-        else:
-            print("🔇 Text-to-Speech disabled")
+            initializer.add('Speech output', self.start_tts, TTS_INIT_TIMEOUT, fallback=self.tts_unavailable,
+                            late=lambda tts: tts.stop())
+        if WARMUP_MODEL:
+            initializer.add('Model', self.warm_up_model, WARMUP_TIMEOUT, background=True)
+        self.components = initializer.run()
 
-        # Initialize TTS engine if needed
-        if self.enable_tts and not self.use_say_command:
-            try:
-                self.tts_engine = pyttsx3.init()
-            except Exception as e:
-                print(f"⚠️  pyttsx3 initialization failed: {e}")
-                print("Falling back to macOS 'say' command")
-                self.use_say_command = True
-
-        # Fun opening lines
-        self.opening_lines = [
-            "👁️ AI Eyes activated! I'm now your digital observer...",
-            "🔍 Ready to see the world through AI vision!",
-            "🤖 Your AI companion is watching and learning!",
-            "📹 Webcam connected - Let's see what you're up to!",
-        ]
+        tts = self.components.get('Speech output')
+        if tts and tts.ready:
+            self.tts = tts.result
+            print(f"🔊 Text-to-Speech enabled using {self.tts.backend.label}")
+        camera = self.components.get('Camera')
+        if camera and camera.ready:
+            self.cap, frame = camera.result
+            print(f"📐 Camera resolution: {frame.shape[1]}x{frame.shape[0]}")
+            # Fun opening lines
+            print(choice([
+                "👁️ AI Eyes activated! I'm now your digital observer...",
+                "🔍 Ready to see the world through AI vision!",
+                "🤖 Your AI companion is watching and learning!",
+                "📹 Webcam connected - Let's see what you're up to!",
+            ]))
 
-        print("📹 Setting up camera...")
-        if demo_mode:
-            print("🎨 Running in DEMO mode - using test images instead of webcam")
-        else:
-            print(choice(self.opening_lines))
+        # Start listening and conversation threads (the asyncio runtime runs its own tasks instead)
+        if background_listening:
+            self.start_listening()
+            self.start_conversation()
 
-        print(f"📊 Analyzing every {CAPTURE_INTERVAL} seconds...")
+        if self.enable_tts and self.stream_responses:
+            print("⚡ Streaming mode: speaking each sentence as soon as it's generated")
 
-        # Initialize camera only if not in demo mode
-        if not demo_mode:
-            self.cap = cv2.VideoCapture(0)
-            if not self.cap.isOpened():
-                print("❌ Error: Could not open webcam")
-                print("💫 This could be due to:")
-                print("   • Camera permission not granted")
-                print("   • Camera is being used by another app")
-                print("   • No camera available")
-                print()
-                print("🎨 Switching to demo mode...")
-                self.demo_mode = True
-
-        print("✅ AI Eye Assistant initialization complete!")
+        print(f"📊 Analyzing every {CAPTURE_INTERVAL} seconds...")
+        print(f"📐 Input resolution: {self.resolution_policy.describe()}")
         print("🎯 Ready to observe and interact!")
         print("👁️  I'll continuously observe through the camera")
         print("🗣️  I'll listen for your voice and respond")
         print("💬 Try saying: 'Hello', 'What do you see?', 'How are you?'")
         print("⏹️  Press Ctrl+C to stop\n")
             
-    def speak(self, text):
-        """Speak the given text using the selected TTS engine"""
-        if self.use_say_command:
-            # Use macOS say command (non-blocking)
-            subprocess.Popen(['say', text])
-        elif self.tts_engine:
-            # Use pyttsx3 (can be blocking, so run in a thread)
-            def run_tts():
-                self.tts_engine.say(text)
-                self.tts_engine.runAndWait()
-            tts_thread = threading.Thread(target=run_tts)
-            tts_thread.start()
-    
+    def camera_unavailable(self, error):
+        print("💫 The webcam could not be used. This could be due to:")
+        print("   • Camera permission not granted")
+        print("   • Camera is being used by another app")
+        print("   • No camera available")
+        print("🎨 Switching to demo mode...")
+        self.demo_mode = True
+
+    def microphone_unavailable(self, error):
+        print("Speech input will not be available.")
+
+    def start_tts(self):
+        """Start the speech worker (USE_SAY_COMMAND=false prefers pyttsx3 over 'say')"""
+        name = 'pyttsx3' if TTS_BACKEND == 'auto' and not self.use_say_command else TTS_BACKEND
+        tts = start_tts(name, self.metrics)
+        tts.prerender(FIXED_PHRASES)
+        return tts
+
+    def tts_unavailable(self, error):
+        print("🔇 Continuing without Text-to-Speech")
+        self.enable_tts = False
+
+    def warm_up_model(self):
+        """Load the model now so the first observation doesn't pay for it"""
+        if not self.backend.warmup(MODEL_NAME):
+            raise RuntimeError("the first observation will try again")
+
+    def speak(self, text, priority=NARRATION):
+        """Queue text for the speech worker; REPLY interrupts narration"""
+        if self.tts:
+            with self.metrics.timer('tts_dispatch'):
+                self.tts.say(text, priority)
+
+    def generate_streaming(self, parser, stage='inference', **kwargs):
+        """Stream a generate call through a speech parser and return the full text
+
+        Time spent in the parser is recorded as 'parse', the rest as `stage`.
+        """
+        started = time.perf_counter()
+        parse_time = 0.0
+        for chunk in self.backend.generate(stream=True, **kwargs):
+            parse_started = time.perf_counter()
+            parser.feed(chunk.get('response', ''))
+            parse_time += time.perf_counter() - parse_started
+        parse_started = time.perf_counter()
+        text = parser.finish()
+        parse_time += time.perf_counter() - parse_started
+        self.metrics.observe(stage, time.perf_counter() - started - parse_time)
+        self.metrics.observe('parse', parse_time)
+        return text
+
     def prepare_speech_text(self, analysis):
         """Extract and prepare key parts of analysis for speech"""
         try:
@@ -164,8 +309,9 @@ class AIEyeAssistant:
     def frame_to_image(self, frame):
         """Convert OpenCV frame to PIL Image"""
         # Convert BGR to RGB
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        return Image.fromarray(rgb_frame)
+        with self.metrics.timer('color_convert'):
+            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            return Image.fromarray(rgb_frame)
         
     def image_to_base64(self, image):
         """Convert PIL Image to base64 string for Ollama"""
@@ -174,11 +320,20 @@ class AIEyeAssistant:
         img_str = base64.b64encode(buffered.getvalue()).decode()
         return img_str
     
-    def analyze_scene(self, image):
-        """Send image to Ollama for analysis"""
-        try:
-            # More focused prompt for better predictions
-            prompt = f"""
+    def encode_image(self, image):
+        """Encode a PIL image or BGR frame for Ollama (raw JPEG bytes on the fast path)"""
+        if self.frame_encoder:
+            with self.metrics.timer('encode'):
+                return self.frame_encoder.encode(image)
+        if isinstance(image, np.ndarray):
+            image = self.frame_to_image(image)
+        with self.metrics.timer('encode'):
+            return self.image_to_base64(image)
+    
+    def scene_request(self):
+        """Prompt and generation options for a scene analysis"""
+        # More focused prompt for better predictions
+        prompt = f"""
             You are observing through a webcam. Look at this image and give a quick analysis:
             
             🎬 Scene: [What do you see? Be specific about objects, lighting, setting]
@@ -188,26 +343,204 @@ class AIEyeAssistant:
             
             Keep each section to 1-2 sentences. Focus on observable facts for better predictions.
             """
+        options = {
+            'temperature': 0.3,  # Lower temperature for more focused responses
+            'top_p': 0.8,        # Reduce randomness
+            'num_predict': 200,   # Limit response length for speed
+        }
+        return prompt, options
+
+    def prepare_scene_request(self, image):
+        """Everything that happens before the model call: gating, cache lookup, resize and encode
+
+        Returns (analysis, None) when no model call is needed, otherwise
+        (None, request) where request holds the keyword arguments for generate().
+        """
+        # Keep the temporal window current even when this frame ends up gated
+        if self.frame_history is not None:
+            self.frame_history.add(image)
+
+        # Skip inference entirely when the scene hasn't meaningfully changed
+        if self.change_detector:
+            changed = self.change_detector.has_changed(image)
+            if not changed and self.previous_analysis:
+                self.last_analysis_info = {'source': 'gated'}
+                self.metrics.inc('analyses_total', source='gated')
+                return self.previous_analysis, None
+
+        self.last_analysis_info = {'source': 'model'}
+        prompt, options = self.scene_request()
+        if self.frame_history is not None and len(self.frame_history) > 1:
+            return None, self.temporal_request(options)
+
+        # Reuse the analysis of an image we've effectively already seen
+        if self.analysis_cache:
+            cached = self.analysis_cache.get(image, context_key(prompt, MODEL_NAME, options))
+            if cached is not None:
+                self.last_analysis_info['source'] = 'cache'
+                self.metrics.inc('analyses_total', source='cache')
+                return cached, None
+
+        # Shrink to the configured input resolution, then encode for the model
+        model_image, self.last_analysis_info['resolution'] = self.resolution_policy.apply(image)
+        request = {
+            'model': MODEL_NAME,
+            'prompt': prompt,
+            'images': [self.encode_image(model_image)],
+            'options': options,
+        }
+        return None, request
+
+    def encode_frame_entry(self, entry):
+        """Encode a window frame at the current input resolution, reusing earlier encodes"""
+        size = self.resolution_policy.target_size(*image_size(entry.image))
+        if size not in entry.encoded:
+            model_image, size = self.resolution_policy.apply(entry.image)
+            entry.encoded = {size: self.encode_image(model_image)}
+        return entry.encoded[size], size
+
+    def temporal_request(self, options):
+        """One request covering the frame window: all frames in images=[...], oldest first, or one mosaic"""
+        entries = self.frame_history.frames()
+        if self.mosaic_builder:
+            mosaic = self.mosaic_builder.build(entries)
+            model_image, size = self.resolution_policy.apply(mosaic)
+            self.last_analysis_info.update(resolution=size, frames=len(entries), mosaic=True)
+            return {
+                'model': MODEL_NAME,
+                'prompt': mosaic_prompt(len(entries), self.frame_history.span()),
+                'images': [self.encode_image(model_image)],
+                'options': options,
+            }
+
+        images = []
+        for entry in entries:
+            data, size = self.encode_frame_entry(entry)
+            images.append(data)
+
+        self.last_analysis_info.update(resolution=size, frames=len(entries))
+        return {
+            'model': MODEL_NAME,
+            'prompt': temporal_prompt(len(entries), self.frame_history.span()),
+            'images': images,
+            'options': options,
+        }
+
+    def complete_scene_request(self, image, request, analysis, latency):
+        """Record latency and cache a fresh analysis"""
+        info = self.last_analysis_info
+        info['latency'] = latency
+        self.metrics.inc('analyses_total', source='model')
+        if 'resolution' in info:
+            self.resolution_policy.record_latency(info['resolution'], latency)
+
+        # A temporal analysis describes the whole window, not just this image
+        if self.analysis_cache and 'frames' not in info:
+            context = context_key(request['prompt'], request['model'], request['options'])
+            self.analysis_cache.put(image, context, analysis)
+
+    def scene_analysis_failed(self, error):
+        """Reset per-analysis state after a failure and return the message to show"""
+        # Don't let a failed analysis be reused for the next unchanged frames
+        if self.change_detector:
+            self.change_detector.reset()
+        self.last_analysis_info = {'source': 'error'}
+        self.metrics.inc('analyses_total', source='error')
+        return f"❌ Analysis failed: {str(error)}"
+
+    def analyze_scene(self, image, on_sentence=None, priority=PERIODIC):
+        """Send image to Ollama for analysis
+
+        When on_sentence is given the response is streamed and each finished
+        sentence of the spoken sections is passed to it as soon as it arrives.
+        Raises RequestCancelled if a periodic analysis gives way to the user.
+        Asking about a frame that is already being analyzed (an on-demand look
+        at the frame the observation loop is working on) shares that analysis.
+        """
+        return self.analyze_scene_with_info(image, on_sentence, priority)[0]
+
+    def analyze_scene_with_info(self, image, on_sentence=None, priority=PERIODIC):
+        """analyze_scene, returning (analysis, info) where info says how this analysis was produced
+
+        Callers on different threads use this info rather than last_analysis_info,
+        which the next analysis replaces as soon as this one gives up the model.
+        """
+        prompt, options = self.scene_request()
+        key = request_key(model=MODEL_NAME, prompt=prompt, images=[image], options=options)
+        return self.scene_flights.do(key, lambda: self.scheduled_scene_analysis(image, on_sentence, priority))
+
+    def scheduled_scene_analysis(self, image, on_sentence, priority):
+        """Wait for the model's turn, then analyze; a periodic frame is published while it runs
+
+        Analyses take turns, so last_analysis_info belongs to this one until it
+        returns (analysis, info).
+        """
+        with self.requests.request(priority):
+            if priority == PERIODIC:
+                self.observing = image  # An on-demand look can share this analysis
+            try:
+                if on_sentence:
+                    started_at = time.time()
+                    speak = on_sentence
+
+                    def on_sentence(sentence):
+                        # Record time-to-first-audio for this analysis
+                        self.last_analysis_info.setdefault('first_sentence_latency', time.time() - started_at)
+                        speak(sentence)
+
+                try:
+                    analysis, request = self.prepare_scene_request(image)
+                    if request is None:
+                        if on_sentence and self.last_analysis_info['source'] == 'cache':
+                            parser = StreamingSpeechParser(on_sentence)
+                            parser.feed(analysis)
+                            parser.finish()
+                        return analysis, self.last_analysis_info
+
+                    # Send to Ollama with faster settings
+                    started = time.time()
+                    if on_sentence:
+                        analysis = self.generate_streaming(StreamingSpeechParser(on_sentence), **request)
+                    else:
+                        with self.metrics.timer('inference'):
+                            response = self.backend.generate(**request)
+                        analysis = response['response']
+
+                    self.complete_scene_request(image, request, analysis, time.time() - started)
+                    return analysis, self.last_analysis_info
             
-            # Convert image to base64
-            image_b64 = self.image_to_base64(image)
-            
-            # Send to Ollama with faster settings
-            response = ollama.generate(
-                model=MODEL_NAME,
-                prompt=prompt,
-                images=[image_b64],
-                options={
-                    'temperature': 0.3,  # Lower temperature for more focused responses
-                    'top_p': 0.8,        # Reduce randomness
-                    'num_predict': 200,   # Limit response length for speed
-                }
-            )
-            
-            return response['response']
-            
-        except Exception as e:
-            return f"❌ Analysis failed: {str(e)}"
+                except Exception as e:
+                    return self.scene_analysis_failed(e), self.last_analysis_info
+            finally:
+                if priority == PERIODIC:
+                    self.observing = None
+
+    def record_analysis(self, analysis, info=None):
+        """Report how an analysis was produced (the latest by default) and append it to the analysis log"""
+        info = self.last_analysis_info if info is None else info
+        if 'resolution' in info and 'latency' in info:
+            width, height = info['resolution']
+            frames = f"{info['frames']} frames at " if 'frames' in info else ""
+            if info.get('mosaic'):
+                frames = f"a {info['frames']}-frame mosaic at "
+            print(f"📐 Sent {frames}{width}x{height} to the model, answered in {info['latency']:.2f}s")
+        if 'first_sentence_latency' in info:
+            print(f"⚡ First sentence spoken after {info['first_sentence_latency']:.2f}s")
+
+        if ANALYSIS_LOG:
+            entry = {
+                'time': datetime.now().isoformat(timespec='seconds'),
+                'source': info.get('source'),
+                'resolution': info.get('resolution'),
+                'latency': info.get('latency'),
+                'frames': info.get('frames', 1),
+                'analysis': analysis,
+            }
+            try:
+                with open(ANALYSIS_LOG, 'a') as f:
+                    f.write(json.dumps(entry) + '\n')
+            except OSError as e:
+                print(f"⚠️  Could not write analysis log: {e}")
     
     def create_demo_image(self, scenario_num):
         """Create demo images for testing"""
@@ -232,19 +565,22 @@ class AIEyeAssistant:
         """Main loop for the AI Eye Assistant"""
         try:
             while True:
+                tick_started = time.perf_counter()
                 if self.demo_mode:
                     # Create demo image
                     image, demo_description = self.create_demo_image(self.observation_count)
                     print(f"🎨 Demo scenario: {demo_description}")
                 else:
-                    # Capture frame from webcam
-                    ret, frame = self.cap.read()
+                    # Capture frame from webcam (into the same buffer every time)
+                    with self.camera_lock, self.metrics.timer('camera_read'):
+                        ret, frame = self.cap.read(self.frame_buffer)
                     if not ret:
                         print("❌ Failed to capture image")
                         break
+                    self.frame_buffer = frame
                     
-                    # Convert to PIL Image
-                    image = self.frame_to_image(frame)
+                    # The fast encoder takes the BGR frame as-is; otherwise convert to PIL
+                    image = frame if self.frame_encoder else self.frame_to_image(frame)
                 
                 # Get current time
                 current_time = datetime.now().strftime("%H:%M:%S")
@@ -253,20 +589,33 @@ class AIEyeAssistant:
                 print(f"🕒 Observation #{self.observation_count + 1} at {current_time}")
                 print(f"{'='*60}")
                 
-                # Analyze with AI
-                analysis = self.analyze_scene(image)
+                # Analyze with AI (streamed sentences are spoken while generation continues)
+                streaming = self.enable_tts and self.stream_responses
+                try:
+                    analysis, info = self.analyze_scene_with_info(
+                        image, on_sentence=self.tts.stream() if streaming else None)
+                except RequestCancelled:
+                    # The user spoke while this frame waited for the model; look again once they're answered
+                    print("⏸️  Observation deferred while I answer you")
+                    continue
                 self.previous_analysis = analysis  # Store for speech context
+                reused = info.get('source') == 'gated'
+                if reused:
+                    print("💤 Scene unchanged - reusing previous analysis")
                 print(analysis)
+                self.record_analysis(analysis, info)
+                if not reused:
+                    self.memory.add(analysis)
 
-                # Speak the analysis if TTS is enabled
-                if self.enable_tts:
-                    speech_text = self.prepare_speech_text(analysis)
+                # Speak the analysis if TTS is enabled (no need to repeat a reused one)
+                if self.enable_tts and not reused and not streaming:
+                    with self.metrics.timer('parse'):
+                        speech_text = self.prepare_speech_text(analysis)
                     if speech_text:
                         print(f"🎤 Speaking: {speech_text[:50]}...")
                         self.speak(speech_text)
 
-                # Check for user speech input (process any pending speech)
-                self.check_for_speech_input()
+                self.metrics.observe('observation', time.perf_counter() - tick_started)
 
                 self.observation_count += 1
                 
@@ -288,63 +637,186 @@ class AIEyeAssistant:
         finally:
             self.cleanup()
     
+    def capture_observation(self):
+        """Capture stage: grab the next frame (or demo image)"""
+        if self.demo_mode:
+            image, demo_description = self.create_demo_image(self.observation_count)
+            return {'frame': None, 'image': image, 'description': demo_description}
+
+        with self.camera_lock, self.metrics.timer('camera_read'):
+            ret, frame = self.cap.read()
+        if not ret:
+            print("❌ Failed to capture image")
+            return None
+        self.latest_frame = frame
+        return {'frame': frame, 'image': None, 'description': None}
+
+    def preprocess_observation(self, observation):
+        """Preprocessing stage: convert webcam frames to PIL images (unless encoding frames directly)"""
+        if observation['image'] is None:
+            frame = observation['frame']
+            observation['image'] = frame if self.frame_encoder else self.frame_to_image(frame)
+        return observation
+
+    def analyze_observation(self, observation):
+        """Inference stage: run the vision model on a prepared observation"""
+        streaming = self.enable_tts and self.stream_responses
+        try:
+            analysis, info = self.analyze_scene_with_info(observation['image'],
+                                                          on_sentence=self.tts.stream() if streaming else None)
+        except RequestCancelled:
+            return None  # Gave way to the user; the next captured frame takes its place
+        return self.report_observation(observation, analysis, info)
+
+    def report_observation(self, observation, analysis, info=None):
+        """Store and print a finished analysis; returns None when there's nothing new to narrate"""
+        info = self.last_analysis_info if info is None else info
+        self.previous_analysis = analysis
+        self.observation_count += 1  # Unchanged frames count, as in the serial loop; deferred ones don't
+        if info.get('source') == 'gated':
+            # Nothing new to narrate
+            return None
+
+        current_time = datetime.now().strftime("%H:%M:%S")
+        print(f"\n{'='*60}")
+        print(f"🕒 Observation #{self.observation_count} at {current_time}")
+        if observation['description']:
+            print(f"🎨 Demo scenario: {observation['description']}")
+        print(f"{'='*60}")
+        print(analysis)
+        self.record_analysis(analysis, info)
+        self.memory.add(analysis)
+
+        observation['analysis'] = analysis
+        return observation
+
+    def narrate_observation(self, observation):
+        """Narration stage: speak the most recent analysis"""
+        # Streaming mode already spoke it sentence by sentence during inference
+        if self.enable_tts and not self.stream_responses:
+            with self.metrics.timer('parse'):
+                speech_text = self.prepare_speech_text(observation['analysis'])
+            if speech_text:
+                print(f"🎤 Speaking: {speech_text[:50]}...")
+                self.speak(speech_text)
+        return observation
+
+    def run_pipelined(self):
+        """Pipeline loop: capture, preprocessing, inference and narration overlap"""
+        pipeline = ObservationPipeline(
+            capture=self.capture_observation,
+            preprocess=self.preprocess_observation,
+            analyze=self.analyze_observation,
+            narrate=self.narrate_observation,
+            capture_interval=PIPELINE_CAPTURE_INTERVAL,
+        )
+        print("🚀 Pipeline mode: stages overlap and stale frames are dropped")
+        pipeline.start()
+        try:
+            while pipeline.is_running():
+                # OpenCV windows must be driven from the main thread
+                if not self.demo_mode and self.latest_frame is not None:
+                    cv2.imshow('AI Eye Assistant - Webcam Feed (Press Q to quit)', self.latest_frame)
+                    if cv2.waitKey(30) & 0xFF == ord('q'):
+                        break
+                else:
+                    time.sleep(0.1)
+
+        except KeyboardInterrupt:
+            print("\n\n👋 AI Eyes shutting down... Thanks for letting me observe!")
+        except Exception as e:
+            print(f"❌ Error: {e}")
+        finally:
+            pipeline.stop()
+            stats = pipeline.stats()
+            print(f"📈 Pipeline: {stats['observations_per_minute']} observations/min, "
+                  f"{stats['dropped_frames']} stale frames dropped, {stats['skipped']} frames not analyzed")
+            self.cleanup()
+
     def init_speech_recognition(self):
         """Initialize speech recognition with microphone calibration"""
-        try:
-            print("🎤 Initializing speech recognition...")
+        self.mic_key = device_key(self.microphone)
+        if self.mic_calibration.restore(self.recognizer, self.mic_key):
+            # Checked against the current noise floor once listening starts
+            print(f"🎚️  Reusing microphone calibration (energy threshold {self.recognizer.energy_threshold:.0f})")
+        else:
             # Adjust for ambient noise
             with self.microphone as source:
                 print("🔊 Calibrating microphone for ambient noise... (this may take a moment)")
-                self.recognizer.adjust_for_ambient_noise(source, duration=1)
-            print("✅ Speech recognition ready! You can speak to the AI anytime.")
-        except Exception as e:
-            print(f"⚠️  Speech recognition initialization failed: {e}")
-            print("Speech input will not be available.")
+                self.mic_calibration.calibrate(self.recognizer, source, self.mic_key)
+            self.mic_key = None  # Just calibrated, nothing to check
     
     def start_listening(self):
         """Start the speech recognition thread"""
         def listen_continuously():
             self.listening = True
+            self.wait_for_calibration()
+            if self.mic_key:
+                self.check_calibration()
             while self.listening:
                 try:
                     with self.microphone as source:
                         # Listen for audio with a timeout to prevent blocking
+                        listen_started = time.perf_counter()
                         audio = self.recognizer.listen(source, timeout=1, phrase_time_limit=5)
+                        self.metrics.observe('listen', time.perf_counter() - listen_started)
                     
-                    # Recognize speech in the background
-                    text = self.recognizer.recognize_google(audio)
-                    if text and len(text.strip()) > 0:
-                        self.speech_queue.put(text)
-                        print(f"\n🗣️  You said: '{text}'")
+                    # Recognize speech in the background and go straight back to listening
+                    self.recognition_worker.submit(audio)
                         
                 except sr.WaitTimeoutError:
                     # Normal timeout, continue listening
                     pass
-                except sr.UnknownValueError:
-                    # Speech was unintelligible
-                    pass
-                except sr.RequestError as e:
-                    print(f"⚠️  Speech recognition service error: {e}")
-                    time.sleep(1)
                 except Exception as e:
                     if self.listening:  # Only show error if still supposed to be listening
                         print(f"⚠️  Speech recognition error: {e}")
                     time.sleep(1)
         
-        # Start listening thread
+        # Start recognition worker and listening thread
+        self.recognition_worker = RecognitionWorker(self.speech_backend, self.on_speech_recognized, self.metrics)
+        if AUDIO_CAPTURE_MODE == 'stream':
+            # One input stream stays open; the VAD cuts it into utterances
+            self.audio_capture = AudioCapture(open_audio_stream(), self.recognition_worker.submit).start()
+            print("🎧 Listening for your voice input on a continuous audio stream...")
+            return
         listen_thread = threading.Thread(target=listen_continuously, daemon=True)
         listen_thread.start()
         print("🎧 Listening for your voice input in the background...")
     
-    def process_speech_input(self, text):
-        """Process speech input and generate conversational response"""
+    def wait_for_calibration(self):
+        """Don't open the microphone while a calibration that timed out is still using it"""
+        microphone = self.components.get('Microphone')
+        if microphone and not microphone.exited.is_set():
+            # It holds the microphone and is still setting the energy threshold
+            print("🎙️  Microphone calibration still running - listening starts once it's done")
+            microphone.exited.wait()
+
+    def check_calibration(self):
+        """Quick check that a reused microphone calibration still fits the room"""
         try:
-            # Create a conversational prompt with context from recent observations
-            context = ""
-            if self.previous_analysis:
-                context = f"Recent observation: {self.previous_analysis[:200]}..."
+            with self.microphone as source:
+                self.mic_calibration.verify(self.recognizer, source, self.mic_key)
+        except Exception as e:
+            print(f"⚠️  Microphone check failed: {e}")
+
+    def on_speech_recognized(self, text):
+        """Queue a transcribed phrase for the conversation thread"""
+        if ' '.join(text.lower().split()) == self.answering:
+            # Asked again before the first answer came back: that answer covers both
+            self.repeats_skipped += 1
+            print(f"\n🗣️  You said: '{text}' (already answering that)")
+            return
+        self.speech_queue.put(text)
+        print(f"\n🗣️  You said: '{text}'")
 
-            prompt = f"""
+    def conversation_request(self, text):
+        """Prompt and generation options for replying to the user"""
+        # Context from recent observations and a summary of older ones, within MEMORY_TOKEN_BUDGET tokens
+        context = self.memory.context()
+        if context:
+            context = f"What you've observed (oldest first):\n{context}"
+
+        prompt = f"""
             You are an AI assistant with vision capabilities that has been observing the user through their webcam.
             You have made {self.observation_count} observations so far.
 
@@ -362,62 +834,212 @@ class AIEyeAssistant:
             Keep your response concise (1-3 sentences) and natural. Don't be overly formal.
             """
 
-            # Get response from the LLM (text-only, no image needed for conversation)
-            response = ollama.generate(
-                model=MODEL_NAME,
-                prompt=prompt,
-                options={
-                    'temperature': 0.7,  # More natural for conversation
-                    'top_p': 0.9,
-                    'num_predict': 100,  # Keep responses concise
-                }
-            )
+        options = {
+            'temperature': 0.7,  # More natural for conversation
+            'top_p': 0.9,
+            'num_predict': 100,  # Keep responses concise
+        }
+        return prompt, options
+
+    def summarize_observations(self, summary, observations):
+        """Fold observations that left the memory's ring buffer into its rolling summary"""
+        observed = '\n'.join(observation.describe() for observation in observations)
+        prompt = f"""
+            Summary of the session so far: {summary or "(nothing yet)"}
+
+            Later observations of the user:
+            {observed}
+
+            Rewrite the summary so it also covers the later observations, in at most
+            {self.memory.summary_budget * 3 // 4} words. Focus on what the user did and when.
+            Reply with the summary only.
+            """
+        try:
+            # Background work: waits behind the user like any periodic request
+            with self.requests.request(PERIODIC), self.metrics.timer('summarize'):
+                response = self.backend.generate(model=MODEL_NAME, prompt=prompt,
+                                                 options={'temperature': 0.2, 'num_predict': 150})
+        except RequestCancelled:
+            return None  # The memory lists the activities instead
+        return response['response']
+
+    def process_speech_input(self, text, on_sentence=None):
+        """Process speech input and generate conversational response"""
+        try:
+            prompt, options = self.conversation_request(text)
+
+            with self.requests.request(INTERACTIVE):
+                # Stream the reply so the first sentence can be spoken right away
+                if on_sentence:
+                    return self.generate_streaming(
+                        StreamingSpeechParser(on_sentence, sectioned=False),
+                        stage='llm',
+                        model=MODEL_NAME,
+                        prompt=prompt,
+                        options=options
+                    )
+
+                # Get response from the LLM (text-only, no image needed for conversation)
+                with self.metrics.timer('llm'):
+                    response = self.backend.generate(
+                        model=MODEL_NAME,
+                        prompt=prompt,
+                        options=options
+                    )
 
             return response.get('response', "I'm not sure how to respond to that.")
 
         except Exception as e:
             return f"Sorry, I had trouble processing what you said: {e}"
     
-    def check_for_speech_input(self):
-        """Check for and process any speech input"""
+    def start_conversation(self):
+        """Answer the user on a thread of its own, so a question never waits for the observation loop"""
+        def converse():
+            while True:
+                text = self.speech_queue.get()
+                if text is None:
+                    break
+                self.handle_speech_input(text)
+
+        threading.Thread(target=converse, daemon=True, name='conversation').start()
+
+    def handle_speech_input(self, text):
+        """Reply to one thing the user said"""
+        self.answering = ' '.join(text.lower().split())
         try:
-            while not self.speech_queue.empty():
-                text = self.speech_queue.get_nowait()
-                
-                print(f"\n💬 Processing your input: '{text}'")
-                response = self.process_speech_input(text)
-                
+            print(f"\n💬 Processing your input: '{text}'")
+            if LOOK_REQUEST.search(text) and self.describe_now():
+                return
+
+            if self.enable_tts and self.stream_responses:
+                response = self.process_speech_input(text, on_sentence=self.tts.stream(REPLY))
                 print(f"🤖 AI Response: {response}")
-                
-                # Speak the response
-                if self.enable_tts:
-                    self.speak(response)
-                    
-        except queue.Empty:
-            pass
+                return
+
+            response = self.process_speech_input(text)
+
+            print(f"🤖 AI Response: {response}")
+
+            # Speak the response
+            if self.enable_tts:
+                self.speak(response, REPLY)
+
         except Exception as e:
             print(f"⚠️  Error processing speech input: {e}")
+        finally:
+            self.answering = None
+
+    def capture_now(self):
+        """A frame (or demo image) captured right now, outside the observation loop"""
+        if self.demo_mode:
+            return self.create_demo_image(self.observation_count)[0]
+        with self.camera_lock, self.metrics.timer('camera_read'):
+            ret, frame = self.cap.read()
+        if not ret:
+            return None
+        return frame if self.frame_encoder else self.frame_to_image(frame)
+
+    def describe_now(self):
+        """Answer "what do you see?" by analyzing a fresh frame ahead of the scheduled observations"""
+        # A frame the observation loop is analyzing right now is as fresh as it gets: share that analysis
+        observing = self.observing
+        image = observing.copy() if observing is not None else self.capture_now()
+        if image is None:
+            return False
+
+        streaming = self.enable_tts and self.stream_responses
+        analysis, info = self.analyze_scene_with_info(
+            image, on_sentence=self.tts.stream(REPLY) if streaming else None, priority=ON_DEMAND)
+        shared = self.scene_flights.shared()
+        self.previous_analysis = analysis
+        print(f"👀 {'Already looking' if shared else 'Fresh look'}: {analysis}")
+        if not shared:
+            self.record_analysis(analysis, info)
+            self.memory.add(analysis)
+
+        # A shared observation is narrated by the loop and streaming spoke it already,
+        # but nobody narrates an unchanged scene's reused analysis
+        reused = info.get('source') == 'gated'
+        if self.enable_tts and (reused or not (shared or streaming)):
+            self.speak(self.prepare_speech_text(analysis), REPLY)
+        return True
     
     def cleanup(self):
         """Clean up resources"""
         self.listening = False  # Stop the listening thread
+        self.speech_queue.put(None)  # And the conversation thread
         if self.cap:
             self.cap.release()
         cv2.destroyAllWindows()
         print(f"📊 Total observations made: {self.observation_count}")
+        self.backend.report()
+        if self.change_detector:
+            stats = self.change_detector.stats()
+            print(f"💤 Skipped {stats['skipped']} unchanged frames, ran {stats['executed']} analyses")
+        if self.analysis_cache:
+            stats = self.analysis_cache.stats()
+            print(f"🗃️  Analysis cache: {stats['hits']} hits, {stats['misses']} misses")
+        stats = self.requests.stats()
+        waits = [f"{name} {s['avg_wait']:.2f}s" for name, s in stats.items() if s['avg_wait'] is not None]
+        if waits:
+            print(f"🚦 Average wait for the model: {', '.join(waits)} "
+                  f"({stats['periodic']['cancelled']} observations deferred for you)")
+        stats = self.memory.stats()
+        if stats['compactions']:
+            print(f"🧠 Memory: {stats['recent']} recent observations, "
+                  f"{stats['observations'] - stats['recent']} older ones summarized in {stats['summary_tokens']} tokens")
+        shared = self.scene_flights.stats()['coalesced']
+        if shared or self.repeats_skipped:
+            print(f"🔗 {shared} looks shared an analysis already running, "
+                  f"{self.repeats_skipped} repeated questions answered once")
+        stage_lines = self.metrics.summary()
+        if stage_lines:
+            print("⏱️  Stage latency (slowest first):")
+            for line in stage_lines:
+                print(f"   {line}")
+        if self.audio_capture:
+            self.audio_capture.stop()
+        if self.tts:
+            self.tts.stop()
+            stats = self.tts.stats()
+            print(f"🔊 Speech output: {stats['spoken']} spoken, {stats['interrupted']} interrupted, "
+                  f"{stats['coalesced'] + stats['stale']} stale narrations skipped")
+            if 'cache' in stats:
+                cache = stats['cache']
+                print(f"💾 Speech cache: {cache['hits']} hits, {cache['misses']} misses, "
+                      f"{cache['clips']} clips ({cache['bytes'] / 1024 / 1024:.1f} MB)")
+        if self.recognition_worker:
+            self.recognition_worker.stop()
+            stats = self.recognition_worker.stats()
+            print(f"🎙️  Speech: {stats['recognized']} recognized, {stats['dropped']} dropped "
+                  f"(backlog peaked at {stats['max_queued']})")
+        self.metrics.close()
 
 if __name__ == "__main__":
     import sys
+    from startup_profile import mark, profile_startup, profiling
+
+    if '--startup-profile' in sys.argv[1:]:
+        sys.exit(profile_startup([a for a in sys.argv if a != '--startup-profile']))
+    mark('init')
 
-    # Check for demo mode argument
-    demo_mode = len(sys.argv) > 1 and sys.argv[1] == '--demo'
+    # Check for demo / pipeline mode arguments
+    demo_mode = '--demo' in sys.argv[1:]
+    pipeline_mode = PIPELINE_MODE or '--pipeline' in sys.argv[1:]
 
     print("🚀 Starting AI Eye Assistant...")
 
     # Skip model check for now and start directly
     try:
         assistant = AIEyeAssistant(demo_mode=demo_mode)
-        assistant.run()
+        if profiling():
+            mark('ready')
+            assistant.cleanup()
+            sys.exit(0)
+        if pipeline_mode:
+            assistant.run_pipelined()
+        else:
+            assistant.run()
     except Exception as e:
         print(f"❌ Error starting assistant: {e}")
         import traceback
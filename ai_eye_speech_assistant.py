@@ -4,52 +4,191 @@ AI Eye Assistant with Integrated Speech Recognition
 Combines webcam observation with voice interaction
 """
 import os
-import cv2
+import re
+import json
 import time
 import base64
-import subprocess
 import threading
 import queue
 from random import choice
 from datetime import datetime
-from PIL import Image
 import io
-import ollama
-import speech_recognition as sr
 from dotenv import load_dotenv
+from ollama_backend import get_backend
+from metrics import get_metrics
+from observation_pipeline import ObservationPipeline
+from inference_scheduler import INTERACTIVE, ON_DEMAND, PERIODIC, RequestCancelled, RequestScheduler
+from singleflight import SingleFlight, request_key
+from observation_memory import ObservationMemory
+from change_detector import FrameChangeDetector
+from analysis_cache import AnalysisCache, context_key
+from streaming_speech import StreamingSpeechParser
+from frame_encoder import FrameEncoder, ResolutionPolicy, image_size
+from camera_sources import open_camera
+from speech_backends import RecognitionWorker, create_speech_backend
+from audio_capture import AudioCapture, open_audio_stream
+from mic_calibration import MicCalibration, device_key
+from temporal_analysis import FrameHistory, MosaicBuilder, mosaic_prompt, temporal_prompt
+from startup import CAMERA_INIT_TIMEOUT, MIC_INIT_TIMEOUT, TTS_INIT_TIMEOUT, WARMUP_TIMEOUT, \
+    ComponentInitializer
+from tts_worker import NARRATION, REPLY, TTS_BACKEND, start_tts
+from lazy_import import lazy_import
+
+cv2 = lazy_import('cv2')
+np = lazy_import('numpy')
+Image = lazy_import('PIL.Image')
+sr = lazy_import('speech_recognition')
 
 # Load environment variables
 load_dotenv()
 
 CAPTURE_INTERVAL = int(os.getenv('CAPTURE_INTERVAL', 2))
 MODEL_NAME = os.getenv('MODEL_NAME', 'llama3.2-vision:latest')
+CAMERA_SOURCE = os.getenv('CAMERA_SOURCE', '0')  # Device index, RTSP/HTTP URL or video file
 USE_SAY_COMMAND = os.getenv('USE_SAY_COMMAND', 'true').lower() == 'true'
 ENABLE_TTS = os.getenv('ENABLE_TTS', 'true').lower() == 'true'
+WARMUP_MODEL = os.getenv('WARMUP_MODEL', 'true').lower() == 'true'
+PIPELINE_MODE = os.getenv('PIPELINE_MODE', 'false').lower() == 'true'
+PIPELINE_CAPTURE_INTERVAL = float(os.getenv('PIPELINE_CAPTURE_INTERVAL', 0.1))
+CHANGE_GATING = os.getenv('CHANGE_GATING', 'true').lower() == 'true'
+CHANGE_MAD_THRESHOLD = float(os.getenv('CHANGE_MAD_THRESHOLD', 4.0))
+CHANGE_MOTION_THRESHOLD = float(os.getenv('CHANGE_MOTION_THRESHOLD', 0.02))
+CHANGE_MAX_SKIPS = int(os.getenv('CHANGE_MAX_SKIPS', 15))
+ANALYSIS_CACHE = os.getenv('ANALYSIS_CACHE', 'true').lower() == 'true'
+ANALYSIS_CACHE_SIZE = int(os.getenv('ANALYSIS_CACHE_SIZE', 128))
+ANALYSIS_CACHE_TTL = float(os.getenv('ANALYSIS_CACHE_TTL', 600))
+ANALYSIS_CACHE_DISTANCE = int(os.getenv('ANALYSIS_CACHE_DISTANCE', 6))
+ANALYSIS_CACHE_FILE = os.getenv('ANALYSIS_CACHE_FILE') or None
+STREAM_RESPONSES = os.getenv('STREAM_RESPONSES', 'false').lower() == 'true'
+FAST_ENCODE = os.getenv('FAST_ENCODE', 'true').lower() == 'true'
+JPEG_QUALITY = int(os.getenv('JPEG_QUALITY', 75))
+RESOLUTION_MODE = os.getenv('RESOLUTION_MODE', 'fixed').lower()  # 'fixed' or 'auto'
+MAX_IMAGE_SIDE = int(os.getenv('MAX_IMAGE_SIDE', 0))  # 0 = camera resolution
+PIXEL_BUDGET = int(os.getenv('PIXEL_BUDGET', 0))  # Max pixels per image, 0 = unlimited
+LATENCY_TARGET = float(os.getenv('LATENCY_TARGET', 3.0))  # Seconds per analysis in auto mode
+ANALYSIS_LOG = os.getenv('ANALYSIS_LOG') or None  # Optional JSONL log of analyses
+
+TEMPORAL_MODE = os.getenv('TEMPORAL_MODE', 'off').lower()  # 'off', 'multi' or 'mosaic'
+TEMPORAL_FRAMES = int(os.getenv('TEMPORAL_FRAMES', 4))
+TEMPORAL_SELECTION = os.getenv('TEMPORAL_SELECTION', 'recent').lower()  # 'recent' or 'keyframes'
+TEMPORAL_INTERVAL = float(os.getenv('TEMPORAL_INTERVAL', 1.0))
+KEYFRAME_THRESHOLD = float(os.getenv('KEYFRAME_THRESHOLD', 8.0))
+MOSAIC_PIXEL_BUDGET = int(os.getenv('MOSAIC_PIXEL_BUDGET', 786432))
+AUDIO_CAPTURE_MODE = os.getenv('AUDIO_CAPTURE_MODE', 'listen').lower()
+PERIODIC_HOLDOFF = float(os.getenv('PERIODIC_HOLDOFF', 3))
+
+# Fallback lines said word for word, rendered into the speech cache at startup
+FIXED_PHRASES = [
+    "I'm analyzing what I see.",
+    "Observation complete.",
+    "I'm not sure how to respond.",
+]
+
+# Questions answered from a fresh frame instead of the last observation
+LOOK_REQUEST = re.compile(r"\b(what do you see|what can you see|what's happening|what is happening|look at|"
+                          r"describe)\b", re.IGNORECASE)
 
 class AIEyeSpeechAssistant:
     def __init__(self, demo_mode=False):
         print("🤖 Initializing AI Eye + Speech Assistant...")
+
+        self.backend = get_backend()
+        self.metrics = get_metrics()
+        self.requests = RequestScheduler(holdoff=PERIODIC_HOLDOFF, metrics=self.metrics)  # User first
         
         self.demo_mode = demo_mode
         self.cap = None
+        self.camera_lock = threading.Lock()
+        self.observing = None
+        self.scene_flights = SingleFlight()
+        self.answering = None
+        self.repeats_skipped = 0
+        self.latest_frame = None
         self.previous_analysis = None
         self.observation_count = 0
+        self.memory = ObservationMemory(summarize=self.summarize_observations)  # History for replies
+        self.last_analysis_info = {}
+        self.change_detector = None
+        if CHANGE_GATING:
+            self.change_detector = FrameChangeDetector(
+                mad_threshold=CHANGE_MAD_THRESHOLD,
+                motion_threshold=CHANGE_MOTION_THRESHOLD,
+                max_skips=CHANGE_MAX_SKIPS,
+            )
+        self.analysis_cache = None
+        if ANALYSIS_CACHE:
+            self.analysis_cache = AnalysisCache(
+                max_entries=ANALYSIS_CACHE_SIZE,
+                ttl=ANALYSIS_CACHE_TTL,
+                max_distance=ANALYSIS_CACHE_DISTANCE,
+                path=ANALYSIS_CACHE_FILE,
+            )
         self.use_say_command = USE_SAY_COMMAND
         self.enable_tts = ENABLE_TTS
+
+        # Encode webcam frames straight to JPEG bytes instead of BGR → PIL → base64
+        self.frame_encoder = FrameEncoder(JPEG_QUALITY) if FAST_ENCODE else None
+        self.frame_buffer = None  # Reused capture buffer for the serial loop
+        self.resolution_policy = ResolutionPolicy(
+            mode=RESOLUTION_MODE,
+            max_side=MAX_IMAGE_SIDE,
+            pixel_budget=PIXEL_BUDGET,
+            latency_target=LATENCY_TARGET,
+        )
         
         # Speech recognition setup
         self.recognizer = sr.Recognizer()
         self.microphone = sr.Microphone()
         self.speech_queue = queue.Queue()
         self.listening = False
+        self.mic_calibration = MicCalibration()  # Per-device energy threshold reused across restarts
+        self.mic_key = None
+        # The recognition engine loads once here; phrases are transcribed off the capture thread
+        self.speech_backend = create_speech_backend(recognizer=self.recognizer)
+        self.recognition_worker = None
+        self.audio_capture = None  # Continuous stream + VAD in AUDIO_CAPTURE_MODE=stream
 
         # TTS management
-        self.current_speech_process = None
-        
-        # Initialize components
-        self.setup_speech_recognition()
-        self.setup_camera()
+        self.tts = None  # TTSWorker: one thread and one long-lived engine speak everything
+        self.stream_responses = STREAM_RESPONSES
+        self.frame_history = None
+        self.mosaic_builder = MosaicBuilder(MOSAIC_PIXEL_BUDGET) if TEMPORAL_MODE == 'mosaic' else None
+        if TEMPORAL_MODE in ('multi', 'mosaic'):
+            self.frame_history = FrameHistory(
+                size=TEMPORAL_FRAMES,
+                selection=TEMPORAL_SELECTION,
+                min_interval=TEMPORAL_INTERVAL,
+                keyframe_threshold=KEYFRAME_THRESHOLD,
+            )
+
+        # Camera, microphone, speech output and model start together and report as each comes up;
+        # the model keeps loading in the background
+        if demo_mode:
+            print("🎨 Demo mode - using test images")
+        initializer = ComponentInitializer(self.metrics)
+        if not demo_mode:
+            initializer.add('Camera', lambda: open_camera(CAMERA_SOURCE), CAMERA_INIT_TIMEOUT,
+                            fallback=self.camera_unavailable, late=lambda opened: opened[0].release())
+        initializer.add('Microphone', self.calibrate_microphone, MIC_INIT_TIMEOUT,
+                        fallback=self.microphone_unavailable)
+        if self.enable_tts:
+            initializer.add('Speech output', self.start_tts, TTS_INIT_TIMEOUT, fallback=self.tts_unavailable,
+                            late=lambda tts: tts.stop())
+        if WARMUP_MODEL:
+            initializer.add('Model', self.warm_up_model, WARMUP_TIMEOUT, background=True)
+        self.components = initializer.run()
+
+        tts = self.components.get('Speech output')
+        if tts and tts.ready:
+            self.tts = tts.result
+            print(f"🔊 Speaking with {self.tts.backend.label}")
+        camera = self.components.get('Camera')
+        if camera and camera.ready:
+            self.cap, frame = camera.result
+            print(f"📐 Camera resolution: {frame.shape[1]}x{frame.shape[0]}")
+
         self.start_listening()
+        self.start_conversation()
         
         print("✅ AI Eye + Speech Assistant ready!")
         print("👁️  Observing through camera every 2 seconds")
@@ -57,97 +196,106 @@ class AIEyeSpeechAssistant:
         print("💬 Try saying: 'Hello', 'What do you see?', 'Describe what's happening'")
         print("⏹️  Press Ctrl+C to stop\n")
     
-    def setup_speech_recognition(self):
-        """Initialize speech recognition"""
-        try:
-            print("🎤 Setting up speech recognition...")
-            # Quick microphone test without blocking calibration
-            print("✅ Speech recognition ready")
-        except Exception as e:
-            print(f"⚠️  Speech setup failed: {e}")
-    
-    def setup_camera(self):
-        """Initialize camera"""
-        print("📹 Setting up camera...")
-        if self.demo_mode:
-            print("🎨 Demo mode - using test images")
-        else:
-            print("🔍 Attempting to connect to camera...")
-            self.cap = cv2.VideoCapture(0)
-
-            # Give camera time to initialize
-            import time
-            time.sleep(1)
-
-            # Test camera with a frame read
-            if self.cap.isOpened():
-                ret, frame = self.cap.read()
-                if ret and frame is not None:
-                    print("✅ Camera ready and working!")
-                    print(f"📐 Camera resolution: {frame.shape[1]}x{frame.shape[0]}")
-                else:
-                    print("⚠️  Camera opened but can't read frames, switching to demo mode")
-                    self.cap.release()
-                    self.demo_mode = True
+    def camera_unavailable(self, error):
+        print("🎨 Camera not available, switching to demo mode")
+        self.demo_mode = True
+
+    def calibrate_microphone(self):
+        """Reuse the stored calibration after a quick check, or calibrate from scratch"""
+        self.mic_key = device_key(self.microphone)
+        restored = self.mic_calibration.restore(self.recognizer, self.mic_key)
+        with self.microphone as source:
+            if restored:
+                self.mic_calibration.verify(self.recognizer, source, self.mic_key)
             else:
-                print("⚠️  Camera not available, switching to demo mode")
-                self.demo_mode = True
-    
+                print("🔊 Calibrating microphone...")
+                self.mic_calibration.calibrate(self.recognizer, source, self.mic_key)
+
+    def microphone_unavailable(self, error):
+        print("🎤 Listening with the default energy threshold")
+
+    def start_tts(self):
+        """Start the speech worker (USE_SAY_COMMAND=false prefers pyttsx3 over 'say')"""
+        name = 'pyttsx3' if TTS_BACKEND == 'auto' and not self.use_say_command else TTS_BACKEND
+        tts = start_tts(name, self.metrics)
+        tts.prerender(FIXED_PHRASES)
+        return tts
+
+    def tts_unavailable(self, error):
+        print("🔇 Continuing without speech output")
+        self.enable_tts = False
+
+    def warm_up_model(self):
+        """Load the model now so the first observation doesn't pay for it"""
+        if not self.backend.warmup(MODEL_NAME):
+            raise RuntimeError("the first observation will try again")
+
     def start_listening(self):
         """Start speech recognition in background"""
         def listen_continuously():
             self.listening = True
-            # Calibrate microphone in the background thread
-            try:
-                with self.microphone as source:
-                    print("🔊 Calibrating microphone in background...")
-                    self.recognizer.adjust_for_ambient_noise(source, duration=1)
-                    print("✅ Microphone calibrated")
-            except Exception as e:
-                print(f"⚠️  Microphone calibration failed: {e}")
-
+            # A calibration that timed out still holds the microphone: let it finish first
+            microphone = self.components.get('Microphone')
+            if microphone and not microphone.exited.is_set():
+                print("🎙️  Waiting for microphone calibration to finish")
+                microphone.exited.wait()
             while self.listening:
                 try:
                     with self.microphone as source:
                         # Shorter timeout to reduce audio conflicts
+                        listen_started = time.perf_counter()
                         audio = self.recognizer.listen(source, timeout=0.5, phrase_time_limit=3)
+                        self.metrics.observe('listen', time.perf_counter() - listen_started)
 
-                    text = self.recognizer.recognize_google(audio)
-                    if text and len(text.strip()) > 0:
-                        self.speech_queue.put(text)
-                        print(f"\n🗣️  You said: '{text}'")
+                    self.recognition_worker.submit(audio)
 
                 except sr.WaitTimeoutError:
                     pass
-                except sr.UnknownValueError:
-                    pass
-                except sr.RequestError as e:
-                    print(f"⚠️  Speech service error: {e}")
-                    time.sleep(2)
                 except Exception as e:
                     if self.listening:
                         # Less verbose error reporting
                         pass
                     time.sleep(2)
 
+        self.recognition_worker = RecognitionWorker(self.speech_backend, self.on_speech_recognized, self.metrics)
+        if AUDIO_CAPTURE_MODE == 'stream':
+            self.audio_capture = AudioCapture(open_audio_stream(), self.recognition_worker.submit).start()
+            print("🎧 Background speech listening started (continuous stream)")
+            return
         listen_thread = threading.Thread(target=listen_continuously, daemon=True)
         listen_thread.start()
         print("🎧 Background speech listening started")
-    
-    def speak(self, text):
-        """Text-to-speech output"""
-        if self.enable_tts:
-            # Stop any current speech
-            if self.current_speech_process and self.current_speech_process.poll() is None:
-                self.current_speech_process.terminate()
-                try:
-                    self.current_speech_process.wait(timeout=1)
-                except subprocess.TimeoutExpired:
-                    self.current_speech_process.kill()
 
-            # Start new speech
-            self.current_speech_process = subprocess.Popen(['say', text])
+    def on_speech_recognized(self, text):
+        """Queue a transcribed phrase for the conversation thread"""
+        if ' '.join(text.lower().split()) == self.answering:
+            self.repeats_skipped += 1
+            print(f"\n🗣️  You said: '{text}' (already answering that)")
+            return
+        self.speech_queue.put(text)
+        print(f"\n🗣️  You said: '{text}'")
     
+    def speak(self, text, priority=NARRATION):
+        """Text-to-speech output; replies interrupt narration instead of talking over it"""
+        if self.tts:
+            with self.metrics.timer('tts_dispatch'):
+                self.tts.say(text, priority)
+
+    def generate_streaming(self, parser, stage='inference', **kwargs):
+        """Stream a generate call through a speech parser, timing `stage` and 'parse' separately"""
+        started = time.perf_counter()
+        parse_time = 0.0
+        for chunk in self.backend.generate(stream=True, **kwargs):
+            parse_started = time.perf_counter()
+            parser.feed(chunk.get('response', ''))
+            parse_time += time.perf_counter() - parse_started
+        parse_started = time.perf_counter()
+        text = parser.finish()
+        parse_time += time.perf_counter() - parse_started
+        self.metrics.observe(stage, time.perf_counter() - started - parse_time)
+        self.metrics.observe('parse', parse_time)
+        return text
+
     def image_to_base64(self, image):
         """Convert PIL Image to base64"""
         buffered = io.BytesIO()
@@ -156,8 +304,9 @@ class AIEyeSpeechAssistant:
     
     def frame_to_image(self, frame):
         """Convert OpenCV frame to PIL Image"""
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        return Image.fromarray(rgb_frame)
+        with self.metrics.timer('color_convert'):
+            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            return Image.fromarray(rgb_frame)
     
     def create_demo_image(self, scenario_num):
         """Create demo images"""
@@ -174,44 +323,210 @@ class AIEyeSpeechAssistant:
         image = Image.new('RGB', (640, 480), color)
         return image, description
     
-    def analyze_scene(self, image):
-        """Analyze image with AI"""
-        try:
-            prompt = """
-            You are observing through a webcam. Analyze this image and provide:
+    def encode_image(self, image):
+        """Encode image for Ollama (raw JPEG bytes on the fast path)"""
+        if self.frame_encoder:
+            with self.metrics.timer('encode'):
+                return self.frame_encoder.encode(image)
+        if isinstance(image, np.ndarray):
+            image = self.frame_to_image(image)
+        with self.metrics.timer('encode'):
+            return self.image_to_base64(image)
+
+    def encode_frame_entry(self, entry):
+        """Encode a temporal-window frame, reusing earlier encodes at the same size"""
+        size = self.resolution_policy.target_size(*image_size(entry.image))
+        if size not in entry.encoded:
+            model_image, size = self.resolution_policy.apply(entry.image)
+            entry.encoded = {size: self.encode_image(model_image)}
+        return entry.encoded[size], size
+    
+    def analyze_scene(self, image, on_sentence=None, priority=PERIODIC):
+        """Analyze image with AI, streaming spoken sentences to on_sentence if given
+
+        Raises RequestCancelled if a periodic analysis gives way to the user.
+        A frame that is already being analyzed shares that analysis.
+        """
+        return self.analyze_scene_with_info(image, on_sentence, priority)[0]
+
+    def analyze_scene_with_info(self, image, on_sentence=None, priority=PERIODIC):
+        """(analysis, info): info is this analysis's own, unlike last_analysis_info which the next one replaces"""
+        # The scene prompt never changes, so the frame and model identify the request
+        key = request_key(model=MODEL_NAME, images=[image])
+        return self.scene_flights.do(key, lambda: self.scheduled_scene_analysis(image, on_sentence, priority))
+
+    def scheduled_scene_analysis(self, image, on_sentence, priority):
+        """Wait for the model's turn, then analyze; returns (analysis, info) while still holding it"""
+        with self.requests.request(priority):
+            if priority == PERIODIC:
+                self.observing = image  # An on-demand look can share this analysis
+            try:
+                if self.frame_history is not None:
+                    self.frame_history.add(image)
+
+                if self.change_detector:
+                    changed = self.change_detector.has_changed(image)
+                    if not changed and self.previous_analysis:
+                        self.last_analysis_info = {'source': 'gated'}
+                        self.metrics.inc('analyses_total', source='gated')
+                        return self.previous_analysis, self.last_analysis_info
+
+                info = self.last_analysis_info = {'source': 'model'}
+                if on_sentence:
+                    started_at = time.time()
+                    speak = on_sentence
+
+                    def on_sentence(sentence):
+                        info.setdefault('first_sentence_latency', time.time() - started_at)
+                        speak(sentence)
+
+                try:
+                    prompt = """
+                    You are observing through a webcam. Analyze this image and provide:
             
-            🎬 Scene: [What do you see? Objects, lighting, setting]
-            👤 Currently: [What is the person doing RIGHT NOW?]
-            🔮 Next Action: [What will they likely do next?]
-            💡 Notice: [One interesting detail]
+                    🎬 Scene: [What do you see? Objects, lighting, setting]
+                    👤 Currently: [What is the person doing RIGHT NOW?]
+                    🔮 Next Action: [What will they likely do next?]
+                    💡 Notice: [One interesting detail]
             
-            Keep each section to 1-2 sentences.
-            """
+                    Keep each section to 1-2 sentences.
+                    """
+                    options = {
+                        'temperature': 0.3,
+                        'top_p': 0.8,
+                        'num_predict': 200,
+                    }
+
+                    # In temporal mode the frame window goes out together, oldest first
+                    temporal = self.frame_history is not None and len(self.frame_history) > 1
+
+                    cache_context = None
+                    if self.analysis_cache and not temporal:
+                        cache_context = context_key(prompt, MODEL_NAME, options)
+                        cached = self.analysis_cache.get(image, cache_context)
+                        if cached is not None:
+                            self.last_analysis_info['source'] = 'cache'
+                            self.metrics.inc('analyses_total', source='cache')
+                            if on_sentence:
+                                parser = self.analysis_speech_parser(on_sentence)
+                                parser.feed(cached)
+                                parser.finish()
+                            return cached, info
             
-            image_b64 = self.image_to_base64(image)
+                    if temporal and self.mosaic_builder:
+                        entries = self.frame_history.frames()
+                        prompt = mosaic_prompt(len(entries), self.frame_history.span())
+                        model_image, info['resolution'] = self.resolution_policy.apply(self.mosaic_builder.build(entries))
+                        images = [self.encode_image(model_image)]
+                        info.update(frames=len(entries), mosaic=True)
+                    elif temporal:
+                        entries = self.frame_history.frames()
+                        prompt = temporal_prompt(len(entries), self.frame_history.span())
+                        images = []
+                        for entry in entries:
+                            data, info['resolution'] = self.encode_frame_entry(entry)
+                            images.append(data)
+                        info['frames'] = len(entries)
+                    else:
+                        model_image, info['resolution'] = self.resolution_policy.apply(image)
+                        images = [self.encode_image(model_image)]
+                    started = time.time()
             
-            response = ollama.generate(
-                model=MODEL_NAME,
-                prompt=prompt,
-                images=[image_b64],
-                options={
-                    'temperature': 0.3,
-                    'top_p': 0.8,
-                    'num_predict': 200,
-                }
-            )
+                    if on_sentence:
+                        analysis = self.generate_streaming(
+                            self.analysis_speech_parser(on_sentence),
+                            model=MODEL_NAME,
+                            prompt=prompt,
+                            images=images,
+                            options=options
+                        )
+                    else:
+                        with self.metrics.timer('inference'):
+                            response = self.backend.generate(
+                                model=MODEL_NAME,
+                                prompt=prompt,
+                                images=images,
+                                options=options
+                            )
+                        analysis = response['response']
+
+                    info['latency'] = time.time() - started
+                    self.metrics.inc('analyses_total', source='model')
+                    self.resolution_policy.record_latency(info['resolution'], info['latency'])
+
+                    if cache_context:
+                        self.analysis_cache.put(image, cache_context, analysis)
             
-            return response['response']
+                    return analysis, info
             
-        except Exception as e:
-            return f"❌ Analysis failed: {str(e)}"
-    
-    def process_speech_input(self, text):
+                except Exception as e:
+                    if self.change_detector:
+                        self.change_detector.reset()
+                    self.last_analysis_info = {'source': 'error'}
+                    self.metrics.inc('analyses_total', source='error')
+                    return f"❌ Analysis failed: {str(e)}", self.last_analysis_info
+            finally:
+                if priority == PERIODIC:
+                    self.observing = None
+
+    def record_analysis(self, analysis, info=None):
+        """Print resolution/latency for an analysis (the latest by default) and append it to the log"""
+        info = self.last_analysis_info if info is None else info
+        if 'resolution' in info and 'latency' in info:
+            width, height = info['resolution']
+            frames = f"{info['frames']} frames at " if 'frames' in info else ""
+            if info.get('mosaic'):
+                frames = f"a {info['frames']}-frame mosaic at "
+            print(f"📐 Sent {frames}{width}x{height}, answered in {info['latency']:.2f}s")
+        if 'first_sentence_latency' in info:
+            print(f"⚡ First sentence spoken after {info['first_sentence_latency']:.2f}s")
+
+        if ANALYSIS_LOG:
+            entry = {
+                'time': datetime.now().isoformat(timespec='seconds'),
+                'source': info.get('source'),
+                'resolution': info.get('resolution'),
+                'latency': info.get('latency'),
+                'frames': info.get('frames', 1),
+                'analysis': analysis,
+            }
+            try:
+                with open(ANALYSIS_LOG, 'a') as f:
+                    f.write(json.dumps(entry) + '\n')
+            except OSError as e:
+                print(f"⚠️  Could not write analysis log: {e}")
+
+    def analysis_speech_parser(self, on_sentence):
+        """Streaming counterpart of prepare_speech_text (speaks Scene and Currently only)"""
+        return StreamingSpeechParser(on_sentence, spoken_sections=('scene', 'currently'),
+                                     fallback="Observation complete.")
+
+    def summarize_observations(self, summary, observations):
+        """Rolling summary of observations older than the memory's ring buffer"""
+        observed = '\n'.join(observation.describe() for observation in observations)
+        prompt = f"""
+        Session summary so far: {summary or "(nothing yet)"}
+        
+        Later observations:
+        {observed}
+        
+        Update the summary to include them, in at most {self.memory.summary_budget * 3 // 4} words.
+        Reply with the summary only.
+        """
+        try:
+            with self.requests.request(PERIODIC), self.metrics.timer('summarize'):
+                response = self.backend.generate(model=MODEL_NAME, prompt=prompt,
+                                                 options={'temperature': 0.2, 'num_predict': 150})
+        except RequestCancelled:
+            return None
+        return response['response']
+
+    def process_speech_input(self, text, on_sentence=None):
         """Process speech and generate response"""
         try:
-            context = ""
-            if self.previous_analysis:
-                context = f"Recent observation: {self.previous_analysis[:150]}..."
+            context = self.memory.context()  # Bounded by MEMORY_TOKEN_BUDGET
+            if context:
+                context = f"Observed so far (oldest first):\n{context}"
             
             prompt = f"""
             You are an AI with vision that has been observing the user.
@@ -225,36 +540,100 @@ class AIEyeSpeechAssistant:
             Reference your observations when relevant.
             """
             
-            response = ollama.generate(
-                model=MODEL_NAME,
-                prompt=prompt,
-                options={
-                    'temperature': 0.7,
-                    'num_predict': 80,
-                }
-            )
+            options = {
+                'temperature': 0.7,
+                'num_predict': 80,
+            }
+
+            with self.requests.request(INTERACTIVE):
+                if on_sentence:
+                    return self.generate_streaming(
+                        StreamingSpeechParser(on_sentence, sectioned=False),
+                        stage='llm',
+                        model=MODEL_NAME,
+                        prompt=prompt,
+                        options=options
+                    )
+
+                with self.metrics.timer('llm'):
+                    response = self.backend.generate(
+                        model=MODEL_NAME,
+                        prompt=prompt,
+                        options=options
+                    )
             
             return response.get('response', "I'm not sure how to respond.")
             
         except Exception as e:
             return f"Sorry, I had trouble processing that: {e}"
     
-    def check_for_speech_input(self):
-        """Process any pending speech input"""
+    def start_conversation(self):
+        """Reply on a separate thread so questions don't wait for the observation loop"""
+        def converse():
+            while True:
+                text = self.speech_queue.get()
+                if text is None:
+                    break
+                self.handle_speech_input(text)
+
+        threading.Thread(target=converse, daemon=True, name='conversation').start()
+
+    def handle_speech_input(self, text):
+        """Reply to one phrase"""
+        self.answering = ' '.join(text.lower().split())
         try:
-            while not self.speech_queue.empty():
-                text = self.speech_queue.get_nowait()
-                
-                print(f"💬 Processing: '{text}'")
-                response = self.process_speech_input(text)
-                
+            print(f"💬 Processing: '{text}'")
+            if LOOK_REQUEST.search(text) and self.describe_now():
+                return
+
+            if self.enable_tts and self.stream_responses:
+                response = self.process_speech_input(text, on_sentence=self.tts.stream(REPLY))
                 print(f"🤖 AI: {response}")
-                self.speak(response)
-                    
-        except queue.Empty:
-            pass
+                return
+
+            response = self.process_speech_input(text)
+
+            print(f"🤖 AI: {response}")
+            self.speak(response, REPLY)
+
         except Exception as e:
             print(f"⚠️  Speech processing error: {e}")
+        finally:
+            self.answering = None
+
+    def capture_now(self):
+        """Grab a frame (or demo image) outside the observation loop"""
+        if self.demo_mode:
+            return self.create_demo_image(self.observation_count)[0]
+        with self.camera_lock, self.metrics.timer('camera_read'):
+            ret, frame = self.cap.read()
+        if not ret:
+            return None
+        return frame if self.frame_encoder else self.frame_to_image(frame)
+
+    def describe_now(self):
+        """Answer "what do you see?" from a fresh frame, ahead of scheduled observations"""
+        # Join the observation in progress if there is one
+        observing = self.observing
+        image = observing.copy() if observing is not None else self.capture_now()
+        if image is None:
+            return False
+
+        streaming = self.enable_tts and self.stream_responses
+        analysis, info = self.analyze_scene_with_info(
+            image, on_sentence=self.tts.stream(REPLY) if streaming else None, priority=ON_DEMAND)
+        shared = self.scene_flights.shared()
+        self.previous_analysis = analysis
+        print(f"👀 {'Already looking' if shared else 'Fresh look'}: {analysis}")
+        if not shared:
+            self.record_analysis(analysis, info)
+            self.memory.add(analysis)
+
+        # The observation loop narrates what it shared; a reused (unchanged scene) analysis isn't narrated
+        reused = info.get('source') == 'gated'
+        if self.enable_tts and (reused or not (shared or streaming)):
+            self.speak(self.prepare_speech_text(analysis), REPLY)
+        return True
     
     def prepare_speech_text(self, analysis):
         """Convert analysis to speech"""
@@ -286,16 +665,19 @@ class AIEyeSpeechAssistant:
         """Main observation and interaction loop"""
         try:
             while True:
+                tick_started = time.perf_counter()
                 # Get image (camera or demo)
                 if self.demo_mode:
                     image, demo_description = self.create_demo_image(self.observation_count)
                     print(f"🎨 Demo: {demo_description}")
                 else:
-                    ret, frame = self.cap.read()
+                    with self.camera_lock, self.metrics.timer('camera_read'):
+                        ret, frame = self.cap.read(self.frame_buffer)
                     if not ret:
                         print("❌ Camera capture failed")
                         break
-                    image = self.frame_to_image(frame)
+                    self.frame_buffer = frame
+                    image = frame if self.frame_encoder else self.frame_to_image(frame)
                 
                 # Analyze scene
                 current_time = datetime.now().strftime("%H:%M:%S")
@@ -303,18 +685,30 @@ class AIEyeSpeechAssistant:
                 print(f"🕒 Observation #{self.observation_count + 1} at {current_time}")
                 print(f"{'='*50}")
                 
-                analysis = self.analyze_scene(image)
+                streaming = self.enable_tts and self.stream_responses
+                try:
+                    analysis, info = self.analyze_scene_with_info(
+                        image, on_sentence=self.tts.stream() if streaming else None)
+                except RequestCancelled:
+                    print("⏸️  Observation deferred for your question")
+                    continue
                 self.previous_analysis = analysis
+                reused = info.get('source') == 'gated'
+                if reused:
+                    print("💤 Scene unchanged - reusing previous analysis")
                 print(analysis)
+                self.record_analysis(analysis, info)
+                if not reused:
+                    self.memory.add(analysis)
                 
                 # Speak analysis
-                if self.enable_tts:
-                    speech_text = self.prepare_speech_text(analysis)
+                if self.enable_tts and not reused and not streaming:
+                    with self.metrics.timer('parse'):
+                        speech_text = self.prepare_speech_text(analysis)
                     print(f"🎤 Speaking: {speech_text[:50]}...")
                     self.speak(speech_text)
                 
-                # Process any speech input
-                self.check_for_speech_input()
+                self.metrics.observe('observation', time.perf_counter() - tick_started)
                 
                 self.observation_count += 1
                 
@@ -333,17 +727,157 @@ class AIEyeSpeechAssistant:
         finally:
             self.cleanup()
     
+    def capture_observation(self):
+        """Pipeline capture stage"""
+        if self.demo_mode:
+            image, demo_description = self.create_demo_image(self.observation_count)
+            return {'frame': None, 'image': image, 'description': demo_description}
+
+        with self.camera_lock, self.metrics.timer('camera_read'):
+            ret, frame = self.cap.read()
+        if not ret:
+            print("❌ Camera capture failed")
+            return None
+        self.latest_frame = frame
+        return {'frame': frame, 'image': None, 'description': None}
+
+    def preprocess_observation(self, observation):
+        """Pipeline preprocessing stage"""
+        if observation['image'] is None:
+            frame = observation['frame']
+            observation['image'] = frame if self.frame_encoder else self.frame_to_image(frame)
+        return observation
+
+    def analyze_observation(self, observation):
+        """Pipeline inference stage"""
+        streaming = self.enable_tts and self.stream_responses
+        try:
+            analysis, info = self.analyze_scene_with_info(observation['image'],
+                                                          on_sentence=self.tts.stream() if streaming else None)
+        except RequestCancelled:
+            return None
+        self.previous_analysis = analysis
+        self.observation_count += 1
+        if info.get('source') == 'gated':
+            return None
+
+        current_time = datetime.now().strftime("%H:%M:%S")
+        print(f"\n{'='*50}")
+        print(f"🕒 Observation #{self.observation_count} at {current_time}")
+        if observation['description']:
+            print(f"🎨 Demo: {observation['description']}")
+        print(f"{'='*50}")
+        print(analysis)
+        self.record_analysis(analysis, info)
+        self.memory.add(analysis)
+
+        observation['analysis'] = analysis
+        return observation
+
+    def narrate_observation(self, observation):
+        """Pipeline narration stage"""
+        if self.enable_tts and not self.stream_responses:
+            with self.metrics.timer('parse'):
+                speech_text = self.prepare_speech_text(observation['analysis'])
+            print(f"🎤 Speaking: {speech_text[:50]}...")
+            self.speak(speech_text)
+        return observation
+
+    def run_pipelined(self):
+        """Observation loop with overlapping capture/inference/narration stages"""
+        pipeline = ObservationPipeline(
+            capture=self.capture_observation,
+            preprocess=self.preprocess_observation,
+            analyze=self.analyze_observation,
+            narrate=self.narrate_observation,
+            capture_interval=PIPELINE_CAPTURE_INTERVAL,
+        )
+        pipeline.start()
+        try:
+            while pipeline.is_running():
+                if not self.demo_mode and self.latest_frame is not None:
+                    cv2.imshow('AI Eye Assistant (Press Q to quit)', self.latest_frame)
+                    if cv2.waitKey(30) & 0xFF == ord('q'):
+                        break
+                else:
+                    time.sleep(0.1)
+
+        except KeyboardInterrupt:
+            print("\n\n👋 AI Eye + Speech Assistant shutting down...")
+        except Exception as e:
+            print(f"❌ Error: {e}")
+        finally:
+            pipeline.stop()
+            stats = pipeline.stats()
+            print(f"📈 Pipeline: {stats['observations_per_minute']} observations/min, "
+                  f"{stats['dropped_frames']} stale frames dropped, {stats['skipped']} frames not analyzed")
+            self.cleanup()
+
     def cleanup(self):
         """Clean up resources"""
         self.listening = False
+        self.speech_queue.put(None)
         if self.cap:
             self.cap.release()
         cv2.destroyAllWindows()
         print(f"📊 Total observations: {self.observation_count}")
+        self.backend.report()
+        if self.change_detector:
+            stats = self.change_detector.stats()
+            print(f"💤 Skipped {stats['skipped']} unchanged frames, ran {stats['executed']} analyses")
+        if self.analysis_cache:
+            stats = self.analysis_cache.stats()
+            print(f"🗃️  Analysis cache: {stats['hits']} hits, {stats['misses']} misses")
+        stats = self.requests.stats()
+        waits = [f"{name} {s['avg_wait']:.2f}s" for name, s in stats.items() if s['avg_wait'] is not None]
+        if waits:
+            print(f"🚦 Model wait: {', '.join(waits)} ({stats['periodic']['cancelled']} observations deferred)")
+        stats = self.memory.stats()
+        if stats['compactions']:
+            print(f"🧠 Memory: {stats['observations']} observations, summary {stats['summary_tokens']} tokens")
+        shared = self.scene_flights.stats()['coalesced']
+        if shared or self.repeats_skipped:
+            print(f"🔗 Shared {shared} analyses in flight, skipped {self.repeats_skipped} repeated questions")
+        stage_lines = self.metrics.summary()
+        if stage_lines:
+            print("⏱️  Stage latency (slowest first):")
+            for line in stage_lines:
+                print(f"   {line}")
+        if self.audio_capture:
+            self.audio_capture.stop()
+        if self.tts:
+            self.tts.stop()
+            stats = self.tts.stats()
+            print(f"🔊 Speech output: {stats['spoken']} spoken, {stats['interrupted']} interrupted, "
+                  f"{stats['coalesced'] + stats['stale']} stale narrations skipped")
+            if 'cache' in stats:
+                cache = stats['cache']
+                print(f"💾 Speech cache: {cache['hits']} hits, {cache['misses']} misses, "
+                      f"{cache['clips']} clips ({cache['bytes'] / 1024 / 1024:.1f} MB)")
+        if self.recognition_worker:
+            self.recognition_worker.stop()
+            stats = self.recognition_worker.stats()
+            print(f"🎙️  Speech: {stats['recognized']} recognized, {stats['dropped']} dropped "
+                  f"(backlog peaked at {stats['max_queued']})")
+        self.metrics.close()
 
 if __name__ == "__main__":
     import sys
-    demo_mode = len(sys.argv) > 1 and sys.argv[1] == '--demo'
+    from startup_profile import mark, profile_startup, profiling
+
+    if '--startup-profile' in sys.argv[1:]:
+        sys.exit(profile_startup([a for a in sys.argv if a != '--startup-profile']))
+    mark('init')
+
+    demo_mode = '--demo' in sys.argv[1:]
+    pipeline_mode = PIPELINE_MODE or '--pipeline' in sys.argv[1:]
     
     assistant = AIEyeSpeechAssistant(demo_mode=demo_mode)
-    assistant.run()
+    if profiling():
+        mark('ready')
+        assistant.cleanup()
+        sys.exit(0)
+    if pipeline_mode:
+        assistant.run_pipelined()
+    else:
+        assistant.run()
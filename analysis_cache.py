@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Perceptual-hash keyed LRU cache for vision analyses
+
+Frames that look the same (within a Hamming-distance tolerance on a DCT
+perceptual hash) and were analyzed with the same prompt, model and options
+reuse the stored analysis instead of paying for another model call.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from change_detector import to_grayscale
+from lazy_import import lazy_import
+
+cv2 = lazy_import('cv2')
+np = lazy_import('numpy')
+
+
+def perceptual_hash(image):
+    """64-bit DCT perceptual hash of a PIL image or BGR frame"""
+    gray = to_grayscale(image, (32, 32))
+    low = cv2.dct(gray)[:8, :8].flatten()
+    # Ignore the DC term so overall brightness doesn't dominate the median
+    bits = low > np.median(low[1:])
+    return int(''.join('1' if bit else '0' for bit in bits), 2)
+
+
+def color_signature(image):
+    """Average RGB colour, so flat scenes of different colours don't collide"""
+    if isinstance(image, np.ndarray):
+        small = cv2.resize(image, (16, 16), interpolation=cv2.INTER_AREA)
+        means = small.reshape(-1, small.shape[-1])[:, :3].mean(axis=0)[::-1]
+    else:
+        means = np.asarray(image.convert('RGB').resize((16, 16))).reshape(-1, 3).mean(axis=0)
+    return [round(float(value), 1) for value in means]
+
+
+def hamming_distance(a, b):
+    return bin(a ^ b).count('1')
+
+
+def context_key(prompt, model, options):
+    """Stable digest of everything besides the image that affects the analysis"""
+    payload = json.dumps({'prompt': prompt, 'model': model, 'options': options}, sort_keys=True)
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+
+class AnalysisCache:
+    """LRU + TTL cache of analyses keyed by perceptual hash and request context"""
+
+    def __init__(self, max_entries=128, ttl=600, max_distance=6, max_color_delta=12, path=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_distance = max_distance
+        self.max_color_delta = max_color_delta
+        self.path = path
+
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        if self.path:
+            self.load()
+
+    def _expired(self, entry, now):
+        return self.ttl and now - entry['created'] > self.ttl
+
+    def _purge_expired(self, now):
+        for key in [key for key, entry in self.entries.items() if self._expired(entry, now)]:
+            del self.entries[key]
+
+    def get(self, image, context):
+        """Return a cached analysis for a near-identical image, or None"""
+        image_hash = perceptual_hash(image)
+        color = color_signature(image)
+        now = time.time()
+
+        with self._lock:
+            self._purge_expired(now)
+
+            best_key, best_distance = None, None
+            for key, entry in self.entries.items():
+                if entry['context'] != context:
+                    continue
+                if max(abs(a - b) for a, b in zip(entry['color'], color)) > self.max_color_delta:
+                    continue
+                distance = hamming_distance(entry['hash'], image_hash)
+                if distance <= self.max_distance and (best_distance is None or distance < best_distance):
+                    best_key, best_distance = key, distance
+                    if distance == 0:
+                        break
+
+            if best_key is None:
+                self.misses += 1
+                return None
+
+            self.entries.move_to_end(best_key)
+            self.hits += 1
+            return self.entries[best_key]['analysis']
+
+    def put(self, image, context, analysis):
+        """Store an analysis, evicting the least recently used entries over capacity"""
+        image_hash = perceptual_hash(image)
+        entry = {
+            'context': context,
+            'hash': image_hash,
+            'color': color_signature(image),
+            'analysis': analysis,
+            'created': time.time(),
+        }
+        key = (context, image_hash, tuple(entry['color']))
+
+        with self._lock:
+            self.entries[key] = entry
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+        if self.path:
+            self.save()
+
+    def load(self):
+        """Load persisted entries, skipping anything already expired"""
+        try:
+            with open(self.path) as f:
+                stored = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Could not load analysis cache {self.path}: {e}")
+            return
+
+        now = time.time()
+        with self._lock:
+            for entry in stored:
+                if self._expired(entry, now):
+                    continue
+                key = (entry['context'], entry['hash'], tuple(entry['color']))
+                self.entries[key] = entry
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def save(self):
+        """Atomically write the cache to its persistence file"""
+        with self._lock:
+            stored = list(self.entries.values())
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(stored, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"⚠️  Could not save analysis cache {self.path}: {e}")
+
+    def stats(self):
+        return {'entries': len(self.entries), 'hits': self.hits, 'misses': self.misses}
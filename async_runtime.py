@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Asyncio runtime for the AI Eye Assistant
+
+Runs scene observation, speech capture, recognition and conversation as
+asyncio tasks on one event loop (speech output goes to the assistant's TTS
+worker thread), talking to Ollama through
+ollama.AsyncClient. Model calls take turns through the assistant's
+RequestScheduler, so a user question goes ahead of queued scene analysis
+and "what do you see?" gets a fresh look. Every stage has a timeout, and
+Ctrl+C (or Q in the webcam window) cancels everything cleanly instead of
+flipping a `listening` flag.
+"""
+import asyncio
+import os
+import sys
+import time
+from contextlib import asynccontextmanager
+
+from ai_eye_assistant import AIEyeAssistant, CAPTURE_INTERVAL, LOOK_REQUEST, MODEL_NAME
+from inference_scheduler import INTERACTIVE, PERIODIC, RequestCancelled
+from lazy_import import lazy_import
+from tts_worker import NARRATION, REPLY
+
+cv2 = lazy_import('cv2')
+sr = lazy_import('speech_recognition')
+
+REQUEST_TIMEOUT = float(os.getenv('REQUEST_TIMEOUT', 60))  # Seconds per model call
+RECOGNITION_TIMEOUT = float(os.getenv('RECOGNITION_TIMEOUT', 10))  # Seconds per transcription
+
+
+class AsyncAssistantRuntime:
+    """Drive an AIEyeAssistant with cancellable asyncio tasks"""
+
+    def __init__(self, assistant, client=None):
+        self.assistant = assistant
+        self.client = client or assistant.backend.async_client
+        self.utterances = asyncio.Queue(maxsize=8)  # Recognized user speech
+        self.tasks = []
+        self.recognitions = set()
+        self.stopping = None
+
+    @asynccontextmanager
+    async def model_slot(self, priority):
+        """Hold one of the assistant's model slots, waiting for it without blocking the event loop
+
+        Raises RequestCancelled if periodic work gives way to the user while it waits.
+        """
+        requests = self.assistant.requests
+        acquiring = asyncio.ensure_future(asyncio.to_thread(requests.acquire, priority))
+        try:
+            request = await asyncio.shield(acquiring)
+        except asyncio.CancelledError:
+            # The worker thread still gets the slot; give it straight back
+            acquiring.add_done_callback(
+                lambda done: done.cancelled() or done.exception() or requests.release(done.result()))
+            raise
+        try:
+            yield request
+        finally:
+            requests.release(request)
+
+    async def analyze(self, image):
+        """Scene analysis with the same scheduling/gating/cache/resolution steps as analyze_scene
+
+        Raises RequestCancelled if the user spoke while the frame waited for the model.
+        """
+        assistant = self.assistant
+        async with self.model_slot(PERIODIC):
+            assistant.observing = image  # A "what do you see?" meanwhile looks at this frame too
+            try:
+                # Hashing, resizing and encoding are CPU work, keep them off the event loop
+                analysis, request = await asyncio.to_thread(assistant.prepare_scene_request, image)
+                if request is None:
+                    return analysis
+
+                started = time.time()
+                response = await asyncio.wait_for(
+                    self.assistant.backend.agenerate(self.client, **request), REQUEST_TIMEOUT)
+                analysis = response['response']
+                latency = time.time() - started
+                assistant.metrics.observe('inference', latency)
+                assistant.complete_scene_request(image, request, analysis, latency)
+                return analysis
+
+            except asyncio.TimeoutError:
+                return assistant.scene_analysis_failed(f"timed out after {REQUEST_TIMEOUT:.0f}s")
+            except Exception as e:
+                return assistant.scene_analysis_failed(e)
+            finally:
+                assistant.observing = None
+
+    async def respond(self, text):
+        """Conversational reply to something the user said, ahead of any queued scene analysis"""
+        prompt, options = self.assistant.conversation_request(text)
+        try:
+            async with self.model_slot(INTERACTIVE):
+                started = time.perf_counter()
+                response = await asyncio.wait_for(
+                    self.assistant.backend.agenerate(self.client, model=MODEL_NAME, prompt=prompt, options=options),
+                    REQUEST_TIMEOUT,
+                )
+                self.assistant.metrics.observe('llm', time.perf_counter() - started)
+            return response.get('response', "I'm not sure how to respond to that.")
+        except asyncio.TimeoutError:
+            return "Sorry, that took me too long to think about."
+        except Exception as e:
+            return f"Sorry, I had trouble processing what you said: {e}"
+
+    def enqueue_speech(self, text, priority=NARRATION):
+        """Hand text to the TTS worker, which queues, prioritises and speaks it on its own thread"""
+        if self.assistant.enable_tts and text:
+            self.assistant.speak(text, priority)
+
+    async def observe_loop(self):
+        """Capture a frame, analyze it and queue the narration, every CAPTURE_INTERVAL seconds"""
+        assistant = self.assistant
+        while True:
+            observation = await asyncio.to_thread(assistant.capture_observation)
+            if observation is None:
+                self.stop()
+                return
+
+            observation = await asyncio.to_thread(assistant.preprocess_observation, observation)
+            try:
+                analysis = await self.analyze(observation['image'])
+            except RequestCancelled:
+                # The user spoke while this frame waited for the model; look again once they're answered
+                print("⏸️  Observation deferred while I answer you")
+                continue
+            if assistant.report_observation(observation, analysis) is not None:
+                self.enqueue_speech(assistant.prepare_speech_text(analysis))
+
+            # OpenCV windows belong to the main thread, which is the event loop thread here
+            if observation['frame'] is not None:
+                cv2.imshow('AI Eye Assistant - Webcam Feed (Press Q to quit)', observation['frame'])
+                if cv2.waitKey(1) & 0xFF == ord('q'):
+                    self.stop()
+                    return
+
+            await asyncio.sleep(CAPTURE_INTERVAL)
+
+    def listen_once(self):
+        """Capture one phrase from the microphone (runs in a worker thread)"""
+        with self.assistant.microphone as source:
+            started = time.perf_counter()
+            audio = self.assistant.recognizer.listen(source, timeout=1, phrase_time_limit=5)
+            self.assistant.metrics.observe('listen', time.perf_counter() - started)
+            return audio
+
+    async def listen_loop(self):
+        """Keep capturing phrases; each one is recognized in its own task"""
+        # A calibration that timed out at startup may still hold the microphone
+        await asyncio.to_thread(self.assistant.wait_for_calibration)
+        if self.assistant.mic_key:
+            # Reused a saved calibration: make sure it still fits the room
+            await asyncio.to_thread(self.assistant.check_calibration)
+        while True:
+            try:
+                audio = await asyncio.to_thread(self.listen_once)
+            except sr.WaitTimeoutError:
+                continue
+            except Exception as e:
+                print(f"⚠️  Speech capture error: {e}")
+                await asyncio.sleep(1)
+                continue
+
+            # Recognize in the background so the next phrase is captured right away
+            task = asyncio.create_task(self.recognize(audio))
+            self.recognitions.add(task)
+            task.add_done_callback(self.recognitions.discard)
+
+    async def recognize(self, audio):
+        """Transcribe one phrase and hand it to the conversation task"""
+        started = time.perf_counter()
+        try:
+            text = await asyncio.wait_for(
+                asyncio.to_thread(self.assistant.speech_backend.recognize, audio),
+                RECOGNITION_TIMEOUT,
+            )
+        except sr.UnknownValueError:
+            return
+        except asyncio.TimeoutError:
+            print(f"⚠️  Speech recognition timed out after {RECOGNITION_TIMEOUT:.0f}s")
+            return
+        except sr.RequestError as e:
+            print(f"⚠️  Speech recognition service error: {e}")
+            return
+        finally:
+            self.assistant.metrics.observe('recognize', time.perf_counter() - started)
+
+        if text and text.strip():
+            print(f"\n🗣️  You said: '{text}'")
+            await self.utterances.put(text)
+
+    async def conversation_loop(self):
+        """Answer the user while scene analysis carries on independently"""
+        while True:
+            text = await self.utterances.get()
+            print(f"\n💬 Processing your input: '{text}'")
+            # "What do you see?" gets a fresh frame analyzed ahead of the scheduled observations
+            if LOOK_REQUEST.search(text) and await asyncio.to_thread(self.assistant.describe_now):
+                continue
+
+            reply = await self.respond(text)
+            print(f"🤖 AI Response: {reply}")
+            self.enqueue_speech(reply, REPLY)
+
+    def task_finished(self, task):
+        """Stop the runtime if any long-running task dies unexpectedly"""
+        if not task.cancelled() and task.exception() is not None:
+            print(f"❌ {task.get_name()} failed: {task.exception()}")
+            self.stop()
+
+    def stop(self):
+        if self.stopping:
+            self.stopping.set()
+
+    async def run(self):
+        """Start every task and wait until something asks us to stop"""
+        self.stopping = asyncio.Event()
+        loops = {
+            'observe': self.observe_loop,
+            'listen': self.listen_loop,
+            'conversation': self.conversation_loop,
+        }
+
+        for name, loop in loops.items():
+            task = asyncio.create_task(loop(), name=name)
+            task.add_done_callback(self.task_finished)
+            self.tasks.append(task)
+
+        print("⚙️  Async runtime started: observation, listening and conversation run as tasks")
+        try:
+            await self.stopping.wait()
+        finally:
+            pending = self.tasks + list(self.recognitions)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+
+if __name__ == "__main__":
+    demo_mode = '--demo' in sys.argv[1:]
+
+    print("🚀 Starting AI Eye Assistant (async runtime)...")
+    assistant = AIEyeAssistant(demo_mode=demo_mode, background_listening=False)
+    try:
+        asyncio.run(AsyncAssistantRuntime(assistant).run())
+    except KeyboardInterrupt:
+        print("\n\n👋 AI Eyes shutting down... Thanks for letting me observe!")
+    finally:
+        assistant.cleanup()
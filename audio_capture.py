@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+Continuous audio capture with voice activity detection
+
+Instead of re-opening the microphone for every recognizer.listen() call, one
+input stream stays open and every frame is written into a fixed-size ring
+buffer. A frame-level energy VAD decides where utterances start and end;
+when one ends, it is cut out of the ring buffer together with a little
+pre-roll from before the trigger, so the first syllable isn't lost, and
+handed on as a speech_recognition.AudioData.
+
+A WAV file can stand in for the microphone (WavStream), which is how the
+tests drive it and how AUDIO_INPUT feeds recorded speech to the assistants.
+"""
+import math
+import os
+import threading
+import time
+
+from dotenv import load_dotenv
+
+from lazy_import import lazy_import
+
+np = lazy_import('numpy')
+sr = lazy_import('speech_recognition')
+
+load_dotenv()
+
+SAMPLE_RATE = 16000
+SAMPLE_WIDTH = 2  # 16-bit mono throughout
+FRAME_MS = int(os.getenv('VAD_FRAME_MS', 30))  # VAD decision granularity
+VAD_ENERGY_RATIO = float(os.getenv('VAD_ENERGY_RATIO', 3.0))  # Speech = this many times the noise floor
+VAD_MIN_ENERGY = float(os.getenv('VAD_MIN_ENERGY', 300))  # Never call quieter frames speech (int16 RMS)
+VAD_PREROLL = float(os.getenv('VAD_PREROLL', 0.3))  # Seconds kept from before speech started
+VAD_HANGOVER = float(os.getenv('VAD_HANGOVER', 0.6))  # Seconds of silence that end an utterance
+MAX_UTTERANCE = float(os.getenv('MAX_UTTERANCE', 10.0))  # Longer speech is cut into pieces
+AUDIO_INPUT = os.getenv('AUDIO_INPUT') or None  # WAV file to use instead of the microphone
+
+
+class RingBuffer:
+    """Fixed-size byte ring addressed by absolute stream offsets"""
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.data = bytearray(capacity)
+        self.written = 0  # Total bytes ever written; the next write lands at this offset
+
+    def write(self, chunk):
+        self.written += max(0, len(chunk) - self.capacity)  # Only the tail of an oversized chunk fits
+        chunk = chunk[-self.capacity:]
+        start = self.written % self.capacity
+        end = start + len(chunk)
+        if end <= self.capacity:
+            self.data[start:end] = chunk
+        else:
+            split = self.capacity - start
+            self.data[start:] = chunk[:split]
+            self.data[:end - self.capacity] = chunk[split:]
+        self.written += len(chunk)
+
+    def oldest(self):
+        """Offset of the oldest byte still held"""
+        return max(0, self.written - self.capacity)
+
+    def read(self, start, end=None):
+        """Bytes between two absolute offsets; anything already overwritten is clipped off"""
+        end = self.written if end is None else min(end, self.written)
+        start = max(start, self.oldest())
+        if start >= end:
+            return b''
+        first, last = start % self.capacity, end % self.capacity
+        if first < last or last == 0:
+            return bytes(self.data[first:last or self.capacity])
+        return bytes(self.data[first:]) + bytes(self.data[:last])
+
+
+def frame_energy(frame):
+    """RMS of a 16-bit PCM frame"""
+    samples = np.frombuffer(frame, dtype=np.int16)
+    if not len(samples):
+        return 0.0
+    return float(np.sqrt(np.mean(samples.astype(np.float32) ** 2)))
+
+
+class EnergyVAD:
+    """Frame-level speech detector against an adaptive noise floor
+
+    The noise floor tracks non-speech frames and creeps up only very slowly
+    during speech, so a fan or street noise raises the bar while talking
+    doesn't, and a room that gets permanently louder isn't stuck as speech.
+    """
+
+    def __init__(self, ratio=VAD_ENERGY_RATIO, min_energy=VAD_MIN_ENERGY, noise_floor=None, adapt=0.05):
+        self.ratio = ratio
+        self.min_energy = min_energy
+        self.noise_floor = noise_floor
+        self.adapt = adapt
+
+    def threshold(self):
+        return max(self.min_energy, (self.noise_floor or 0.0) * self.ratio)
+
+    def is_speech(self, frame):
+        energy = frame_energy(frame)
+        if self.noise_floor is None:
+            self.noise_floor = energy
+        speech = energy >= self.threshold()
+        rate = self.adapt * 0.02 if speech else self.adapt
+        self.noise_floor += (energy - self.noise_floor) * rate
+        return speech
+
+
+class UtteranceSegmenter:
+    """Cut utterances out of a frame stream using a VAD and a ring buffer"""
+
+    def __init__(self, vad=None, sample_rate=SAMPLE_RATE, frame_ms=FRAME_MS, preroll=VAD_PREROLL,
+                 hangover=VAD_HANGOVER, min_speech=0.1, max_utterance=MAX_UTTERANCE):
+        self.vad = vad or EnergyVAD()
+        self.sample_rate = sample_rate
+        self.bytes_per_second = sample_rate * SAMPLE_WIDTH
+        self.frame_bytes = int(sample_rate * frame_ms / 1000) * SAMPLE_WIDTH
+        self.preroll = int(preroll * self.bytes_per_second)
+        self.hangover_frames = max(1, math.ceil(hangover * 1000 / frame_ms))
+        self.min_speech_frames = max(1, math.ceil(min_speech * 1000 / frame_ms))
+        self.max_bytes = int(max_utterance * self.bytes_per_second)
+        # Room for the longest utterance plus its pre-roll and a couple of spare frames
+        self.ring = RingBuffer(self.max_bytes + self.preroll + 4 * self.frame_bytes)
+
+        self.start = None  # Offset where the current utterance's speech began
+        self.speech_frames = 0
+        self.silent_frames = 0
+        self.continued_from = None
+        self.utterances = 0
+
+    def process(self, frame):
+        """Feed one frame; returns the bytes of an utterance that just ended, else None"""
+        offset = self.ring.written
+        self.ring.write(frame)
+        speech = self.vad.is_speech(frame)
+
+        if self.start is None:
+            if speech:
+                self.start, self.speech_frames, self.silent_frames = offset, 1, 0
+            return None
+
+        if speech:
+            self.speech_frames += 1
+            self.silent_frames = 0
+        else:
+            self.silent_frames += 1
+
+        end = self.ring.written
+        if self.silent_frames >= self.hangover_frames:
+            return self.cut(end)
+        if end - self.start >= self.max_bytes:
+            return self.cut(end, keep_going=True)
+        return None
+
+    def cut(self, end, keep_going=False):
+        start, speech_frames = self.start, self.speech_frames
+        # The piece after a cut-off utterance follows on directly, so it gets no pre-roll
+        preroll = 0 if start == self.continued_from else self.preroll
+        self.start = end if keep_going else None
+        self.continued_from = end if keep_going else None
+        self.speech_frames = self.silent_frames = 0
+        if speech_frames < self.min_speech_frames:
+            return None  # A click or a cough, not an utterance
+        self.utterances += 1
+        return self.ring.read(start - preroll, end)
+
+    def flush(self):
+        """Return any utterance still in progress (at end of stream)"""
+        if self.start is None:
+            return None
+        return self.cut(self.ring.written)
+
+
+class MicrophoneStream:
+    """One PyAudio input stream that stays open for the whole session"""
+
+    def __init__(self, device_index=None, sample_rate=SAMPLE_RATE, frame_ms=FRAME_MS):
+        self.device_index = device_index
+        self.sample_rate = sample_rate
+        self.frame_samples = int(sample_rate * frame_ms / 1000)
+        self.audio = None
+        self.stream = None
+
+    def open(self):
+        pyaudio = sr.Microphone.get_pyaudio()
+        self.audio = pyaudio.PyAudio()
+        self.stream = self.audio.open(format=pyaudio.paInt16, channels=1, rate=self.sample_rate, input=True,
+                                      frames_per_buffer=self.frame_samples,
+                                      input_device_index=self.device_index)
+        return self
+
+    def read(self):
+        return self.stream.read(self.frame_samples, exception_on_overflow=False)
+
+    def close(self):
+        if self.stream:
+            self.stream.stop_stream()
+            self.stream.close()
+            self.stream = None
+        if self.audio:
+            self.audio.terminate()
+            self.audio = None
+
+
+class WavStream:
+    """Read a WAV file frame by frame in place of a microphone
+
+    Audio is converted to 16 kHz 16-bit mono. With realtime=True frames are
+    paced at the speed they would arrive from a real microphone.
+    """
+
+    def __init__(self, path, sample_rate=SAMPLE_RATE, frame_ms=FRAME_MS, realtime=False):
+        self.path = path
+        self.sample_rate = sample_rate
+        self.frame_bytes = int(sample_rate * frame_ms / 1000) * SAMPLE_WIDTH
+        self.frame_seconds = frame_ms / 1000
+        self.realtime = realtime
+        self.pcm = b''
+        self.position = 0
+        self.started = None
+
+    def open(self):
+        with sr.AudioFile(self.path) as source:
+            audio = sr.Recognizer().record(source)
+        self.pcm = audio.get_raw_data(convert_rate=self.sample_rate, convert_width=SAMPLE_WIDTH)
+        self.position = 0
+        self.started = time.monotonic()
+        return self
+
+    def read(self):
+        """Next frame, or None at the end of the file"""
+        if self.position + self.frame_bytes > len(self.pcm):
+            return None
+        if self.realtime:
+            due = self.started + (self.position // self.frame_bytes) * self.frame_seconds
+            time.sleep(max(0.0, due - time.monotonic()))
+        frame = self.pcm[self.position:self.position + self.frame_bytes]
+        self.position += self.frame_bytes
+        return frame
+
+    def close(self):
+        pass
+
+
+def open_audio_stream(source=AUDIO_INPUT, device_index=None):
+    """The microphone, or a WAV file (played at real-time pace) when one is given"""
+    if source:
+        return WavStream(source, realtime=True)
+    return MicrophoneStream(device_index=device_index)
+
+
+class AudioCapture:
+    """Keep one stream open, segment it with the VAD, pass each utterance to on_utterance"""
+
+    def __init__(self, stream, on_utterance, segmenter=None):
+        self.stream = stream
+        self.on_utterance = on_utterance
+        self.segmenter = segmenter or UtteranceSegmenter()
+        self.running = False
+        self.frames = 0
+        self.thread = None
+
+    def emit(self, pcm):
+        if pcm:
+            self.on_utterance(sr.AudioData(pcm, self.segmenter.sample_rate, SAMPLE_WIDTH))
+
+    def run(self):
+        """Capture until stop() or the end of the stream"""
+        self.running = True
+        self.stream.open()
+        try:
+            while self.running:
+                frame = self.stream.read()
+                if frame is None:
+                    break
+                self.frames += 1
+                self.emit(self.segmenter.process(frame))
+            self.emit(self.segmenter.flush())
+        finally:
+            self.stream.close()
+            self.running = False
+
+    def run_in_background(self):
+        try:
+            self.run()
+        except Exception as e:
+            print(f"⚠️  Audio capture stopped: {e}")
+
+    def start(self):
+        self.thread = threading.Thread(target=self.run_in_background, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.running = False
+        if self.thread:
+            self.thread.join(timeout=2)
+
+    def stats(self):
+        return {
+            'frames': self.frames,
+            'utterances': self.segmenter.utterances,
+            'noise_floor': getattr(self.segmenter.vad, 'noise_floor', None),
+        }
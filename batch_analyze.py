@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Offline batch analysis of recorded video and image folders
+
+Frames are sampled at a fixed rate, decoded, resized and JPEG-encoded in a
+process pool, then analyzed with a bounded number of concurrent model calls.
+Each result is appended to a JSONL file as soon as it arrives, and --resume
+skips every frame that already has a result, so an interrupted run over
+hours of footage picks up where it stopped.
+
+    python batch_analyze.py recording.mp4 --every 2 --output analyses.jsonl
+    python batch_analyze.py recording.mp4 --every 2 --output analyses.jsonl --resume
+    python batch_analyze.py photos/ --stride 5 --concurrency 2
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from datetime import datetime
+
+from dotenv import load_dotenv
+
+from frame_encoder import FrameEncoder, ResolutionPolicy
+from metrics import get_metrics
+from ollama_backend import get_backend
+from lazy_import import lazy_import
+
+cv2 = lazy_import('cv2')
+
+load_dotenv()
+
+MODEL_NAME = os.getenv('MODEL_NAME', 'llama3.2-vision')
+BATCH_CONCURRENCY = int(os.getenv('BATCH_CONCURRENCY', 2))  # Model calls in flight at once
+BATCH_WORKERS = int(os.getenv('BATCH_WORKERS', 0)) or os.cpu_count() or 2  # Decode processes
+MAX_IMAGE_SIDE = int(os.getenv('MAX_IMAGE_SIDE', 0))
+PIXEL_BUDGET = int(os.getenv('PIXEL_BUDGET', 0))
+JPEG_QUALITY = int(os.getenv('JPEG_QUALITY', 75))
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp', '.webp', '.tif', '.tiff')
+
+SCENE_PROMPT = """
+            You are reviewing a frame from recorded camera footage. Look at this image and give a quick analysis:
+
+            🎬 Scene: [What do you see? Be specific about objects, lighting, setting]
+            👤 Currently: [What is the person doing in this frame? Focus on hands, posture, eyes]
+            🔮 Next Action: [Based on their hand position, eye direction, and body language, what are they likely to do next? Be realistic and specific]
+            💡 I Notice: [One specific detail that stands out]
+
+            Keep each section to 1-2 sentences. Focus on observable facts.
+            """
+SCENE_OPTIONS = {'temperature': 0.3, 'top_p': 0.8, 'num_predict': 200}
+
+
+def plan_video(path, every=2.0):
+    """Frames to analyze from a video file: one every `every` seconds of footage"""
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        raise ValueError(f"Could not open video {path}")
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    cap.release()
+    if count <= 0:
+        raise ValueError(f"Could not determine the length of {path}")
+
+    step = max(1, round(fps * every))
+    return [{'key': f"{path}#{index}", 'source': path, 'frame': index, 'timestamp': round(index / fps, 3)}
+            for index in range(0, count, step)]
+
+
+def plan_images(folder, stride=1):
+    """Every `stride`-th image in a folder, in name order"""
+    names = sorted(name for name in os.listdir(folder) if name.lower().endswith(IMAGE_EXTENSIONS))
+    return [{'key': os.path.join(folder, name), 'source': os.path.join(folder, name)}
+            for name in names[::max(1, stride)]]
+
+
+def plan(inputs, every=2.0, stride=1):
+    """Work items for a list of video files and image folders; unreadable inputs are skipped with a warning"""
+    items = []
+    for path in inputs:
+        try:
+            if os.path.isdir(path):
+                items.extend(plan_images(path, stride))
+            else:
+                items.extend(plan_video(path, every))
+        except (ValueError, OSError) as e:
+            print(f"⚠️  Skipping {path}: {e}")
+    return items
+
+
+def video_of(item):
+    """Video file an item comes from, or None for a still image"""
+    return item['source'] if 'frame' in item else None
+
+
+def chunks(items, size):
+    """Split work into chunks; video chunks never straddle two files so each worker seeks once"""
+    chunk = []
+    for item in items:
+        if chunk and (len(chunk) >= size or video_of(chunk[-1]) != video_of(item)):
+            yield chunk
+            chunk = []
+        chunk.append(item)
+    if chunk:
+        yield chunk
+
+
+def prepare(image, item, policy, encoder):
+    model_image, size = policy.apply(image)
+    return dict(item, resolution=list(size), image=encoder.encode(model_image))
+
+
+def decode_chunk(items, max_side=0, pixel_budget=0, quality=75):
+    """Process-pool worker: decode, resize and JPEG-encode a chunk of frames"""
+    policy = ResolutionPolicy(max_side=max_side, pixel_budget=pixel_budget)
+    encoder = FrameEncoder(quality)
+    results = []
+
+    if 'frame' not in items[0]:
+        for item in items:
+            image = cv2.imread(item['source'])
+            if image is None:
+                results.append(dict(item, error="could not read image"))
+            else:
+                results.append(prepare(image, item, policy, encoder))
+        return results
+
+    # Seek once to the start of the chunk, then grab (without decoding) up to each sampled frame
+    cap = cv2.VideoCapture(items[0]['source'])
+    position = items[0]['frame']
+    cap.set(cv2.CAP_PROP_POS_FRAMES, position)
+    try:
+        for item in items:
+            while position < item['frame'] and cap.grab():
+                position += 1
+            ret, frame = cap.read()
+            position += 1
+            if not ret:
+                results.append(dict(item, error="could not decode frame"))
+            else:
+                results.append(prepare(frame, item, policy, encoder))
+    finally:
+        cap.release()
+    return results
+
+
+def load_checkpoint(path):
+    """Keys that already have a successful result in an existing output file"""
+    done = set()
+    if not os.path.exists(path):
+        return done
+    with open(path) as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # A run killed mid-write leaves a partial last line
+            if 'analysis' in entry:
+                done.add(entry['key'])
+    return done
+
+
+def ends_with_newline(path):
+    with open(path, 'rb') as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b'\n'
+
+
+class BatchAnalyzer:
+    """Decode in a process pool, analyze with bounded concurrency, stream results to JSONL"""
+
+    def __init__(self, output, backend=None, model=MODEL_NAME, concurrency=BATCH_CONCURRENCY,
+                 workers=BATCH_WORKERS, max_side=MAX_IMAGE_SIDE, pixel_budget=PIXEL_BUDGET,
+                 quality=JPEG_QUALITY, chunk_size=8):
+        self.output = output
+        self.backend = backend or get_backend()
+        self.model = model
+        self.concurrency = concurrency
+        self.workers = workers
+        self.max_side = max_side
+        self.pixel_budget = pixel_budget
+        self.quality = quality
+        self.chunk_size = chunk_size
+        self.metrics = get_metrics()
+
+        self.analyzed = 0
+        self.failed = 0
+        self.skipped = 0
+        self._lock = threading.Lock()
+        self._file = None
+
+    def analyze(self, item):
+        """Inference worker: one model call per prepared frame"""
+        entry = {key: value for key, value in item.items() if key != 'image'}
+        if 'error' not in entry:
+            started = time.time()
+            try:
+                with self.metrics.timer('inference'):
+                    response = self.backend.generate(model=self.model, prompt=SCENE_PROMPT,
+                                                     images=[item['image']], options=SCENE_OPTIONS)
+                entry['analysis'] = response['response']
+                entry['latency'] = round(time.time() - started, 3)
+            except Exception as e:
+                entry['error'] = str(e)
+        entry['time'] = datetime.now().isoformat(timespec='seconds')
+        self.write(entry)
+
+    def write(self, entry):
+        with self._lock:
+            self._file.write(json.dumps(entry) + '\n')
+            self._file.flush()
+            if 'analysis' in entry:
+                self.analyzed += 1
+            else:
+                self.failed += 1
+
+    def run(self, items, resume=False):
+        """Analyze work items from plan(); returns a summary dict"""
+        done = load_checkpoint(self.output) if resume else set()
+        pending = [item for item in items if item['key'] not in done]
+        self.skipped = len(items) - len(pending)
+        if self.skipped:
+            print(f"⏭️  Resuming: {self.skipped} frames already analyzed")
+        print(f"🎞️  Analyzing {len(pending)} frames with {self.workers} decode workers "
+              f"and {self.concurrency} concurrent model calls")
+
+        started = time.time()
+        self._file = open(self.output, 'a' if resume else 'w')
+        if resume and self._file.tell() and not ends_with_newline(self.output):
+            self._file.write('\n')  # Terminate a line cut off by a killed run
+        # Bounded queue between decode and inference so decoding can't run far ahead
+        slots = threading.Semaphore(self.concurrency * 2)
+        try:
+            with ProcessPoolExecutor(self.workers) as decoders, ThreadPoolExecutor(self.concurrency) as inference:
+                work = chunks(pending, self.chunk_size)
+                decoding = set()
+                while True:
+                    while len(decoding) < self.workers * 2:
+                        chunk = next(work, None)
+                        if chunk is None:
+                            break
+                        decoding.add(decoders.submit(decode_chunk, chunk, self.max_side,
+                                                     self.pixel_budget, self.quality))
+                    if not decoding:
+                        break
+
+                    finished, decoding = wait(decoding, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        for item in future.result():
+                            slots.acquire()
+                            inference.submit(self.analyze, item).add_done_callback(lambda _: slots.release())
+        finally:
+            self._file.close()
+
+        elapsed = time.time() - started
+        summary = {
+            'analyzed': self.analyzed,
+            'failed': self.failed,
+            'skipped': self.skipped,
+            'seconds': round(elapsed, 2),
+            'frames_per_minute': round(self.analyzed * 60 / elapsed, 1) if elapsed else 0.0,
+        }
+        print(f"✅ {summary['analyzed']} analyzed, {summary['failed']} failed, {summary['skipped']} skipped "
+              f"in {summary['seconds']}s ({summary['frames_per_minute']} frames/min) → {self.output}")
+        return summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Analyze recorded video files and image folders")
+    parser.add_argument('inputs', nargs='+', help="Video files and/or folders of images")
+    parser.add_argument('--output', default='analyses.jsonl', help="JSONL results file")
+    parser.add_argument('--resume', action='store_true', help="Skip frames already in the output file")
+    parser.add_argument('--every', type=float, default=2.0, help="Seconds of video between sampled frames")
+    parser.add_argument('--stride', type=int, default=1, help="Analyze every Nth image in a folder")
+    parser.add_argument('--model', default=MODEL_NAME)
+    parser.add_argument('--concurrency', type=int, default=BATCH_CONCURRENCY, help="Model calls in flight")
+    parser.add_argument('--workers', type=int, default=BATCH_WORKERS, help="Decode processes")
+    parser.add_argument('--max-side', type=int, default=MAX_IMAGE_SIDE, help="Shrink frames to this longest side")
+    parser.add_argument('--pixel-budget', type=int, default=PIXEL_BUDGET, help="Shrink frames to this many pixels")
+    parser.add_argument('--quality', type=int, default=JPEG_QUALITY, help="JPEG quality")
+    args = parser.parse_args()
+
+    items = plan(args.inputs, every=args.every, stride=args.stride)
+    if not items:
+        print("❌ Nothing to analyze in the given inputs")
+        sys.exit(1)
+    analyzer = BatchAnalyzer(args.output, model=args.model, concurrency=args.concurrency,
+                             workers=args.workers, max_side=args.max_side, pixel_budget=args.pixel_budget,
+                             quality=args.quality)
+    try:
+        analyzer.run(items, resume=args.resume)
+    except KeyboardInterrupt:
+        print(f"\n⏸️  Interrupted - rerun with --resume to continue from {args.output}")
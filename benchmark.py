@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+"""
+Benchmark harness for the AI Eye Assistant model path
+
+Runs N iterations of each scenario (vision or text-only prompt, image size,
+num_predict) against an Ollama server and reports p50/p95/p99 end-to-end
+latency, time-to-first-token, tokens/sec and the per-stage cost of encoding
+the frame, the model request itself and parsing the streamed reply into
+speakable sentences. --speech instead compares speech recognition backends
+(load time and per-phrase latency). Results are written as JSON.
+
+    python benchmark.py --iterations 10 --output results.json
+    python benchmark.py --fake            # deterministic run against fake_ollama_server
+    python benchmark.py --temporal 4      # also compare multi-image and mosaic requests
+    python benchmark.py --speech --speech-wav question.wav
+"""
+import argparse
+import json
+import math
+import platform
+import sys
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import speech_recognition as sr
+
+from encode_benchmark import make_test_frame
+from fake_ollama_server import FakeOllamaServer
+from frame_encoder import FrameEncoder
+from ollama_backend import OllamaBackend
+from speech_backends import BACKENDS as SPEECH_BACKENDS, SAMPLE_RATE
+from streaming_speech import StreamingSpeechParser
+from temporal_analysis import build_mosaic, mosaic_prompt, temporal_prompt
+
+MODEL_NAME = 'llama3.2-vision'
+
+SCENE_PROMPT = """
+You are observing through a webcam. Look at this image and give a quick analysis:
+
+🎬 Scene: [What do you see? Be specific about objects, lighting, setting]
+👤 Currently: [What is the person doing RIGHT NOW? Focus on hands, posture, eyes]
+🔮 Next Action: [Based on their current hand position, eye direction, and body language, what will they likely do in the next 10-30 seconds? Be realistic and specific]
+💡 I Notice: [One specific detail that stands out]
+
+Keep each section to 1-2 sentences. Focus on observable facts for better predictions.
+"""
+
+TEXT_PROMPT = """You are a friendly AI assistant that can see through a webcam.
+The user just said: "What do you think I'm working on?"
+
+Respond naturally and conversationally. Keep your response brief (1-2 sentences)."""
+
+IMAGE_SIZES = ((320, 240), (640, 480), (1280, 720))
+NUM_PREDICT = (50, 200)
+
+
+def percentile(values, pct):
+    """Linear-interpolated percentile of a list of numbers"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    low, high = math.floor(rank), math.ceil(rank)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def summarize(values):
+    """p50/p95/p99/mean/min/max of a list of samples"""
+    values = [v for v in values if v is not None]
+    if not values:
+        return None
+    return {
+        'p50': percentile(values, 50),
+        'p95': percentile(values, 95),
+        'p99': percentile(values, 99),
+        'mean': sum(values) / len(values),
+        'min': min(values),
+        'max': max(values),
+    }
+
+
+def build_scenarios(sizes=IMAGE_SIZES, num_predicts=NUM_PREDICT, text=True, temporal_frames=0):
+    """Every vision (size × num_predict) combination plus text-only prompts
+
+    With temporal_frames=K each size also gets a K-image request ('multi')
+    and a K-frame mosaic at the pixel budget of one frame ('mosaic').
+    """
+    scenarios = []
+    for num_predict in num_predicts:
+        for width, height in sizes:
+            scenarios.append({'name': f"vision-{width}x{height}-n{num_predict}", 'kind': 'vision',
+                              'size': [width, height], 'num_predict': num_predict})
+            if temporal_frames > 1:
+                for kind in ('multi', 'mosaic'):
+                    scenarios.append({'name': f"{kind}{temporal_frames}-{width}x{height}-n{num_predict}",
+                                      'kind': kind, 'size': [width, height], 'num_predict': num_predict,
+                                      'frames': temporal_frames})
+        if text:
+            scenarios.append({'name': f"text-n{num_predict}", 'kind': 'text',
+                              'size': None, 'num_predict': num_predict})
+    return scenarios
+
+
+def make_frames(scenario):
+    """Synthetic frames for a scenario: one for a still, K with a drifting scene for temporal kinds"""
+    if scenario['kind'] == 'text':
+        return []
+    frame = make_test_frame(*scenario['size'])
+    count = scenario.get('frames', 1)
+    step = scenario['size'][0] // 20
+    return [np.roll(frame, i * step, axis=1) for i in range(count)]
+
+
+class BenchmarkRunner:
+    """Run benchmark scenarios against one Ollama backend"""
+
+    def __init__(self, backend, model=MODEL_NAME, iterations=5, warmup=1, quality=75):
+        self.backend = backend
+        self.model = model
+        self.iterations = iterations
+        self.warmup = warmup
+        self.encoder = FrameEncoder(quality)
+
+    def request_for(self, scenario, frames):
+        """(prompt, images) for a scenario; building the images is the encode stage"""
+        kind = scenario['kind']
+        if kind == 'text':
+            return TEXT_PROMPT, None
+        if kind == 'multi':
+            return temporal_prompt(len(frames), len(frames) - 1), [self.encoder.encode(f) for f in frames]
+        if kind == 'mosaic':
+            width, height = scenario['size']
+            mosaic = build_mosaic(frames, pixel_budget=width * height)
+            return mosaic_prompt(len(frames), len(frames) - 1), [self.encoder.encode(mosaic)]
+        return SCENE_PROMPT, [self.encoder.encode(frames[-1])]
+
+    def run_once(self, scenario, frames):
+        """One timed request; returns per-stage timings in seconds"""
+        started = time.perf_counter()
+        prompt, images = self.request_for(scenario, frames)
+        encode_time = time.perf_counter() - started
+
+        parser = StreamingSpeechParser(lambda sentence: None, sectioned=scenario['kind'] != 'text')
+        parse_time = 0.0
+        first_token = None
+        final = {}
+
+        request_started = time.perf_counter()
+        stream = self.backend.generate(
+            model=self.model,
+            prompt=prompt,
+            images=images,
+            stream=True,
+            options={'temperature': 0.3, 'top_p': 0.8, 'num_predict': scenario['num_predict']},
+        )
+        for chunk in stream:
+            text = chunk.get('response') or ''
+            if text and first_token is None:
+                first_token = time.perf_counter() - request_started
+            parse_started = time.perf_counter()
+            parser.feed(text)
+            parse_time += time.perf_counter() - parse_started
+            if chunk.get('done'):
+                final = chunk
+        parse_started = time.perf_counter()
+        parser.finish()
+        parse_time += time.perf_counter() - parse_started
+        request_time = time.perf_counter() - request_started - parse_time
+
+        # Prefer the server's own token accounting; fall back to wall time
+        eval_count = final.get('eval_count') or 0
+        eval_duration = (final.get('eval_duration') or 0) / 1e9
+        if eval_count and eval_duration:
+            tokens_per_sec = eval_count / eval_duration
+        elif eval_count and first_token is not None and request_time > first_token:
+            tokens_per_sec = eval_count / (request_time - first_token)
+        else:
+            tokens_per_sec = None
+
+        return {
+            'latency': encode_time + request_time + parse_time,
+            'ttft': None if first_token is None else encode_time + first_token,
+            'tokens_per_sec': tokens_per_sec,
+            'tokens': eval_count,
+            'encode': encode_time,
+            'request': request_time,
+            'parse': parse_time,
+        }
+
+    def run_scenario(self, scenario):
+        """Warm up, then time `iterations` requests and summarize them"""
+        frames = make_frames(scenario)
+        samples, errors = [], []
+        try:
+            for _ in range(self.warmup):
+                self.run_once(scenario, frames)
+        except Exception as e:
+            # Server down or model missing: the timed requests would fail the same way
+            errors.append(str(e))
+        else:
+            for _ in range(self.iterations):
+                try:
+                    samples.append(self.run_once(scenario, frames))
+                except Exception as e:
+                    errors.append(str(e))
+
+        def collect(key):
+            return [sample[key] for sample in samples]
+
+        return dict(scenario, **{
+            'iterations': len(samples),
+            'errors': errors,
+            'latency': summarize(collect('latency')),
+            'ttft': summarize(collect('ttft')),
+            'tokens_per_sec': summarize(collect('tokens_per_sec')),
+            'tokens': summarize(collect('tokens')),
+            'stages': {stage: summarize(collect(stage)) for stage in ('encode', 'request', 'parse')},
+        })
+
+    def run(self, scenarios):
+        results = []
+        for scenario in scenarios:
+            print(f"⏱️  {scenario['name']} ({self.iterations} iterations)...")
+            result = self.run_scenario(scenario)
+            print_result(result)
+            results.append(result)
+        return {
+            'meta': {
+                'model': self.model,
+                'host': self.backend.host,
+                'iterations': self.iterations,
+                'warmup': self.warmup,
+                'quality': self.encoder.quality,
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'timestamp': datetime.now(timezone.utc).isoformat(),
+            },
+            'scenarios': results,
+        }
+
+
+def print_result(result):
+    if result['latency'] is None:
+        print(f"   ❌ all iterations failed: {result['errors'][:1]}")
+        return
+    latency, ttft, stages = result['latency'], result['ttft'], result['stages']
+    line = f"   p50 {latency['p50']:.3f}s  p95 {latency['p95']:.3f}s  p99 {latency['p99']:.3f}s"
+    if ttft:
+        line += f"  TTFT p50 {ttft['p50']:.3f}s"
+    if result['tokens_per_sec']:
+        line += f"  {result['tokens_per_sec']['p50']:.1f} tok/s"
+    print(line)
+    print(f"   stages p50: encode {stages['encode']['p50'] * 1000:.1f}ms, "
+          f"request {stages['request']['p50']:.3f}s, parse {stages['parse']['p50'] * 1000:.2f}ms")
+
+
+def run_benchmarks(host=None, model=MODEL_NAME, iterations=5, warmup=1, scenarios=None, output=None):
+    """Run the suite and optionally write JSON results; returns the results dict"""
+    runner = BenchmarkRunner(OllamaBackend(host=host), model, iterations, warmup)
+    results = runner.run(scenarios or build_scenarios())
+    if output:
+        with open(output, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"📄 Results written to {output}")
+    return results
+
+
+def load_speech_audio(path=None, seconds=2.0):
+    """AudioData from a WAV file, or a synthetic phrase-length tone when none is given"""
+    if path:
+        with sr.AudioFile(path) as source:
+            return sr.Recognizer().record(source)
+    t = np.arange(int(SAMPLE_RATE * seconds)) / SAMPLE_RATE
+    wave = 0.3 * np.sin(2 * np.pi * 220 * t) * (np.sin(2 * np.pi * 3 * t) > 0)
+    return sr.AudioData((wave * 32767).astype(np.int16).tobytes(), SAMPLE_RATE, 2)
+
+
+def benchmark_speech(names=tuple(SPEECH_BACKENDS), audio=None, iterations=5):
+    """Load time and recognition latency of each speech backend on the same audio"""
+    audio = audio or load_speech_audio()
+    results = []
+    for name in names:
+        backend = SPEECH_BACKENDS[name]()
+        print(f"⏱️  speech-{name} ({iterations} iterations)...")
+        try:
+            backend.load()
+        except sr.RequestError as e:
+            print(f"   ⏭️  skipped: {e}")
+            results.append({'backend': name, 'skipped': str(e)})
+            continue
+
+        samples, errors, transcript = [], [], ''
+        for _ in range(iterations):
+            started = time.perf_counter()
+            try:
+                transcript = backend.recognize(audio)
+            except sr.UnknownValueError:
+                transcript = ''  # Still a full recognition pass, so it counts
+            except Exception as e:
+                errors.append(str(e))
+                continue
+            samples.append(time.perf_counter() - started)
+
+        latency = summarize(samples)
+        results.append({'backend': name, 'local': backend.local, 'load_time': backend.load_time,
+                        'iterations': len(samples), 'errors': errors, 'latency': latency,
+                        'transcript': transcript})
+        if latency is None:
+            print(f"   ❌ all iterations failed: {errors[:1]}")
+        else:
+            print(f"   load {backend.load_time:.2f}s  p50 {latency['p50']:.3f}s  p95 {latency['p95']:.3f}s  "
+                  f"→ '{transcript}'")
+    return results
+
+
+def run_speech_benchmarks(names=tuple(SPEECH_BACKENDS), wav=None, iterations=5, output=None):
+    """Compare speech backends and optionally write JSON results"""
+    audio = load_speech_audio(wav)
+    results = {
+        'meta': {
+            'audio': wav or 'synthetic tone',
+            'audio_seconds': len(audio.frame_data) / (audio.sample_rate * audio.sample_width),
+            'iterations': iterations,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+        },
+        'speech': benchmark_speech(names, audio, iterations),
+    }
+    if output:
+        with open(output, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"📄 Results written to {output}")
+    return results
+
+
+def parse_size(value):
+    width, height = value.lower().split('x')
+    return int(width), int(height)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the AI Eye Assistant model path")
+    parser.add_argument('--host', default=None, help="Ollama host (default: OLLAMA_HOST or localhost)")
+    parser.add_argument('--model', default=MODEL_NAME)
+    parser.add_argument('--iterations', type=int, default=5)
+    parser.add_argument('--warmup', type=int, default=1, help="Untimed requests per scenario")
+    parser.add_argument('--sizes', nargs='+', type=parse_size, default=IMAGE_SIZES, help="e.g. 640x480 1280x720")
+    parser.add_argument('--num-predict', nargs='+', type=int, default=NUM_PREDICT)
+    parser.add_argument('--no-text', action='store_true', help="Skip text-only scenarios")
+    parser.add_argument('--temporal', type=int, default=0, metavar='K',
+                        help="Also compare K-image and K-frame mosaic requests against single frames")
+    parser.add_argument('--speech', action='store_true', help="Compare speech recognition backends instead")
+    parser.add_argument('--speech-backends', nargs='+', choices=list(SPEECH_BACKENDS), default=list(SPEECH_BACKENDS))
+    parser.add_argument('--speech-wav', default=None, help="Recorded phrase to transcribe (default: synthetic tone)")
+    parser.add_argument('--output', default='benchmark_results.json')
+    parser.add_argument('--fake', action='store_true', help="Run against a local fake Ollama server")
+    parser.add_argument('--fake-latency', type=float, default=0.2)
+    parser.add_argument('--fake-token-rate', type=float, default=50.0)
+    parser.add_argument('--fake-image-overhead', type=float, default=0.15, help="Fixed seconds per image")
+    args = parser.parse_args(argv)
+
+    if args.speech:
+        return run_speech_benchmarks(args.speech_backends, args.speech_wav, args.iterations, args.output)
+    scenarios = build_scenarios(args.sizes, args.num_predict, text=not args.no_text, temporal_frames=args.temporal)
+    if not args.fake:
+        return run_benchmarks(args.host, args.model, args.iterations, args.warmup, scenarios, args.output)
+
+    with FakeOllamaServer(latency=args.fake_latency, token_rate=args.fake_token_rate,
+                          image_overhead=args.fake_image_overhead, models=[args.model]) as server:
+        print(f"🧪 Using fake Ollama server at {server.url}")
+        return run_benchmarks(server.url, args.model, args.iterations, args.warmup, scenarios, args.output)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Camera sources: device indexes, RTSP/HTTP streams and video files
+
+Anything cv2.VideoCapture can open is accepted; a string of digits is
+treated as a device index ("0" → the default webcam). Video files can loop,
+which makes them handy stand-ins for live cameras in tests and demos.
+"""
+import os
+
+from lazy_import import lazy_import
+
+cv2 = lazy_import('cv2')
+
+
+def parse_source(source):
+    """'0' → 0 (device index); anything else is passed through as a URL/path"""
+    if isinstance(source, int):
+        return source
+    source = str(source).strip()
+    return int(source) if source.isdigit() else source
+
+
+def open_capture(source):
+    """cv2.VideoCapture for a device index, stream URL or video file"""
+    return cv2.VideoCapture(parse_source(source))
+
+
+def open_camera(source):
+    """Open a capture and wait for its first frame; returns (capture, frame)
+
+    The first read returns as soon as the device delivers, so there's no
+    need for a fixed warm-up sleep. Raises RuntimeError if no frame comes.
+    """
+    cap = open_capture(source)
+    if not cap.isOpened():
+        raise RuntimeError("could not open camera")
+    ok, frame = cap.read()
+    if not ok or frame is None:
+        cap.release()
+        raise RuntimeError("camera opened but returned no frames")
+    return cap, frame
+
+
+class CameraSource:
+    """One named frame source with its own scheduling priority and capture interval"""
+
+    def __init__(self, uri, name=None, priority=1, interval=2.0, loop=False):
+        self.uri = parse_source(uri)
+        if name is None:
+            name = f"cam{self.uri}" if isinstance(self.uri, int) else os.path.basename(self.uri) or self.uri
+        self.name = name
+        self.priority = priority
+        self.interval = interval
+        self.loop = loop
+        self.cap = None
+        self.frames_read = 0
+
+    @property
+    def is_file(self):
+        return isinstance(self.uri, str) and os.path.isfile(self.uri)
+
+    def open(self):
+        """Open the capture; returns False if the source isn't available"""
+        self.cap = open_capture(self.uri)
+        return self.cap.isOpened()
+
+    def read(self, buffer=None):
+        """Next frame, or None when the source has ended (files rewind when looping)"""
+        if self.cap is None:
+            return None
+        ret, frame = self.cap.read(buffer)
+        if not ret and self.loop and self.is_file:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ret, frame = self.cap.read(buffer)
+        if not ret:
+            return None
+        self.frames_read += 1
+        return frame
+
+    def close(self):
+        if self.cap is not None:
+            self.cap.release()
+            self.cap = None
+
+    def __repr__(self):
+        return f"CameraSource({self.name!r}, uri={self.uri!r}, priority={self.priority})"
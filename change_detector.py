@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Frame-delta change detection used to skip redundant scene analyses
+"""
+from lazy_import import lazy_import
+
+cv2 = lazy_import('cv2')
+np = lazy_import('numpy')
+
+
+def to_grayscale(image, size=(64, 48)):
+    """Downscale a PIL image or BGR frame to a small float32 grayscale array"""
+    if isinstance(image, np.ndarray):
+        frame = image
+        if frame.ndim == 3:
+            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    else:
+        frame = np.asarray(image.convert('L'))
+    return cv2.resize(frame, size, interpolation=cv2.INTER_AREA).astype(np.float32)
+
+
+class FrameChangeDetector:
+    """Decide whether a frame differs enough from the last analyzed one"""
+
+    def __init__(self, mad_threshold=4.0, motion_threshold=0.02, pixel_threshold=25,
+                 max_skips=15, size=(64, 48)):
+        # mad_threshold: mean absolute grey-level difference (0-255) that counts as a change
+        # motion_threshold: fraction of pixels that moved by more than pixel_threshold
+        # max_skips: force a fresh analysis after this many skips in a row (0 = never)
+        self.mad_threshold = mad_threshold
+        self.motion_threshold = motion_threshold
+        self.pixel_threshold = pixel_threshold
+        self.max_skips = max_skips
+        self.size = size
+
+        self.reference = None
+        self.consecutive_skips = 0
+        self.executed = 0
+        self.skipped = 0
+        self.last_mad = 0.0
+        self.last_motion = 0.0
+
+    def measure(self, gray):
+        """Return (mean absolute difference, motion energy) against the reference frame"""
+        diff = np.abs(gray - self.reference)
+        return float(diff.mean()), float((diff > self.pixel_threshold).mean())
+
+    def has_changed(self, image):
+        """Check a frame and record the decision; changed frames become the new reference"""
+        gray = to_grayscale(image, self.size)
+
+        if self.reference is None:
+            changed = True
+        else:
+            self.last_mad, self.last_motion = self.measure(gray)
+            changed = (self.last_mad >= self.mad_threshold
+                       or self.last_motion >= self.motion_threshold
+                       or (self.max_skips and self.consecutive_skips >= self.max_skips))
+
+        if changed:
+            self.reference = gray
+            self.consecutive_skips = 0
+            self.executed += 1
+        else:
+            self.consecutive_skips += 1
+            self.skipped += 1
+        return changed
+
+    def reset(self):
+        """Forget the reference frame so the next frame is always analyzed"""
+        self.reference = None
+        self.consecutive_skips = 0
+
+    def stats(self):
+        """Counters for executed vs skipped analyses"""
+        total = self.executed + self.skipped
+        return {
+            'executed': self.executed,
+            'skipped': self.skipped,
+            'skip_ratio': round(self.skipped / total, 3) if total else 0.0,
+        }
@@ -118,9 +118,18 @@ except Exception as e:
 
 print("🔍 Debug: Testing microphone calibration...")
 try:
-    with microphone as source:
-        recognizer.adjust_for_ambient_noise(source, duration=0.5)
-    print("✅ Microphone calibration successful")
+    from mic_calibration import MicCalibration, device_key
+    calibration = MicCalibration()
+    mic_key = device_key(microphone)
+    if calibration.restore(recognizer, mic_key):
+        with microphone as source:
+            recalibrated = calibration.verify(recognizer, source, mic_key)
+        print(f"✅ Microphone calibration {'redone' if recalibrated else 'reused'} for {mic_key} "
+              f"(threshold {recognizer.energy_threshold:.0f})")
+    else:
+        with microphone as source:
+            calibration.calibrate(recognizer, source, mic_key, duration=0.5)
+        print(f"✅ Microphone calibration successful for {mic_key} (threshold {recognizer.energy_threshold:.0f})")
 except Exception as e:
     print(f"❌ Microphone calibration failed: {e}")
 
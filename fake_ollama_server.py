@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Ollama HTTP API
+
+Serves /api/generate (streaming and non-streaming), /api/chat, /api/tags,
+/api/ps and /api/version with deterministic, configurable timing: a one-off
+model load delay, a fixed prompt-processing latency, extra latency per image
+and per image megapixel, and a fixed token rate. Benchmarks and tests can run against it with
+no model and no network.
+
+    python fake_ollama_server.py --port 11435 --latency 0.5 --token-rate 40
+"""
+import argparse
+import base64
+import io
+import json
+import socket
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from PIL import Image
+
+CANNED_ANALYSIS = (
+    "🎬 Scene: A tidy desk with a laptop, a coffee mug and a desk lamp in warm light. "
+    "👤 Currently: The person is typing on the keyboard while looking at the screen. "
+    "🔮 Next Action: They will probably reach for the coffee mug in the next few seconds. "
+    "💡 I Notice: A small plant sits next to the monitor."
+)
+CANNED_REPLY = "Hi there! I can see you're busy at your desk. How can I help?"
+
+
+def tokenize(text):
+    """Split text into word-ish tokens that keep their trailing whitespace"""
+    tokens, current = [], ''
+    for char in text:
+        current += char
+        if char in ' \n':
+            tokens.append(current)
+            current = ''
+    if current:
+        tokens.append(current)
+    return tokens
+
+
+def image_megapixels(images):
+    """Total megapixels of the base64 images in a request"""
+    total = 0.0
+    for data in images or []:
+        try:
+            width, height = Image.open(io.BytesIO(base64.b64decode(data))).size
+            total += width * height / 1e6
+        except Exception:
+            pass
+    return total
+
+
+class FakeOllamaServer:
+    """Threaded fake Ollama server with configurable latency and token rate"""
+
+    def __init__(self, host='127.0.0.1', port=0, latency=0.2, token_rate=50.0,
+                 image_latency_per_mp=0.5, load_latency=0.0, models=('llama3.2-vision:latest',),
+                 image_overhead=0.0):
+        self.latency = latency  # Seconds before the first token (prompt processing)
+        self.token_rate = token_rate  # Generated tokens per second
+        self.image_latency_per_mp = image_latency_per_mp  # Extra seconds per image megapixel
+        self.image_overhead = image_overhead  # Fixed extra seconds per image (vision encoder pass)
+        self.load_latency = load_latency  # One-off delay for the first request (cold model)
+        self.models = list(models)
+        self.requests = 0
+        self.loaded = load_latency == 0
+        self._lock = threading.Lock()
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def setup(self):
+                super().setup()
+                # Token chunks are tiny writes; don't let Nagle batch them
+                self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+            def log_message(self, *args):
+                pass
+
+            def do_HEAD(self):
+                self.send_response(200)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+
+            def do_GET(self):
+                if self.path == '/api/tags':
+                    self.send_json({'models': [server.model_info(name) for name in server.models]})
+                elif self.path == '/api/ps':
+                    loaded = server.models if server.loaded else []
+                    self.send_json({'models': [server.model_info(name) for name in loaded]})
+                elif self.path == '/api/version':
+                    self.send_json({'version': '0.0.0-fake'})
+                else:
+                    self.send_json({'error': 'not found'}, status=404)
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                body = json.loads(self.rfile.read(length) or b'{}')
+                if self.path == '/api/generate':
+                    server.handle_generate(self, body, chat=False)
+                elif self.path == '/api/chat':
+                    server.handle_generate(self, body, chat=True)
+                else:
+                    self.send_json({'error': 'not found'}, status=404)
+
+            def send_json(self, payload, status=200):
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def model_info(self, name):
+        return {'name': name, 'model': name, 'digest': 'fake', 'size': 0,
+                'modified_at': datetime.now(timezone.utc).isoformat()}
+
+    def handle_generate(self, handler, body, chat):
+        model = body.get('model', '')
+        if model not in self.models and model.split(':')[0] not in [m.split(':')[0] for m in self.models]:
+            handler.send_json({'error': f"model '{model}' not found"}, status=404)
+            return
+
+        with self._lock:
+            self.requests += 1
+            load_delay = 0.0 if self.loaded else self.load_latency
+            self.loaded = True
+
+        if chat:
+            messages = body.get('messages') or [{}]
+            images = messages[-1].get('images')
+        else:
+            images = body.get('images')
+        num_predict = (body.get('options') or {}).get('num_predict') or 128
+
+        text = CANNED_ANALYSIS if images else CANNED_REPLY
+        tokens = tokenize(text)[:max(num_predict, 1)]
+        prompt_delay = (self.latency + self.image_latency_per_mp * image_megapixels(images)
+                        + self.image_overhead * len(images or []))
+        started = time.monotonic()
+        time.sleep(load_delay + prompt_delay)
+
+        if body.get('stream', True):
+            handler.send_response(200)
+            handler.send_header('Content-Type', 'application/x-ndjson')
+            handler.send_header('Transfer-Encoding', 'chunked')
+            handler.end_headers()
+            for token in tokens:
+                time.sleep(1 / self.token_rate)
+                self.write_chunk(handler, self.chunk(model, token, chat, done=False))
+            final = self.final_chunk(model, chat, len(tokens), started, load_delay, prompt_delay)
+            self.write_chunk(handler, final)
+            handler.wfile.write(b'0\r\n\r\n')
+        else:
+            time.sleep(len(tokens) / self.token_rate)
+            final = self.final_chunk(model, chat, len(tokens), started, load_delay, prompt_delay)
+            final.update(self.chunk(model, ''.join(tokens), chat, done=True))
+            handler.send_json(final)
+
+    def chunk(self, model, text, chat, done):
+        payload = {'model': model, 'created_at': datetime.now(timezone.utc).isoformat(), 'done': done}
+        if chat:
+            payload['message'] = {'role': 'assistant', 'content': text}
+        else:
+            payload['response'] = text
+        return payload
+
+    def final_chunk(self, model, chat, token_count, started, load_delay, prompt_delay):
+        payload = self.chunk(model, '', chat, done=True)
+        payload.update({
+            'done_reason': 'stop',
+            'total_duration': int((time.monotonic() - started) * 1e9),
+            'load_duration': int(load_delay * 1e9),
+            'prompt_eval_count': 32,
+            'prompt_eval_duration': int(prompt_delay * 1e9),
+            'eval_count': token_count,
+            'eval_duration': int(token_count / self.token_rate * 1e9),
+        })
+        return payload
+
+    @staticmethod
+    def write_chunk(handler, payload):
+        data = json.dumps(payload).encode() + b'\n'
+        handler.wfile.write(f"{len(data):X}\r\n".encode() + data + b'\r\n')
+        handler.wfile.flush()
+
+    def start(self):
+        """Serve on a background thread"""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fake Ollama server for benchmarks and tests")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=11435)
+    parser.add_argument('--latency', type=float, default=0.2, help="Seconds before the first token")
+    parser.add_argument('--token-rate', type=float, default=50.0, help="Generated tokens per second")
+    parser.add_argument('--image-latency', type=float, default=0.5, help="Extra seconds per image megapixel")
+    parser.add_argument('--load-latency', type=float, default=0.0, help="One-off cold model load delay")
+    parser.add_argument('--image-overhead', type=float, default=0.0, help="Fixed extra seconds per image")
+    args = parser.parse_args()
+
+    server = FakeOllamaServer(args.host, args.port, args.latency, args.token_rate,
+                              args.image_latency, args.load_latency, image_overhead=args.image_overhead)
+    print(f"🧪 Fake Ollama server listening on {server.url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Fake Ollama server stopped")
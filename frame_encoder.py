@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Direct frame → JPEG encoding and input-resolution policy for the vision model
+
+Webcam frames go straight from the BGR ndarray to cv2.imencode and the raw
+JPEG bytes are handed to the ollama client, which base64-encodes them once
+for the HTTP request. This skips the BGR→RGB conversion, the PIL Image, the
+BytesIO round trip and our own base64 encode/decode (plus the client's
+re-validation of base64 strings) on every frame.
+"""
+from lazy_import import lazy_import
+
+cv2 = lazy_import('cv2')
+np = lazy_import('numpy')
+
+
+def image_size(image):
+    """(width, height) of a BGR ndarray or PIL image"""
+    if isinstance(image, np.ndarray):
+        height, width = image.shape[:2]
+        return width, height
+    return image.size
+
+
+class FrameEncoder:
+    """Encode BGR frames (or PIL images) to JPEG bytes, reusing the colour-conversion buffer for PIL input"""
+
+    def __init__(self, quality=75):
+        self.quality = quality
+        self.params = [int(cv2.IMWRITE_JPEG_QUALITY), int(quality)]
+        self._bgr = None  # Conversion buffer reused for PIL input
+
+    def to_bgr(self, image):
+        """Return a BGR ndarray view of the image, converting PIL images in place"""
+        if isinstance(image, np.ndarray):
+            return image
+
+        if image.mode != 'RGB':
+            image = image.convert('RGB')
+        rgb = np.asarray(image)
+        if self._bgr is None or self._bgr.shape != rgb.shape:
+            self._bgr = np.empty_like(rgb)
+        cv2.cvtColor(rgb, cv2.COLOR_RGB2BGR, dst=self._bgr)
+        return self._bgr
+
+    def encode(self, image):
+        """Encode to JPEG bytes ready to pass in images=[...]
+
+        cv2.imencode allocates a fresh buffer for every frame, and the ollama
+        client only takes bytes, so the JPEG is copied out of it once.
+        """
+        ok, buffer = cv2.imencode('.jpg', self.to_bgr(image), self.params)
+        if not ok:
+            raise ValueError("JPEG encoding failed")
+        return buffer.tobytes()
+
+
+class ResolutionPolicy:
+    """Choose the input resolution for the vision model
+
+    In 'fixed' mode images are only shrunk to fit max_side / pixel_budget.
+    In 'auto' mode the policy walks a ladder of max-side tiers and settles
+    on the largest tier whose measured inference latency meets the target,
+    stepping down when a tier gets too slow and periodically probing the
+    next tier up when there is headroom.
+    """
+
+    LADDER = (1280, 1024, 768, 640, 512, 384, 256)
+
+    def __init__(self, mode='fixed', max_side=0, pixel_budget=0, latency_target=3.0,
+                 ladder=LADDER, headroom=0.7, probe_every=20, smoothing=0.3):
+        self.mode = mode
+        self.max_side = max_side
+        self.pixel_budget = pixel_budget
+        self.latency_target = latency_target
+        self.ladder = [side for side in ladder if not max_side or side <= max_side] or [max_side]
+        self.headroom = headroom
+        self.probe_every = probe_every
+        self.smoothing = smoothing
+
+        self.tier = 0
+        self.latency = {}  # max side → smoothed latency in seconds
+        self.since_change = 0
+
+    def target_size(self, width, height):
+        """Size to send for an image of the given dimensions (never upscales)"""
+        scale = 1.0
+        limit = self.ladder[self.tier] if self.mode == 'auto' else self.max_side
+        if limit:
+            scale = min(scale, limit / max(width, height))
+        if self.pixel_budget:
+            scale = min(scale, (self.pixel_budget / (width * height)) ** 0.5)
+        if scale >= 1.0:
+            return width, height
+        return max(1, round(width * scale)), max(1, round(height * scale))
+
+    def apply(self, image):
+        """Resize a BGR frame or PIL image; returns (image, (width, height))"""
+        width, height = image_size(image)
+        size = self.target_size(width, height)
+        if size == (width, height):
+            return image, size
+        if isinstance(image, np.ndarray):
+            return cv2.resize(image, size, interpolation=cv2.INTER_AREA), size
+        return image.resize(size), size
+
+    def record_latency(self, size, latency):
+        """Feed back how long inference took at a given size (auto mode adapts on this)"""
+        if self.mode != 'auto':
+            return
+
+        side = self.ladder[self.tier]
+        previous = self.latency.get(side)
+        self.latency[side] = latency if previous is None else (
+            self.smoothing * latency + (1 - self.smoothing) * previous)
+        self.since_change += 1
+
+        if self.latency[side] > self.latency_target and self.tier < len(self.ladder) - 1:
+            # Too slow: drop to the first tier that actually shrinks what we just sent
+            self.tier += 1
+            while self.tier < len(self.ladder) - 1 and self.ladder[self.tier] >= max(size):
+                self.tier += 1
+            self.since_change = 0
+        elif (self.tier > 0 and self.latency[side] < self.latency_target * self.headroom
+              and self.since_change >= self.probe_every):
+            # Plenty of headroom: try the next tier up again
+            self.tier -= 1
+            self.since_change = 0
+
+    def describe(self):
+        if self.mode == 'auto':
+            return f"auto (≤{self.ladder[self.tier]}px, target {self.latency_target:.1f}s)"
+        limits = []
+        if self.max_side:
+            limits.append(f"max side {self.max_side}px")
+        if self.pixel_budget:
+            limits.append(f"{self.pixel_budget} px budget")
+        return ", ".join(limits) or "native"
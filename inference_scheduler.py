@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+Shared inference scheduler for several observation sources
+
+Every source (camera, stream, file) gets its own small queue where the
+newest frame replaces a stale one. Worker threads pull from those queues
+with stride scheduling: each source advances a virtual clock by 1/priority
+per job, and the source with the lowest clock goes next. Sources therefore
+share the model in proportion to their priority, an idle source can't bank
+credit, and no more than `max_concurrency` requests hit Ollama at once.
+
+RequestScheduler orders the single assistant's own model calls by class
+instead: a reply to the user goes before an on-demand "what do you see"
+analysis, which goes before the periodic observation. Periodic requests
+still waiting when the user speaks are cancelled, and new ones are held
+back until the conversation has been quiet for `holdoff` seconds.
+"""
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+INTERACTIVE = 0  # Replies to something the user said
+ON_DEMAND = 1  # Fresh-frame analysis the user asked for
+PERIODIC = 2  # Scheduled observations
+CLASS_NAMES = ('interactive', 'on_demand', 'periodic')
+
+
+class SourceQueue:
+    """Pending work and accounting for one source"""
+
+    def __init__(self, name, priority=1, depth=1):
+        if priority <= 0:
+            raise ValueError("priority must be positive")
+        self.name = name
+        self.priority = priority
+        self.items = deque()  # (item, submitted_at)
+        self.depth = depth
+        self.virtual_time = 0.0
+        self.submitted = 0
+        self.dropped = 0
+        self.completed = 0
+        self.failed = 0
+        self.wait_total = 0.0
+
+    def stats(self):
+        started = self.completed + self.failed
+        return {
+            'priority': self.priority,
+            'queued': len(self.items),
+            'submitted': self.submitted,
+            'dropped': self.dropped,
+            'completed': self.completed,
+            'failed': self.failed,
+            'avg_wait': self.wait_total / started if started else None,
+        }
+
+
+class InferenceScheduler:
+    """Run handler(source, item) for queued items with fair sharing and a concurrency limit"""
+
+    def __init__(self, handler, max_concurrency=1, queue_depth=1, on_result=None, on_error=None):
+        self.handler = handler
+        self.max_concurrency = max_concurrency
+        self.queue_depth = queue_depth
+        self.on_result = on_result  # on_result(source, item, result)
+        self.on_error = on_error  # on_error(source, item, exception)
+
+        self.sources = {}
+        self.virtual_time = 0.0  # Clock of the most recently dispatched job
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._condition = threading.Condition()
+        self._running = False
+        self._workers = []
+
+    def add_source(self, name, priority=1):
+        with self._condition:
+            if name not in self.sources:
+                self.sources[name] = SourceQueue(name, priority, self.queue_depth)
+            else:
+                self.sources[name].priority = priority
+            return self.sources[name]
+
+    def submit(self, name, item):
+        """Queue an item for a source; the oldest waiting item is dropped if the queue is full"""
+        with self._condition:
+            source = self.sources.get(name) or self.add_source(name)
+            if not source.items:
+                # A source that has been idle starts level with everyone else
+                source.virtual_time = max(source.virtual_time, self.virtual_time)
+            while len(source.items) >= source.depth:
+                source.items.popleft()
+                source.dropped += 1
+            source.items.append((item, time.monotonic()))
+            source.submitted += 1
+            self._condition.notify()
+
+    def _next_job(self):
+        """Pop the next job by lowest virtual time (call with the lock held)"""
+        ready = [source for source in self.sources.values() if source.items]
+        if not ready:
+            return None
+        source = min(ready, key=lambda s: (s.virtual_time, -s.priority))
+        item, submitted_at = source.items.popleft()
+        self.virtual_time = source.virtual_time
+        source.virtual_time += 1.0 / source.priority
+        source.wait_total += time.monotonic() - submitted_at
+        return source, item
+
+    def _worker(self):
+        while True:
+            with self._condition:
+                job = None
+                while self._running:
+                    job = self._next_job()
+                    if job:
+                        break
+                    self._condition.wait()
+                if job is None:
+                    return
+                self.in_flight += 1
+                self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+            source, item = job
+            try:
+                result = self.handler(source.name, item)
+            except Exception as e:
+                with self._condition:
+                    source.failed += 1
+                if self.on_error:
+                    self.on_error(source.name, item, e)
+            else:
+                with self._condition:
+                    source.completed += 1
+                if self.on_result:
+                    self.on_result(source.name, item, result)
+            finally:
+                with self._condition:
+                    self.in_flight -= 1
+
+    def start(self):
+        with self._condition:
+            self._running = True
+        self._workers = [threading.Thread(target=self._worker, daemon=True, name=f"inference-{i}")
+                         for i in range(self.max_concurrency)]
+        for worker in self._workers:
+            worker.start()
+
+    def stop(self, timeout=5.0):
+        """Stop accepting work; waits for in-flight jobs up to `timeout` seconds"""
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+        for worker in self._workers:
+            worker.join(timeout)
+        self._workers = []
+
+    def pending(self):
+        with self._condition:
+            return sum(len(source.items) for source in self.sources.values()) + self.in_flight
+
+    def stats(self):
+        with self._condition:
+            return {
+                'max_concurrency': self.max_concurrency,
+                'max_in_flight': self.max_in_flight,
+                'sources': {name: source.stats() for name, source in self.sources.items()},
+            }
+
+
+class RequestCancelled(Exception):
+    """A periodic request was dropped in favour of the user"""
+
+
+class ModelRequest:
+    """One caller waiting for its turn at the model"""
+
+    def __init__(self, priority, sequence):
+        self.priority = priority
+        self.sequence = sequence
+        self.submitted_at = time.monotonic()
+        self.cancelled = False
+
+
+class ClassStats:
+    """Counts and queue wait for one priority class"""
+
+    def __init__(self):
+        self.submitted = 0
+        self.completed = 0
+        self.cancelled = 0
+        self.wait_total = 0.0
+        self.max_wait = 0.0
+
+    def stats(self):
+        return {
+            'submitted': self.submitted,
+            'completed': self.completed,
+            'cancelled': self.cancelled,
+            'avg_wait': self.wait_total / self.completed if self.completed else None,
+            'max_wait': self.max_wait if self.completed else None,
+        }
+
+
+class RequestScheduler:
+    """Give model calls their turn by priority class, deferring periodic work while the user is talking"""
+
+    def __init__(self, max_concurrency=1, holdoff=0.0, metrics=None):
+        self.max_concurrency = max_concurrency
+        self.holdoff = holdoff  # Seconds periodic work waits after the last interactive/on-demand request
+        self.metrics = metrics
+        self.pending = []  # Sorted by (priority, sequence)
+        self.in_flight = [0] * len(CLASS_NAMES)
+        self.sequence = 0
+        self.last_urgent = None  # When the last interactive/on-demand request finished
+        self.classes = [ClassStats() for _ in CLASS_NAMES]
+        self._condition = threading.Condition()
+
+    @contextmanager
+    def request(self, priority=PERIODIC):
+        """Hold one model slot for the duration of the block
+
+        Blocks until every higher-priority request ahead of this one has
+        gone. Raises RequestCancelled if this is periodic work the user
+        preempted while it was waiting.
+        """
+        request = self.acquire(priority)
+        try:
+            yield request
+        finally:
+            self.release(request)
+
+    def run(self, fn, priority=PERIODIC):
+        with self.request(priority):
+            return fn()
+
+    def acquire(self, priority):
+        with self._condition:
+            self.sequence += 1
+            request = ModelRequest(priority, self.sequence)
+            self.classes[priority].submitted += 1
+            if priority == INTERACTIVE:
+                # Whatever the periodic work was going to look at is old news by the time the model is free
+                for queued in self.pending:
+                    if queued.priority == PERIODIC:
+                        queued.cancelled = True
+                self.pending = [queued for queued in self.pending if not queued.cancelled]
+            self.pending.append(request)
+            self.pending.sort(key=lambda r: (r.priority, r.sequence))
+            self._condition.notify_all()
+
+            while True:
+                if request.cancelled:
+                    self.count(request, 'cancelled')
+                    self._condition.notify_all()
+                    raise RequestCancelled(f"{CLASS_NAMES[priority]} request gave way to the user")
+                delay = self.delay(request)
+                if delay == 0:
+                    break
+                self._condition.wait(delay)
+
+            self.pending.remove(request)
+            self.in_flight[priority] += 1
+            waited = time.monotonic() - request.submitted_at
+            stats = self.classes[priority]
+            stats.wait_total += waited
+            stats.max_wait = max(stats.max_wait, waited)
+        if self.metrics:
+            self.metrics.observe(f"queue_wait_{CLASS_NAMES[priority]}", waited)
+        return request
+
+    def delay(self, request):
+        """0 if the request may start now, otherwise how long to wait before checking again (None = until notified)"""
+        if self.pending[0] is not request or sum(self.in_flight) >= self.max_concurrency:
+            return None
+        if request.priority != PERIODIC:
+            return 0
+        if self.in_flight[INTERACTIVE] or self.in_flight[ON_DEMAND]:
+            return None
+        if self.last_urgent is not None:
+            remaining = self.last_urgent + self.holdoff - time.monotonic()
+            if remaining > 0:
+                return remaining
+        return 0
+
+    def release(self, request):
+        with self._condition:
+            self.in_flight[request.priority] -= 1
+            if request.priority != PERIODIC:
+                self.last_urgent = time.monotonic()
+            self.count(request, 'completed')
+            self._condition.notify_all()
+
+    def count(self, request, outcome):
+        stats = self.classes[request.priority]
+        setattr(stats, outcome, getattr(stats, outcome) + 1)
+        if self.metrics:
+            self.metrics.inc('model_requests_total', priority=CLASS_NAMES[request.priority], outcome=outcome)
+
+    def stats(self):
+        with self._condition:
+            return {name: stats.stats() for name, stats in zip(CLASS_NAMES, self.classes)}
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Lazy module imports
+
+cv2, ollama, speech_recognition, pyttsx3, PIL and numpy together take most
+of a second to import, and plenty of runs never touch some of them (no TTS,
+no camera, text-only). `cv2 = lazy_import('cv2')` gives a stand-in that
+imports the real module on first attribute access, so each dependency is
+paid for only by the feature that uses it.
+
+Attribute writes and deletes go through to the real module, so
+unittest.mock.patch('some_module.cv2.VideoCapture') keeps working.
+"""
+import importlib
+import sys
+import types
+
+
+class LazyModule(types.ModuleType):
+    """Module proxy that imports the real module when first used"""
+
+    def __init__(self, name):
+        super().__init__(name)
+        self.__dict__['_module'] = None
+
+    def _load(self):
+        module = self.__dict__['_module']
+        if module is None:
+            module = importlib.import_module(self.__name__)
+            self.__dict__['_module'] = module
+        return module
+
+    @property
+    def loaded(self):
+        return self.__dict__['_module'] is not None
+
+    def __getattr__(self, name):
+        # Only called for names the proxy itself doesn't have
+        return getattr(self._load(), name)
+
+    def __setattr__(self, name, value):
+        setattr(self._load(), name, value)
+
+    def __delattr__(self, name):
+        delattr(self._load(), name)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        state = 'loaded' if self.loaded else 'not loaded yet'
+        return f"<lazy module '{self.__name__}' ({state})>"
+
+
+def lazy_import(name):
+    """The module itself if it is already imported, otherwise a LazyModule for it"""
+    return sys.modules.get(name) or LazyModule(name)
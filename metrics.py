@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Lightweight per-stage latency instrumentation
+
+Histograms and counters kept in memory with fixed buckets, cheap enough to
+leave on all the time (a perf_counter pair, a lock and a bisect per sample).
+They can be scraped as Prometheus text from a small HTTP endpoint and/or
+dumped as JSONL snapshots on an interval.
+
+    metrics = get_metrics()
+    with metrics.timer('encode'):
+        ...
+    metrics.inc('observations_total', source='model')
+"""
+import bisect
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+METRICS_ENABLED = os.getenv('METRICS', 'true').lower() == 'true'
+METRICS_PORT = int(os.getenv('METRICS_PORT', 0))  # Prometheus endpoint port, 0 = off
+METRICS_FILE = os.getenv('METRICS_FILE') or None  # Periodic JSONL snapshots
+METRICS_INTERVAL = float(os.getenv('METRICS_INTERVAL', 60))  # Seconds between snapshots
+
+# Seconds: covers sub-millisecond conversions up to slow model calls
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+                   1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+PREFIX = 'ai_eye_'
+
+
+class Counter:
+    """Monotonic counter"""
+
+    def __init__(self):
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1):
+        with self._lock:
+            self.value += amount
+
+    def snapshot(self):
+        return {'value': self.value}
+
+
+class Histogram:
+    """Fixed-bucket histogram with sum and count"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)  # Last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+    def quantile(self, q):
+        """Estimate a quantile by interpolating inside the bucket that holds it"""
+        with self._lock:
+            counts, total = list(self.counts), self.count
+        if not total:
+            return None
+        rank = q * total
+        seen = 0
+        for index, count in enumerate(counts):
+            if seen + count >= rank and count:
+                lower = self.buckets[index - 1] if index > 0 else 0.0
+                if index == len(self.buckets):
+                    return lower  # Beyond the last bucket, the best we can say
+                upper = self.buckets[index]
+                return lower + (upper - lower) * (rank - seen) / count
+            seen += count
+        return self.buckets[-1]
+
+    def snapshot(self):
+        with self._lock:
+            count, total = self.count, self.sum
+        return {
+            'count': count,
+            'sum': total,
+            'mean': total / count if count else None,
+            'p50': self.quantile(0.5),
+            'p95': self.quantile(0.95),
+            'p99': self.quantile(0.99),
+        }
+
+
+def label_key(labels):
+    return tuple(sorted(labels.items()))
+
+
+def format_labels(key, extra=None):
+    pairs = list(key) + (extra or [])
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{value}"' for name, value in pairs) + '}'
+
+
+class MetricsRegistry:
+    """Named, labelled counters and histograms"""
+
+    def __init__(self, enabled=True, buckets=DEFAULT_BUCKETS):
+        self.enabled = enabled
+        self.buckets = buckets
+        self.counters = {}  # name → {label key → Counter}
+        self.histograms = {}  # name → {label key → Histogram}
+        self.exporters = []  # MetricsServer / JsonlDumper instances to stop on close()
+        self._lock = threading.Lock()
+
+    def counter(self, name, **labels):
+        family = self.counters.get(name) or self.counters.setdefault(name, {})
+        key = label_key(labels)
+        metric = family.get(key)
+        if metric is None:
+            with self._lock:
+                metric = family.setdefault(key, Counter())
+        return metric
+
+    def histogram(self, name, **labels):
+        family = self.histograms.get(name) or self.histograms.setdefault(name, {})
+        key = label_key(labels)
+        metric = family.get(key)
+        if metric is None:
+            with self._lock:
+                metric = family.setdefault(key, Histogram(self.buckets))
+        return metric
+
+    def inc(self, name, amount=1, **labels):
+        if self.enabled:
+            self.counter(name, **labels).inc(amount)
+
+    def observe(self, stage, seconds):
+        """Record one stage duration in the stage_seconds histogram"""
+        if self.enabled:
+            self.histogram('stage_seconds', stage=stage).observe(seconds)
+
+    @contextmanager
+    def timer(self, stage):
+        """Time the body of a with-block as one sample of a stage"""
+        if not self.enabled:
+            yield
+            return
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - started)
+
+    def snapshot(self):
+        """Plain-dict view of every metric, for JSON"""
+        return {
+            'counters': {name: [dict(key, **metric.snapshot()) for key, metric in family.items()]
+                         for name, family in list(self.counters.items())},
+            'histograms': {name: [dict(key, **metric.snapshot()) for key, metric in family.items()]
+                           for name, family in list(self.histograms.items())},
+        }
+
+    def render_prometheus(self):
+        """Prometheus text exposition format"""
+        lines = []
+        for name, family in sorted(self.counters.items()):
+            lines.append(f"# TYPE {PREFIX}{name} counter")
+            for key, metric in list(family.items()):
+                lines.append(f"{PREFIX}{name}{format_labels(key)} {metric.value}")
+        for name, family in sorted(self.histograms.items()):
+            lines.append(f"# TYPE {PREFIX}{name} histogram")
+            for key, metric in list(family.items()):
+                with metric._lock:
+                    counts, total, count = list(metric.counts), metric.sum, metric.count
+                cumulative = 0
+                for bound, bucket_count in zip(metric.buckets + (float('inf'),), counts):
+                    cumulative += bucket_count
+                    le = '+Inf' if bound == float('inf') else repr(bound)
+                    lines.append(f"{PREFIX}{name}_bucket{format_labels(key, [('le', le)])} {cumulative}")
+                lines.append(f"{PREFIX}{name}_sum{format_labels(key)} {total}")
+                lines.append(f"{PREFIX}{name}_count{format_labels(key)} {count}")
+        return '\n'.join(lines) + '\n'
+
+    def close(self):
+        """Stop exporters (the JSONL dumper writes a final snapshot)"""
+        for exporter in self.exporters:
+            exporter.stop()
+        self.exporters = []
+
+    def summary(self):
+        """One line per stage, slowest median first"""
+        stages = [(dict(key).get('stage'), metric.snapshot())
+                  for key, metric in list(self.histograms.get('stage_seconds', {}).items())]
+        stages = [(stage, snap) for stage, snap in stages if snap['count']]
+        stages.sort(key=lambda item: item[1]['p50'] or 0, reverse=True)
+        return [f"{stage}: p50 {snap['p50'] * 1000:.1f}ms, p95 {snap['p95'] * 1000:.1f}ms ({snap['count']} samples)"
+                for stage, snap in stages]
+
+
+class MetricsServer:
+    """Serve /metrics in Prometheus text format on a background thread"""
+
+    def __init__(self, registry, port=METRICS_PORT, host='127.0.0.1'):
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                if self.path.split('?')[0] != '/metrics':
+                    self.send_response(404)
+                    self.end_headers()
+                    return
+                body = registry.render_prometheus().encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.httpd.daemon_threads = True
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    @property
+    def port(self):
+        return self.httpd.server_address[1]
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class JsonlDumper:
+    """Append a snapshot of the registry to a JSONL file every `interval` seconds"""
+
+    def __init__(self, registry, path=METRICS_FILE, interval=METRICS_INTERVAL):
+        self.registry = registry
+        self.path = path
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def dump(self):
+        entry = dict(self.registry.snapshot(), time=datetime.now().isoformat(timespec='seconds'))
+        try:
+            with open(self.path, 'a') as f:
+                f.write(json.dumps(entry) + '\n')
+        except OSError as e:
+            print(f"⚠️  Could not write metrics: {e}")
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.dump()
+
+    def stop(self):
+        """Stop the thread and write a final snapshot"""
+        self._stop.set()
+        self._thread.join(timeout=1)
+        self.dump()
+
+
+_shared_metrics = None
+_shared_lock = threading.Lock()
+
+
+def get_metrics():
+    """The process-wide registry, with exporters started per METRICS_PORT / METRICS_FILE"""
+    global _shared_metrics
+    with _shared_lock:
+        if _shared_metrics is None:
+            _shared_metrics = MetricsRegistry(enabled=METRICS_ENABLED)
+            if METRICS_ENABLED and METRICS_PORT:
+                try:
+                    server = MetricsServer(_shared_metrics, METRICS_PORT)
+                    _shared_metrics.exporters.append(server)
+                    print(f"📈 Metrics at http://127.0.0.1:{server.port}/metrics")
+                except OSError as e:
+                    print(f"⚠️  Metrics endpoint unavailable: {e}")
+            if METRICS_ENABLED and METRICS_FILE:
+                _shared_metrics.exporters.append(JsonlDumper(_shared_metrics))
+        return _shared_metrics
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Persisted microphone calibration
+
+adjust_for_ambient_noise() blocks startup for a second every time. The
+calibrated energy threshold (and the recognizer's dynamic-threshold
+settings) is stored per input device in a small JSON file and restored on
+the next start. A full calibration only runs again when the stored one is
+older than MIC_CALIBRATION_MAX_AGE, or when a quick noise-floor check, run
+once listening has started, finds the room much louder or quieter than at
+calibration time.
+"""
+import json
+import os
+import time
+
+from dotenv import load_dotenv
+
+from lazy_import import lazy_import
+
+np = lazy_import('numpy')
+
+load_dotenv()
+
+MIC_CALIBRATION_FILE = os.getenv('MIC_CALIBRATION_FILE', '.mic_calibration.json')
+MIC_CALIBRATION_MAX_AGE = float(os.getenv('MIC_CALIBRATION_MAX_AGE', 86400))  # Seconds before recalibrating
+MIC_DRIFT_RATIO = float(os.getenv('MIC_DRIFT_RATIO', 2.0))  # Noise-floor change that forces recalibration
+
+# Recognizer attributes that make up the calibration
+SETTINGS = ('energy_threshold', 'dynamic_energy_threshold', 'dynamic_energy_adjustment_damping',
+            'dynamic_energy_ratio')
+
+
+def device_key(microphone):
+    """Stable name for the input device behind an sr.Microphone"""
+    try:
+        audio = microphone.pyaudio_module.PyAudio()
+        try:
+            if microphone.device_index is None:
+                info = audio.get_default_input_device_info()
+            else:
+                info = audio.get_device_info_by_index(microphone.device_index)
+        finally:
+            audio.terminate()
+        name = info.get('name', 'default')
+    except Exception:
+        name = f"device-{microphone.device_index if microphone.device_index is not None else 'default'}"
+    return f"{name}@{microphone.SAMPLE_RATE}"
+
+
+def rms(buffer):
+    samples = np.frombuffer(buffer, dtype=np.int16).astype(np.float32)
+    return float(np.sqrt(np.mean(samples ** 2))) if len(samples) else 0.0
+
+
+def measure_noise_floor(source, duration=0.25):
+    """Mean RMS energy of `duration` seconds read from an open audio source"""
+    chunks = max(1, int(duration * source.SAMPLE_RATE / source.CHUNK))
+    return sum(rms(source.stream.read(source.CHUNK)) for _ in range(chunks)) / chunks
+
+
+class MicCalibration:
+    """Per-device calibration cache backed by a JSON file"""
+
+    def __init__(self, path=MIC_CALIBRATION_FILE, max_age=MIC_CALIBRATION_MAX_AGE, drift_ratio=MIC_DRIFT_RATIO):
+        self.path = path
+        self.max_age = max_age
+        self.drift_ratio = drift_ratio
+        self.entries = self.load()
+
+    def load(self):
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Could not load microphone calibration {self.path}: {e}")
+            return {}
+
+    def save(self):
+        """Atomically write all device calibrations"""
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(self.entries, f, indent=2)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"⚠️  Could not save microphone calibration {self.path}: {e}")
+
+    def fresh(self, key, now=None):
+        """The stored calibration for a device, or None if there is none or it is stale"""
+        entry = self.entries.get(key)
+        now = time.time() if now is None else now
+        if entry is None or now - entry.get('calibrated_at', 0) > self.max_age:
+            return None
+        return entry
+
+    def restore(self, recognizer, key):
+        """Apply a fresh stored calibration to the recognizer; False if a full one is needed"""
+        entry = self.fresh(key)
+        if entry is None:
+            return False
+        for name in SETTINGS:
+            if name in entry:
+                setattr(recognizer, name, entry[name])
+        return True
+
+    def calibrate(self, recognizer, source, key, duration=1.0):
+        """Full calibration, stored for next time
+
+        Same threshold update as recognizer.adjust_for_ambient_noise(), but it
+        also keeps the measured ambient energy for later drift checks.
+        """
+        started = time.perf_counter()
+        seconds_per_buffer = source.CHUNK / source.SAMPLE_RATE
+        damping = recognizer.dynamic_energy_adjustment_damping ** seconds_per_buffer
+        energies = []
+        for _ in range(max(1, int(duration / seconds_per_buffer))):
+            energy = rms(source.stream.read(source.CHUNK))
+            energies.append(energy)
+            target = energy * recognizer.dynamic_energy_ratio
+            recognizer.energy_threshold = recognizer.energy_threshold * damping + target * (1 - damping)
+
+        entry = {name: getattr(recognizer, name) for name in SETTINGS}
+        entry.update(noise_floor=sum(energies) / len(energies), calibrated_at=time.time(),
+                     seconds=round(time.perf_counter() - started, 2))
+        self.entries[key] = entry
+        self.save()
+        return entry
+
+    def drifted(self, key, noise_floor):
+        """Whether the room is now much louder or quieter than when the device was calibrated"""
+        stored = self.entries.get(key, {}).get('noise_floor')
+        if not stored or not noise_floor:
+            return stored != noise_floor
+        ratio = noise_floor / stored
+        return ratio > self.drift_ratio or ratio < 1 / self.drift_ratio
+
+    def verify(self, recognizer, source, key, duration=0.25):
+        """Quick noise-floor check of a restored calibration; recalibrates on drift
+
+        Returns True if a full calibration was run.
+        """
+        noise_floor = measure_noise_floor(source, duration)
+        if not self.drifted(key, noise_floor):
+            return False
+        stored = self.entries.get(key, {}).get('noise_floor') or 0.0
+        print(f"🎚️  Background noise changed ({stored:.0f} → {noise_floor:.0f}), recalibrating microphone...")
+        self.calibrate(recognizer, source, key)
+        return True
@@ -9,11 +9,13 @@ import subprocess
 import threading
 import queue
 from datetime import datetime
-from PIL import Image
 import io
-import ollama
-import speech_recognition as sr
 from dotenv import load_dotenv
+from ollama_backend import get_backend
+from lazy_import import lazy_import
+
+Image = lazy_import('PIL.Image')
+sr = lazy_import('speech_recognition')
 
 # Load environment variables
 load_dotenv()
@@ -24,6 +26,10 @@ ENABLE_TTS = os.getenv('ENABLE_TTS', 'true').lower() == 'true'
 class MinimalAIAssistant:
     def __init__(self):
         print("🤖 Initializing Minimal AI Assistant...")
+
+        # Shared Ollama client; load the model while the microphone calibrates
+        self.backend = get_backend()
+        self.backend.warmup_in_background(MODEL_NAME, vision=False)
         
         # Speech recognition setup
         self.recognizer = sr.Recognizer()
@@ -93,7 +99,7 @@ class MinimalAIAssistant:
             Respond naturally and conversationally in 1-2 sentences.
             """
             
-            response = ollama.generate(
+            response = self.backend.generate(
                 model=MODEL_NAME,
                 prompt=prompt,
                 options={
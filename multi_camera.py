@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Watch several cameras or streams from one AI Eye Assistant process
+
+Each source (device index, RTSP/HTTP URL or video file) is captured on its
+own thread and keeps its own change detector and last analysis, while every
+model call goes through one InferenceScheduler sharing a single Ollama
+backend: per-source fair queues, priorities and a global concurrency limit.
+
+    python multi_camera.py 0 rtsp://192.168.1.20/stream door.mp4 --priority cam0=2
+"""
+import argparse
+import os
+import threading
+import time
+from datetime import datetime
+
+from ai_eye_assistant import (AIEyeAssistant, CAPTURE_INTERVAL, CHANGE_GATING, CHANGE_MAD_THRESHOLD,
+                              CHANGE_MAX_SKIPS, CHANGE_MOTION_THRESHOLD, MODEL_NAME)
+from analysis_cache import context_key
+from camera_sources import CameraSource
+from change_detector import FrameChangeDetector
+from inference_scheduler import InferenceScheduler
+from lazy_import import lazy_import
+
+cv2 = lazy_import('cv2')
+
+CAMERA_SOURCES = os.getenv('CAMERA_SOURCES', '0')  # Comma-separated device indexes, URLs or files
+MAX_CONCURRENT_INFERENCES = int(os.getenv('MAX_CONCURRENT_INFERENCES', 1))  # Model calls in flight at once
+
+
+class SourceState:
+    """Per-source observation state"""
+
+    def __init__(self, source, change_gating):
+        self.source = source
+        self.change_detector = None
+        if change_gating:
+            self.change_detector = FrameChangeDetector(
+                mad_threshold=CHANGE_MAD_THRESHOLD,
+                motion_threshold=CHANGE_MOTION_THRESHOLD,
+                max_skips=CHANGE_MAX_SKIPS,
+            )
+        self.previous_analysis = None
+        self.latest_frame = None
+        self.observations = 0
+
+
+class MultiCameraObserver:
+    """Observe several sources, sharing one assistant's model backend, cache and speech"""
+
+    def __init__(self, assistant, sources, max_concurrency=MAX_CONCURRENT_INFERENCES,
+                 change_gating=CHANGE_GATING, show_windows=True, on_analysis=None):
+        self.assistant = assistant
+        self.sources = list(sources)
+        names = [source.name for source in self.sources]
+        duplicates = sorted({name for name in names if names.count(name) > 1})
+        if duplicates:
+            # Per-source state is keyed by name, so one source would silently take over the other's
+            raise ValueError(f"duplicate camera names: {', '.join(duplicates)}")
+        self.states = {source.name: SourceState(source, change_gating) for source in self.sources}
+        self.show_windows = show_windows
+        self.on_analysis = on_analysis  # on_analysis(source_name, analysis)
+        self.scheduler = InferenceScheduler(
+            self.analyze,
+            max_concurrency=max_concurrency,
+            on_result=self.report,
+            on_error=self.analysis_failed,
+        )
+        self._stop = threading.Event()
+        self._threads = []
+
+    def analyze(self, name, frame):
+        """Scheduler handler: gate, check the cache, then run the vision model"""
+        state = self.states[name]
+        assistant = self.assistant
+        metrics = assistant.metrics
+
+        if state.change_detector and not state.change_detector.has_changed(frame) and state.previous_analysis:
+            metrics.inc('analyses_total', source='gated')
+            return None
+
+        prompt, options = assistant.scene_request()
+        context = context_key(prompt, MODEL_NAME, options)
+        if assistant.analysis_cache:
+            cached = assistant.analysis_cache.get(frame, context)
+            if cached is not None:
+                metrics.inc('analyses_total', source='cache')
+                state.previous_analysis = cached
+                return cached
+
+        model_image, size = assistant.resolution_policy.apply(frame)
+        image_data = assistant.encode_image(model_image)
+        started = time.time()
+        with metrics.timer('inference'):
+            response = assistant.backend.generate(
+                model=MODEL_NAME,
+                prompt=prompt,
+                images=[image_data],
+                options=options,
+            )
+        analysis = response['response']
+        assistant.resolution_policy.record_latency(size, time.time() - started)
+        metrics.inc('analyses_total', source='model')
+
+        if assistant.analysis_cache:
+            assistant.analysis_cache.put(frame, context, analysis)
+        state.previous_analysis = analysis
+        return analysis
+
+    def analysis_failed(self, name, frame, error):
+        state = self.states[name]
+        if state.change_detector:
+            state.change_detector.reset()
+        self.assistant.metrics.inc('analyses_total', source='error')
+        print(f"❌ [{name}] Analysis failed: {error}")
+
+    def report(self, name, frame, analysis):
+        """Print and narrate a fresh analysis (gated frames return None and are skipped)"""
+        if analysis is None:
+            return
+        state = self.states[name]
+        state.observations += 1
+        assistant = self.assistant
+        assistant.observation_count += 1
+        # Conversation replies use the most recent observation from any camera
+        assistant.previous_analysis = f"[{name}] {analysis}"
+        assistant.memory.add(analysis, source=name)
+
+        current_time = datetime.now().strftime("%H:%M:%S")
+        print(f"\n{'='*60}")
+        print(f"📷 {name} - observation #{state.observations} at {current_time}")
+        print(f"{'='*60}")
+        print(analysis)
+
+        if self.on_analysis:
+            self.on_analysis(name, analysis)
+        if assistant.enable_tts:
+            assistant.speak(f"On {name}: {assistant.prepare_speech_text(analysis)}")
+
+    def capture_loop(self, state):
+        """Read frames from one source and hand the newest to the scheduler"""
+        source = state.source
+        while not self._stop.is_set():
+            with self.assistant.metrics.timer('camera_read'):
+                frame = source.read()
+            if frame is None:
+                print(f"📴 [{source.name}] Source ended")
+                return
+            state.latest_frame = frame
+            self.scheduler.submit(source.name, frame)
+            self._stop.wait(source.interval)
+
+    def start(self):
+        """Open every source and start capture threads plus the shared scheduler"""
+        for source in self.sources:
+            if not source.open():
+                print(f"⚠️  [{source.name}] Could not open {source.uri}, skipping")
+                continue
+            self.scheduler.add_source(source.name, source.priority)
+            thread = threading.Thread(target=self.capture_loop, args=(self.states[source.name],),
+                                      daemon=True, name=f"capture-{source.name}")
+            self._threads.append(thread)
+
+        if not self._threads:
+            raise RuntimeError("No camera sources could be opened")
+
+        print(f"📷 Watching {len(self._threads)} sources, up to {self.scheduler.max_concurrency} "
+              f"model calls at a time")
+        self.scheduler.start()
+        for thread in self._threads:
+            thread.start()
+
+    def finished(self):
+        """True once every source has ended and all queued work is done"""
+        return not any(thread.is_alive() for thread in self._threads) and self.scheduler.pending() == 0
+
+    def stop(self):
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout=2)
+        self.scheduler.stop()
+        for source in self.sources:
+            source.close()
+
+    def run(self):
+        """Main-thread loop: preview windows until Q, Ctrl+C or all sources end
+
+        Speech is answered by the assistant's own conversation thread.
+        """
+        self.start()
+        try:
+            while not self.finished():
+                if self.show_windows:
+                    for name, state in self.states.items():
+                        if state.latest_frame is not None:
+                            cv2.imshow(f"AI Eye Assistant - {name} (Press Q to quit)", state.latest_frame)
+                    if cv2.waitKey(30) & 0xFF == ord('q'):
+                        break
+                else:
+                    time.sleep(0.1)
+        except KeyboardInterrupt:
+            print("\n\n👋 AI Eyes shutting down... Thanks for letting me observe!")
+        finally:
+            self.stop()
+            for name, stats in self.scheduler.stats()['sources'].items():
+                wait = f"{stats['avg_wait']:.2f}s" if stats['avg_wait'] is not None else "n/a"
+                print(f"📷 {name}: {stats['completed']} analyses, {stats['dropped']} stale frames dropped, "
+                      f"avg queue wait {wait}")
+
+
+def make_names_unique(sources):
+    """Suffix repeated names (/a/cam.mp4 and /b/cam.mp4 are both cam.mp4) with -2, -3, ..."""
+    taken = set()
+    for source in sources:
+        name, number = source.name, 1
+        while source.name in taken:
+            number += 1
+            source.name = f"{name}-{number}"
+        taken.add(source.name)
+    return sources
+
+
+def parse_priorities(values):
+    """['cam0=2', 'door.mp4=1'] → {'cam0': 2.0, 'door.mp4': 1.0}"""
+    priorities = {}
+    for value in values or []:
+        name, _, priority = value.rpartition('=')
+        priorities[name] = float(priority)
+    return priorities
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Observe several cameras or streams with one shared model")
+    parser.add_argument('sources', nargs='*', help="Device indexes, RTSP/HTTP URLs or video files")
+    parser.add_argument('--priority', action='append', metavar='NAME=N', help="Relative share of model time")
+    parser.add_argument('--concurrency', type=int, default=MAX_CONCURRENT_INFERENCES)
+    parser.add_argument('--interval', type=float, default=CAPTURE_INTERVAL, help="Seconds between captures")
+    parser.add_argument('--loop', action='store_true', help="Loop video files")
+    parser.add_argument('--no-window', action='store_true', help="Don't show preview windows")
+    args = parser.parse_args()
+
+    uris = args.sources or [uri for uri in CAMERA_SOURCES.split(',') if uri.strip()]
+    priorities = parse_priorities(args.priority)
+    sources = make_names_unique([CameraSource(uri, interval=args.interval, loop=args.loop) for uri in uris])
+    for source in sources:
+        source.priority = priorities.get(source.name, 1)
+
+    print("🚀 Starting AI Eye Assistant (multi-camera)...")
+    assistant = AIEyeAssistant(camera_source=None)
+    observer = MultiCameraObserver(assistant, sources, max_concurrency=args.concurrency,
+                                   show_windows=not args.no_window)
+    try:
+        observer.run()
+    finally:
+        assistant.cleanup()
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Bounded observation memory with a rolling summary
+
+Replies used to see only the first 200 characters of the latest analysis.
+ObservationMemory keeps the last MEMORY_SIZE observations as short
+structured records (time, what the person is doing, the scene) in a ring
+buffer. Observations that fall out of the buffer are compacted in the
+background, MEMORY_COMPACT_BATCH at a time, into one rolling summary of the
+session, normally by a short model call and otherwise by simply listing the
+activities. context() renders the summary plus as many recent observations
+as fit in MEMORY_TOKEN_BUDGET tokens, so the reply prompt stays the same
+size however long the session runs.
+"""
+import math
+import os
+import threading
+from collections import deque
+from datetime import datetime
+
+from dotenv import load_dotenv
+
+from streaming_speech import SECTION_MARKERS, clean_for_speech
+
+load_dotenv()
+
+MEMORY_SIZE = int(os.getenv('MEMORY_SIZE', 8))  # Recent observations kept in full
+MEMORY_TOKEN_BUDGET = int(os.getenv('MEMORY_TOKEN_BUDGET', 300))  # Tokens of history in a reply prompt
+MEMORY_COMPACT_BATCH = int(os.getenv('MEMORY_COMPACT_BATCH', 4))  # Old observations folded into the summary at once
+
+LINE_TOKENS = 60  # Longest a single remembered observation may be
+
+
+def estimate_tokens(text):
+    """Rough token count: about four characters per token for English text"""
+    return math.ceil(len(text) / 4)
+
+
+def truncate_tokens(text, tokens, keep_end=False):
+    """Cut text to about `tokens` tokens at a word boundary, keeping the start (or the end)"""
+    limit = tokens * 4
+    if len(text) <= limit:
+        return text
+    if keep_end:
+        return '...' + text[len(text) - limit + 3:].split(' ', 1)[-1]
+    return text[:limit - 3].rsplit(' ', 1)[0] + '...'
+
+
+def parse_sections(analysis):
+    """{'scene': ..., 'currently': ..., 'next_action': ..., 'notice': ...} from a sectioned analysis"""
+    sections = {}
+    for line in analysis.splitlines():
+        for marker, section, _ in SECTION_MARKERS:
+            index = line.find(marker)
+            if index != -1:
+                sections[section] = clean_for_speech(line[index + len(marker):])
+                break
+    return sections
+
+
+class Observation:
+    """The parts of one analysis worth remembering"""
+
+    def __init__(self, analysis, at=None, source=None):
+        self.at = at or datetime.now()
+        self.source = source  # Camera name when several are observed
+        sections = parse_sections(analysis)
+        self.activity = sections.get('currently', '')
+        self.scene = sections.get('scene', '')
+        if not (self.activity or self.scene):
+            # Not in the usual sectioned format (e.g. a temporal analysis): keep the text itself
+            self.scene = clean_for_speech(analysis)
+
+    def describe(self):
+        where = f" {self.source}" if self.source else ""
+        text = ' '.join(part for part in (self.activity, self.scene) if part)
+        return truncate_tokens(f"[{self.at:%H:%M:%S}{where}] {text}", LINE_TOKENS)
+
+
+class ObservationMemory:
+    """Recent observations in a ring buffer, older ones compacted into a rolling summary"""
+
+    def __init__(self, size=MEMORY_SIZE, token_budget=MEMORY_TOKEN_BUDGET, compact_batch=MEMORY_COMPACT_BATCH,
+                 summarize=None):
+        self.size = max(1, size)
+        self.token_budget = token_budget
+        self.summary_budget = token_budget // 3  # The rest is left for recent observations
+        self.compact_batch = max(1, compact_batch)
+        self.summarize = summarize  # summarize(summary, observations) → new summary text, or None
+
+        self.recent = deque()
+        self.evicted = []  # Out of the ring buffer, waiting to be compacted
+        self.summary = ''
+        self.lock = threading.Lock()
+        self.compacting = False
+        self.total = 0
+        self.compactions = 0
+
+    def add(self, analysis, at=None, source=None):
+        """Remember a new analysis; failed analyses are ignored"""
+        if not analysis or analysis.startswith('❌'):
+            return
+        observation = Observation(analysis, at, source)
+        with self.lock:
+            self.total += 1
+            self.recent.append(observation)
+            while len(self.recent) > self.size:
+                self.evicted.append(self.recent.popleft())
+            start = len(self.evicted) >= self.compact_batch and not self.compacting
+            if start:
+                self.compacting = True
+        if start:
+            threading.Thread(target=self.compact, daemon=True, name='memory-compaction').start()
+
+    def compact(self):
+        """Fold evicted observations into the summary until fewer than a batch are left"""
+        while True:
+            with self.lock:
+                if len(self.evicted) < self.compact_batch:
+                    self.compacting = False
+                    return
+                batch, self.evicted = self.evicted, []
+                summary = self.summary
+
+            updated = None
+            if self.summarize:
+                try:
+                    updated = self.summarize(summary, batch)
+                except Exception as e:
+                    print(f"⚠️  Could not summarize older observations: {e}")
+            if not updated:
+                updated = self.list_activities(summary, batch)
+
+            with self.lock:
+                # Keep the newest part if the summary comes back too long
+                self.summary = truncate_tokens(' '.join(updated.split()), self.summary_budget, keep_end=True)
+                self.compactions += 1
+
+    def list_activities(self, summary, observations):
+        """Summary without a model: what the person was doing, with repeats collapsed"""
+        activities = []
+        for observation in observations:
+            activity = observation.activity or observation.scene
+            if activity and (not activities or activities[-1][1] != activity):
+                activities.append((observation.at, activity))
+        listed = '; '.join(f"{at:%H:%M} {activity}" for at, activity in activities)
+        return f"{summary} {listed}".strip()
+
+    def context(self, budget=None):
+        """The summary and the newest observations that fit in `budget` tokens, oldest first"""
+        budget = self.token_budget if budget is None else budget
+        with self.lock:
+            summary = self.summary
+            observations = self.evicted + list(self.recent)
+
+        lines = []
+        used = 0
+        if summary:
+            line = truncate_tokens(f"Earlier in this session: {summary}", budget, keep_end=True)
+            lines.append(line)
+            used += estimate_tokens(line) + 1
+
+        recent = []
+        for observation in reversed(observations):
+            line = f"- {observation.describe()}"
+            cost = estimate_tokens(line) + 1
+            if used + cost > budget:
+                break
+            recent.insert(0, line)
+            used += cost
+        return '\n'.join(lines + recent)
+
+    def stats(self):
+        with self.lock:
+            return {
+                'observations': self.total,
+                'recent': len(self.recent) + len(self.evicted),
+                'compactions': self.compactions,
+                'summary_tokens': estimate_tokens(self.summary),
+            }
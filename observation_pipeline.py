@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Staged observation pipeline: capture → preprocess → inference → narration
+
+Each stage runs in its own thread and hands work to the next stage through a
+small bounded queue. When a downstream stage is busy the newest item replaces
+whatever was waiting, so the model always works on the freshest frame instead
+of a backlog of stale ones.
+"""
+import queue
+import threading
+import time
+
+
+class LatestFrameQueue:
+    """Bounded hand-off queue where the newest item always wins"""
+
+    def __init__(self, maxsize=1):
+        self.queue = queue.Queue(maxsize=maxsize)
+        self.dropped = 0
+        self._lock = threading.Lock()
+
+    def put(self, item):
+        """Add an item, dropping the oldest waiting item if the queue is full"""
+        with self._lock:
+            while True:
+                try:
+                    self.queue.put_nowait(item)
+                    return
+                except queue.Full:
+                    try:
+                        self.queue.get_nowait()
+                        self.dropped += 1
+                    except queue.Empty:
+                        pass
+
+    def get(self, timeout=None):
+        """Take the next item, raising queue.Empty after the timeout"""
+        return self.queue.get(timeout=timeout)
+
+    def qsize(self):
+        return self.queue.qsize()
+
+
+class ObservationPipeline:
+    """Run capture, preprocessing, inference and narration as overlapping stages"""
+
+    STAGES = ('capture', 'preprocess', 'inference', 'narration')
+
+    def __init__(self, capture, preprocess, analyze, narrate,
+                 capture_interval=0.1, queue_size=1):
+        # Stage callables. capture() returns a payload or None to stop the
+        # pipeline; every other stage receives the previous stage's output.
+        self.capture = capture
+        self.preprocess = preprocess
+        self.analyze = analyze
+        self.narrate = narrate
+        self.capture_interval = capture_interval
+
+        self.frames = LatestFrameQueue(queue_size)
+        self.prepared = LatestFrameQueue(queue_size)
+        self.results = LatestFrameQueue(queue_size)
+
+        self.captured = 0
+        self.analyzed = 0
+        self.skipped = 0  # Inference returned None: unchanged frame or gave way to the user
+        self.narrated = 0
+        self.started_at = None
+
+        self._stop = threading.Event()
+        self._threads = []
+
+    def start(self):
+        """Start all stage threads"""
+        self._stop.clear()
+        self.started_at = time.monotonic()
+        targets = (
+            self._capture_loop,
+            self._stage_loop('preprocess', self.frames, self.preprocess, self.prepared),
+            self._stage_loop('inference', self.prepared, self.analyze, self.results),
+            self._stage_loop('narration', self.results, self.narrate, None),
+        )
+        for name, target in zip(self.STAGES, targets):
+            thread = threading.Thread(target=target, name=f"pipeline-{name}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout=2):
+        """Signal every stage to stop and wait for the threads to exit"""
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout=timeout)
+        self._threads = []
+
+    def is_running(self):
+        return not self._stop.is_set()
+
+    def _capture_loop(self):
+        while not self._stop.is_set():
+            try:
+                payload = self.capture()
+            except Exception as e:
+                print(f"⚠️  Capture stage error: {e}")
+                time.sleep(self.capture_interval or 0.1)
+                continue
+
+            if payload is None:
+                self._stop.set()
+                break
+
+            self.captured += 1
+            self.frames.put(payload)
+
+            if self.capture_interval:
+                self._stop.wait(self.capture_interval)
+
+    def _stage_loop(self, name, source, work, sink):
+        def loop():
+            while not self._stop.is_set():
+                try:
+                    item = source.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+
+                try:
+                    output = work(item)
+                except Exception as e:
+                    print(f"⚠️  {name.capitalize()} stage error: {e}")
+                    continue
+
+                if name == 'inference':
+                    if output is None:
+                        self.skipped += 1
+                    else:
+                        self.analyzed += 1
+                elif name == 'narration':
+                    self.narrated += 1
+
+                if sink is not None and output is not None:
+                    sink.put(output)
+        return loop
+
+    def observations_per_minute(self):
+        """Completed analyses per minute since the pipeline started"""
+        if not self.started_at:
+            return 0.0
+        elapsed = time.monotonic() - self.started_at
+        return self.analyzed * 60 / elapsed if elapsed > 0 else 0.0
+
+    def stats(self):
+        """Snapshot of pipeline counters"""
+        return {
+            'captured': self.captured,
+            'analyzed': self.analyzed,
+            'skipped': self.skipped,
+            'narrated': self.narrated,
+            'dropped_frames': self.frames.dropped + self.prepared.dropped,
+            'dropped_results': self.results.dropped,
+            'observations_per_minute': round(self.observations_per_minute(), 2),
+        }
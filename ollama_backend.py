@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Shared Ollama backend: one persistent client, keep_alive and model warmup
+
+Every model call goes through a single ollama.Client (one pooled HTTP
+connection instead of the module-level helpers), always passes keep_alive so
+the model isn't unloaded between observations, and fires a tiny warmup request
+in the background at startup so the first real observation hits a hot model.
+Identical requests that overlap (same model, prompt, images and options) are
+sent once and shared between their callers.
+"""
+import base64
+import os
+import statistics
+import threading
+import time
+from collections import deque
+
+from lazy_import import lazy_import
+from singleflight import SingleFlight, request_key
+
+ollama = lazy_import('ollama')
+
+OLLAMA_HOST = os.getenv('OLLAMA_HOST') or None
+KEEP_ALIVE = os.getenv('KEEP_ALIVE', '30m')  # How long Ollama keeps the model loaded after a call
+COALESCE_REQUESTS = os.getenv('COALESCE_REQUESTS', 'true').lower() == 'true'  # Share identical in-flight calls
+
+# 1x1 black PNG, enough to make a vision model load its image encoder during warmup
+WARMUP_IMAGE = base64.b64decode(
+    'iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAIAAACQd1PeAAAADElEQVR4nGNgYGAAAAAEAAH2FzhVAAAAAElFTkSuQmCC')
+
+
+def parse_keep_alive(value):
+    """Ollama takes durations like '30m' or a number of seconds (-1 keeps the model forever)"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return value
+
+
+def full_model_name(model):
+    """'llava' → 'llava:latest', as Ollama reads a name without a tag (a registry host may have a port)"""
+    return model if ':' in model.rsplit('/', 1)[-1] else f"{model}:latest"
+
+
+class OllamaBackend:
+    """Persistent Ollama client with keep_alive, warmup and cold/warm latency tracking"""
+
+    def __init__(self, host=OLLAMA_HOST, keep_alive=KEEP_ALIVE, coalesce=COALESCE_REQUESTS):
+        self.host = host
+        self.keep_alive = parse_keep_alive(keep_alive)
+        self.client = ollama.Client(host=host)
+        self._async_client = None
+        self.flights = SingleFlight() if coalesce else None
+
+        self.cold_latency = None  # Warmup request, includes loading the model
+        self.was_loaded = None  # Whether the model was already in memory before warmup
+        self.latencies = deque(maxlen=200)  # Non-streaming request latencies after warmup
+        self.warm = threading.Event()
+
+    @property
+    def async_client(self):
+        """ollama.AsyncClient sharing this backend's host"""
+        if self._async_client is None:
+            self._async_client = ollama.AsyncClient(host=self.host)
+        return self._async_client
+
+    def generate(self, **kwargs):
+        """ollama generate() through the shared client, with keep_alive applied
+
+        A call identical to one still running shares its response (or, when
+        streaming, a replay of its stream) instead of running again.
+        """
+        kwargs.setdefault('keep_alive', self.keep_alive)
+        if self.flights:
+            key = request_key(**kwargs)
+            if kwargs.get('stream'):
+                return self.flights.stream(key, lambda: self.client.generate(**kwargs))
+            return self.flights.do(key, lambda: self.timed_generate(kwargs))
+        if kwargs.get('stream'):
+            return self.client.generate(**kwargs)
+        return self.timed_generate(kwargs)
+
+    def timed_generate(self, kwargs):
+        started = time.time()
+        response = self.client.generate(**kwargs)
+        if self.warm.is_set():
+            self.latencies.append(time.time() - started)
+        return response
+
+    async def agenerate(self, client=None, **kwargs):
+        """Async generate() through the shared async client, with keep_alive applied
+
+        Identical non-streaming calls that overlap share one request, as in generate().
+        """
+        kwargs.setdefault('keep_alive', self.keep_alive)
+        client = client or self.async_client
+        if self.flights and not kwargs.get('stream'):
+            return await self.flights.ado(request_key(**kwargs), lambda: client.generate(**kwargs))
+        return await client.generate(**kwargs)
+
+    def is_loaded(self, model):
+        """Whether Ollama currently has the model in memory"""
+        loaded = self.client.ps().models
+        # Compare name and tag: llava:7b being loaded says nothing about llava:13b
+        return any(full_model_name(m.model) == full_model_name(model) for m in loaded)
+
+    def warmup(self, model, vision=True):
+        """Load the model with a tiny request and record how long the cold start took"""
+        try:
+            self.was_loaded = self.is_loaded(model)
+        except Exception:
+            self.was_loaded = None
+
+        started = time.time()
+        try:
+            self.client.generate(
+                model=model,
+                prompt='Hi',
+                images=[WARMUP_IMAGE] if vision else None,
+                options={'num_predict': 1},
+                keep_alive=self.keep_alive,
+            )
+        except ollama.ResponseError as e:
+            if e.status_code == 404:
+                print(f"❌ Model '{model}' not found. Download it with: ollama pull {model}")
+            else:
+                print(f"⚠️  Model warmup failed: {e}")
+            return False
+        except Exception as e:
+            print(f"⚠️  Model warmup failed (is Ollama running?): {e}")
+            return False
+
+        self.cold_latency = time.time() - started
+        self.warm.set()
+        state = "already loaded" if self.was_loaded else "cold load"
+        print(f"🔥 Model '{model}' warm ({state}: {self.cold_latency:.2f}s)")
+        return True
+
+    def warmup_in_background(self, model, vision=True):
+        """Start warmup on a daemon thread so startup isn't blocked"""
+        thread = threading.Thread(target=self.warmup, args=(model, vision), daemon=True)
+        thread.start()
+        return thread
+
+    def stats(self):
+        """Cold (warmup) vs warm request latency"""
+        return {
+            'cold_latency': self.cold_latency,
+            'was_loaded': self.was_loaded,
+            'warm_requests': len(self.latencies),
+            'warm_median': statistics.median(self.latencies) if self.latencies else None,
+            'coalesced': self.flights.stats()['coalesced'] if self.flights else 0,
+        }
+
+    def report(self):
+        stats = self.stats()
+        if stats['coalesced']:
+            print(f"🔗 {stats['coalesced']} model requests shared a response already in flight")
+        if stats['cold_latency'] is None:
+            return
+        line = f"🔥 Model latency - warmup: {stats['cold_latency']:.2f}s"
+        if stats['warm_median'] is not None:
+            line += f", warm median: {stats['warm_median']:.2f}s over {stats['warm_requests']} requests"
+        print(line)
+
+
+_shared_backend = None
+_shared_lock = threading.Lock()
+
+
+def get_backend():
+    """The process-wide OllamaBackend, created on first use"""
+    global _shared_backend
+    with _shared_lock:
+        if _shared_backend is None:
+            _shared_backend = OllamaBackend()
+        return _shared_backend
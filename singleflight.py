@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Coalescing of identical in-flight requests
+
+If the same request (model, prompt, image digest, options) is already
+running, a second caller doesn't start another inference: it attaches to the
+running one and gets the same result. Streamed requests are recorded chunk by
+chunk, so a caller who attaches halfway through still gets the whole stream,
+replayed from the start and then live.
+
+Only requests that overlap are shared; once a request finishes, the next
+identical one runs again (remembering results is the analysis cache's job).
+Coroutines on an event loop share an asyncio task the same way (ado()).
+"""
+import asyncio
+import hashlib
+import json
+import threading
+
+
+def digest(data):
+    """SHA-256 of image bytes, a base64 string, or anything with tobytes() (numpy arrays, PIL images)"""
+    if isinstance(data, str):
+        data = data.encode()
+    elif not isinstance(data, (bytes, bytearray, memoryview)):
+        data = data.tobytes()
+    return hashlib.sha256(data).hexdigest()
+
+
+def request_key(model=None, prompt=None, images=None, options=None, **extra):
+    """Identity of a generate() call: model, prompt, image digests, options and any other arguments"""
+    fields = dict(extra, model=model, prompt=prompt, images=[digest(image) for image in images or []],
+                  options=options or {})
+    return hashlib.sha256(json.dumps(fields, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class Flight:
+    """One request in progress, and what it has produced so far"""
+
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.chunks = []  # Streamed requests only
+        self.done = False
+        self.result = None
+        self.error = None
+
+    def add(self, chunk):
+        with self.condition:
+            self.chunks.append(chunk)
+            self.condition.notify_all()
+
+    def finish(self, result=None, error=None):
+        with self.condition:
+            self.result = result
+            self.error = error
+            self.done = True
+            self.condition.notify_all()
+
+    def wait(self):
+        with self.condition:
+            while not self.done:
+                self.condition.wait()
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+    def replay(self):
+        """Every chunk from the first, waiting for new ones until the stream ends"""
+        index = 0
+        while True:
+            with self.condition:
+                while index >= len(self.chunks) and not self.done:
+                    self.condition.wait()
+                if index >= len(self.chunks):
+                    if self.error is not None:
+                        raise self.error
+                    return
+                chunk = self.chunks[index]
+            index += 1
+            yield chunk
+
+
+class SingleFlight:
+    """Run each distinct request once, however many callers ask for it while it runs"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.flights = {}
+        self.tasks = {}  # key → [asyncio task, callers awaiting it], for ado()
+        self.calls = 0
+        self.coalesced = 0
+        self.local = threading.local()
+
+    def join(self, key):
+        """The flight for key and whether this caller has to run it"""
+        with self.lock:
+            self.calls += 1
+            flight = self.flights.get(key)
+            self.local.shared = flight is not None
+            if flight is not None:
+                self.coalesced += 1
+                return flight, False
+            flight = self.flights[key] = Flight()
+            return flight, True
+
+    def shared(self):
+        """Whether this thread's latest call got its result from someone else's request"""
+        return getattr(self.local, 'shared', False)
+
+    def land(self, key, flight, result=None, error=None):
+        with self.lock:
+            if self.flights.get(key) is flight:
+                del self.flights[key]
+        flight.finish(result, error)
+
+    def do(self, key, fn):
+        """fn(), or the result of the identical call already running"""
+        flight, leader = self.join(key)
+        if not leader:
+            return flight.wait()
+        try:
+            result = fn()
+        except BaseException as e:
+            self.land(key, flight, error=e)
+            raise
+        self.land(key, flight, result)
+        return result
+
+    def stream(self, key, fn):
+        """Iterate fn()'s stream, or a replay of the identical stream already running
+
+        The stream is read on its own thread, so it runs to the end for
+        everyone sharing it even if the caller who started it stops early.
+        """
+        flight, leader = self.join(key)
+        if leader:
+            threading.Thread(target=self.pump, args=(key, flight, fn), daemon=True, name='singleflight').start()
+        return flight.replay()
+
+    def pump(self, key, flight, fn):
+        try:
+            for chunk in fn():
+                flight.add(chunk)
+        except Exception as e:
+            self.land(key, flight, error=e)
+            return
+        self.land(key, flight)
+
+    async def ado(self, key, fn):
+        """await fn(), or the result of the identical coroutine already running
+
+        The request runs as its own task, so a caller that gives up (e.g. a
+        timeout) doesn't cancel it for the others; it's only cancelled once
+        every caller has given up.
+        """
+        with self.lock:
+            self.calls += 1
+            flight = self.tasks.get(key)
+            if flight is not None and not flight[0].done():
+                self.coalesced += 1
+            else:
+                flight = self.tasks[key] = [asyncio.ensure_future(fn()), 0]
+                flight[0].add_done_callback(lambda _: self.land_task(key, flight))
+            flight[1] += 1
+        task = flight[0]
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if flight[1] == 1:
+                task.cancel()
+            raise
+        finally:
+            flight[1] -= 1
+
+    def land_task(self, key, flight):
+        with self.lock:
+            if self.tasks.get(key) is flight:
+                del self.tasks[key]
+
+    def stats(self):
+        with self.lock:
+            return {'calls': self.calls, 'coalesced': self.coalesced,
+                    'in_flight': len(self.flights) + len(self.tasks)}
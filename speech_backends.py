@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""
+Pluggable speech recognition backends
+
+Every backend takes a speech_recognition.AudioData and returns the
+transcript, raising sr.UnknownValueError when nothing was understood and
+sr.RequestError when the engine itself is unavailable, so callers keep the
+same error handling whichever engine runs underneath.
+
+- google: the free Google Web Speech API (network round-trip per phrase)
+- vosk:   fully local Kaldi models (pip install vosk, plus a model from
+          https://alphacephei.com/vosk/models unpacked at VOSK_MODEL_PATH)
+- sphinx: fully local CMU PocketSphinx (pip install pocketsphinx)
+
+Local models are loaded once by load(), not per phrase, and
+RecognitionWorker transcribes on a bounded pool of threads, separate from
+capture, so a slow phrase never holds up capturing the next one.
+"""
+import json
+import os
+import threading
+import time
+from collections import deque
+
+from dotenv import load_dotenv
+
+from lazy_import import lazy_import
+
+sr = lazy_import('speech_recognition')
+
+load_dotenv()
+
+SPEECH_BACKEND = os.getenv('SPEECH_BACKEND', 'google').lower()  # 'google', 'vosk' or 'sphinx'
+SPEECH_FALLBACK = os.getenv('SPEECH_FALLBACK', 'none').lower()  # 'google' to go online if a local engine fails
+VOSK_MODEL_PATH = os.getenv('VOSK_MODEL_PATH', 'model')
+RECOGNITION_WORKERS = int(os.getenv('RECOGNITION_WORKERS', 2))  # Phrases transcribed at once
+RECOGNITION_QUEUE = int(os.getenv('RECOGNITION_QUEUE', 4))  # Phrases waiting before the oldest is dropped
+SAMPLE_RATE = 16000  # Both local engines expect 16 kHz 16-bit mono
+
+
+class SpeechBackend:
+    """Base class: load the engine once, then transcribe AudioData"""
+
+    name = 'base'
+    local = False
+
+    def __init__(self):
+        self.loaded = False
+        self.load_time = 0.0
+
+    def load(self):
+        """Load models up front; safe to call more than once"""
+        if not self.loaded:
+            started = time.perf_counter()
+            self._load()
+            self.load_time = time.perf_counter() - started
+            self.loaded = True
+        return self
+
+    def _load(self):
+        pass
+
+    def recognize(self, audio):
+        raise NotImplementedError
+
+
+class GoogleBackend(SpeechBackend):
+    """Google Web Speech API through speech_recognition"""
+
+    name = 'google'
+
+    def __init__(self, recognizer=None, language='en-US'):
+        super().__init__()
+        self.recognizer = recognizer or sr.Recognizer()
+        self.language = language
+
+    def recognize(self, audio):
+        return self.recognizer.recognize_google(audio, language=self.language)
+
+
+class VoskBackend(SpeechBackend):
+    """Offline recognition with a Vosk model kept in memory"""
+
+    name = 'vosk'
+    local = True
+
+    def __init__(self, model_path=VOSK_MODEL_PATH):
+        super().__init__()
+        self.model_path = model_path
+        self.model = None
+
+    def _load(self):
+        try:
+            import vosk
+        except ImportError:
+            raise sr.RequestError("vosk is not installed (pip install vosk)")
+        if not os.path.isdir(self.model_path):
+            raise sr.RequestError(f"Vosk model not found at '{self.model_path}' (set VOSK_MODEL_PATH)")
+        vosk.SetLogLevel(-1)
+        self.vosk = vosk
+        self.model = vosk.Model(self.model_path)
+
+    def recognize(self, audio):
+        self.load()
+        recognizer = self.vosk.KaldiRecognizer(self.model, SAMPLE_RATE)
+        recognizer.AcceptWaveform(audio.get_raw_data(convert_rate=SAMPLE_RATE, convert_width=2))
+        text = json.loads(recognizer.FinalResult()).get('text', '')
+        if not text.strip():
+            raise sr.UnknownValueError()
+        return text
+
+
+class SphinxBackend(SpeechBackend):
+    """Offline recognition with one long-lived PocketSphinx decoder"""
+
+    name = 'sphinx'
+    local = True
+
+    def __init__(self):
+        super().__init__()
+        self.decoder = None
+        self.lock = threading.Lock()  # A decoder handles one utterance at a time
+
+    def _load(self):
+        try:
+            import pocketsphinx
+        except ImportError:
+            raise sr.RequestError("pocketsphinx is not installed (pip install pocketsphinx)")
+        self.decoder = pocketsphinx.Decoder(samprate=SAMPLE_RATE, loglevel='FATAL')
+
+    def recognize(self, audio):
+        self.load()
+        raw = audio.get_raw_data(convert_rate=SAMPLE_RATE, convert_width=2)
+        with self.lock:
+            self.decoder.start_utt()
+            self.decoder.process_raw(raw, full_utt=True)
+            self.decoder.end_utt()
+            hypothesis = self.decoder.hyp()
+        if hypothesis is None or not hypothesis.hypstr.strip():
+            raise sr.UnknownValueError()
+        return hypothesis.hypstr
+
+
+BACKENDS = {
+    'google': GoogleBackend,
+    'vosk': VoskBackend,
+    'sphinx': SphinxBackend,
+}
+
+
+def create_speech_backend(name=SPEECH_BACKEND, recognizer=None, fallback=SPEECH_FALLBACK):
+    """Build and load a backend
+
+    A local engine that can't load raises sr.RequestError: it was chosen to
+    keep audio on this machine, so it only falls back to Google (a cloud
+    service) when fallback='google'.
+    """
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown speech backend '{name}', choose from {', '.join(BACKENDS)}")
+    if name == 'google':
+        return GoogleBackend(recognizer).load()
+
+    try:
+        backend = BACKENDS[name]().load()
+        print(f"🗣️  {name} speech recognition loaded in {backend.load_time:.1f}s (offline)")
+        return backend
+    except sr.RequestError as e:
+        if fallback != 'google':
+            raise sr.RequestError(f"{e} (set SPEECH_FALLBACK=google to use online recognition instead)") from e
+        print(f"⚠️  {e} - falling back to Google speech recognition")
+        return GoogleBackend(recognizer).load()
+
+
+class RecognitionWorker:
+    """Transcribe captured phrases on a bounded pool of background threads
+
+    submit() never waits for a transcription, so the capture thread goes
+    straight back to listening. Up to max_pending phrases wait for a free
+    worker; past that the oldest waiting phrase is dropped (overflow='drop')
+    or submit() blocks until there is room (overflow='block', for files).
+    Transcripts reach on_text(text) in the order the phrases were captured,
+    even when several workers finish out of order.
+    """
+
+    def __init__(self, backend, on_text, metrics=None, workers=RECOGNITION_WORKERS,
+                 max_pending=RECOGNITION_QUEUE, overflow='drop'):
+        if overflow not in ('drop', 'block'):
+            raise ValueError("overflow must be 'drop' or 'block'")
+        self.backend = backend
+        self.on_text = on_text
+        self.metrics = metrics
+        self.max_pending = max(1, max_pending)
+        self.overflow = overflow
+
+        self.pending = deque()  # (sequence, audio, submitted_at) waiting for a worker
+        self.results = {}  # sequence → transcript (None if nothing to say), waiting for earlier phrases
+        self.next_sequence = 0
+        self.next_delivery = 0
+        self.condition = threading.Condition()
+        self.delivery_lock = threading.Lock()  # One thread delivers at a time, so order holds
+
+        self.submitted = 0
+        self.recognized = 0
+        self.unintelligible = 0
+        self.failed = 0
+        self.dropped = 0
+        self.active = 0
+        self.max_queued = 0
+        self.running = True
+        self.threads = [threading.Thread(target=self.run, daemon=True) for _ in range(max(1, workers))]
+        for thread in self.threads:
+            thread.start()
+
+    def submit(self, audio):
+        """Queue one captured phrase without waiting for it to be transcribed"""
+        dropped = False
+        with self.condition:
+            while len(self.pending) >= self.max_pending:
+                if self.overflow == 'block':
+                    self.condition.wait()
+                    continue
+                sequence, _, _ = self.pending.popleft()
+                self.results[sequence] = None
+                self.count('dropped')
+                dropped = True
+            self.pending.append((self.next_sequence, audio, time.perf_counter()))
+            self.next_sequence += 1
+            self.submitted += 1
+            self.max_queued = max(self.max_queued, len(self.pending))
+            self.condition.notify_all()
+        if dropped:
+            self.deliver()  # Later phrases may have been waiting on the dropped one
+
+    def count(self, outcome):
+        setattr(self, outcome, getattr(self, outcome) + 1)
+        if self.metrics:
+            self.metrics.inc('speech_segments_total', outcome=outcome)
+
+    def run(self):
+        while True:
+            with self.condition:
+                while self.running and not self.pending:
+                    self.condition.wait()
+                if not self.running:
+                    return
+                sequence, audio, submitted_at = self.pending.popleft()
+                self.active += 1
+                self.condition.notify_all()  # Room for a blocked submit()
+
+            started = time.perf_counter()
+            if self.metrics:
+                self.metrics.observe('recognize_wait', started - submitted_at)
+            text, outcome = None, 'recognized'
+            try:
+                text = self.backend.recognize(audio)
+            except sr.UnknownValueError:
+                outcome = 'unintelligible'
+            except Exception as e:
+                outcome = 'failed'
+                print(f"⚠️  Speech recognition error ({self.backend.name}): {e}")
+            if self.metrics:
+                self.metrics.observe('recognize', time.perf_counter() - started)
+
+            with self.condition:
+                self.count(outcome)
+                self.results[sequence] = text if text and text.strip() else None
+                self.active -= 1
+            self.deliver()
+
+    def deliver(self):
+        """Hand finished transcripts to on_text, stopping at the first phrase still in progress"""
+        with self.delivery_lock:
+            while True:
+                with self.condition:
+                    if self.next_delivery not in self.results:
+                        return
+                    text = self.results.pop(self.next_delivery)
+                if text:
+                    self.on_text(text)
+                with self.condition:
+                    self.next_delivery += 1
+                    self.condition.notify_all()
+
+    def join(self, timeout=None):
+        """Block until every submitted phrase has been transcribed (or dropped) and delivered"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self.condition:
+            while self.next_delivery < self.next_sequence:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self.condition.wait(remaining)
+        return True
+
+    def stats(self):
+        with self.condition:
+            return {
+                'submitted': self.submitted,
+                'recognized': self.recognized,
+                'unintelligible': self.unintelligible,
+                'failed': self.failed,
+                'dropped': self.dropped,
+                'queued': len(self.pending),
+                'active': self.active,
+                'max_queued': self.max_queued,
+            }
+
+    def stop(self):
+        """Stop the workers; phrases still waiting are discarded"""
+        with self.condition:
+            if not self.running:
+                return
+            self.running = False
+            self.condition.notify_all()
+        for thread in self.threads:
+            thread.join(timeout=2)
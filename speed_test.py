@@ -1,64 +1,34 @@
 #!/usr/bin/env python3
 """
 Quick speed test for AI Eye Assistant improvements
+
+A single-scenario run of the benchmark harness (benchmark.py): a 640x480
+vision prompt, a few iterations, judged on median latency.
 """
-import time
-from PIL import Image
-import base64
-import io
-import ollama
+import sys
+
+from benchmark import build_scenarios, run_benchmarks
 
-def speed_test():
+def speed_test(iterations=3, host=None):
     """Test the speed of image analysis"""
     print("🚀 Testing AI analysis speed improvements...")
-    
-    # Create test image
-    test_image = Image.new('RGB', (640, 480), (100, 150, 200))
-    buffered = io.BytesIO()
-    test_image.save(buffered, format="JPEG")
-    img_b64 = base64.b64encode(buffered.getvalue()).decode()
-    
-    # Test prompt (improved version)
-    prompt = """
-    You are observing through a webcam. Look at this image and give a quick analysis:
-    
-    🎬 Scene: [What do you see? Be specific about objects, lighting, setting]
-    👤 Currently: [What is the person doing RIGHT NOW? Focus on hands, posture, eyes]
-    🔮 Next Action: [Based on their current hand position, eye direction, and body language, what will they likely do in the next 10-30 seconds? Be realistic and specific]
-    💡 I Notice: [One specific detail that stands out]
-    
-    Keep each section to 1-2 sentences. Focus on observable facts for better predictions.
-    """
-    
-    # Time the analysis
-    start_time = time.time()
-    
-    try:
-        response = ollama.generate(
-            model='llama3.2-vision',
-            prompt=prompt,
-            images=[img_b64],
-            options={
-                'temperature': 0.3,
-                'top_p': 0.8,
-                'num_predict': 200,
-            }
-        )
-        
-        end_time = time.time()
-        duration = end_time - start_time
-        
-        print(f"✅ Analysis completed in {duration:.2f} seconds")
-        print("\n📋 Sample Response:")
-        print(response['response'])
-        
-        if duration < 3:
-            print("\n🎯 Speed improvement successful! Analysis under 3 seconds.")
-        else:
-            print(f"\n⚠️  Analysis took {duration:.2f}s - may need further optimization")
-            
-    except Exception as e:
-        print(f"❌ Speed test failed: {e}")
+
+    scenarios = build_scenarios(sizes=[(640, 480)], num_predicts=[200], text=False)
+    results = run_benchmarks(host=host, iterations=iterations, scenarios=scenarios)
+    latency = results['scenarios'][0]['latency']
+
+    if latency is None:
+        print(f"❌ Speed test failed: {results['scenarios'][0]['errors'][:1]}")
+        return results
+
+    duration = latency['p50']
+    print(f"✅ Median analysis time {duration:.2f} seconds (p95 {latency['p95']:.2f}s)")
+    if duration < 3:
+        print("\n🎯 Speed improvement successful! Analysis under 3 seconds.")
+    else:
+        print(f"\n⚠️  Analysis took {duration:.2f}s - may need further optimization")
+    print("💡 Run benchmark.py for the full suite (sizes, text prompts, JSON output)")
+    return results
 
 if __name__ == "__main__":
-    speed_test()
+    speed_test(iterations=int(sys.argv[1]) if len(sys.argv) > 1 else 3)
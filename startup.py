@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Concurrent component initialization
+
+Opening the camera, calibrating the microphone, starting the TTS engine and
+loading the model used to happen one after another. ComponentInitializer
+starts them all at once on their own threads and reports each component as
+soon as it is ready. Every component has its own timeout; one that fails or
+runs out of time gets its fallback (demo mode for the camera, no voice input
+for the microphone, ...) and startup carries on without it.
+
+Background components (the model warmup) are reported the same way but
+startup never waits for them.
+"""
+import os
+import shutil
+import threading
+import time
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+CAMERA_INIT_TIMEOUT = float(os.getenv('CAMERA_INIT_TIMEOUT', 5))  # Seconds to open the camera and read a frame
+MIC_INIT_TIMEOUT = float(os.getenv('MIC_INIT_TIMEOUT', 5))  # Seconds to calibrate the microphone
+TTS_INIT_TIMEOUT = float(os.getenv('TTS_INIT_TIMEOUT', 5))  # Seconds to start the speech engine
+WARMUP_TIMEOUT = float(os.getenv('WARMUP_TIMEOUT', 120))  # Seconds for the model to load, in the background
+
+
+def require_command(command):
+    """Path of an executable on PATH; raises FileNotFoundError if it isn't installed"""
+    path = shutil.which(command)
+    if path is None:
+        raise FileNotFoundError(f"'{command}' command not found")
+    return path
+
+
+class Component:
+    """One startup task and its outcome"""
+
+    def __init__(self, name, start, timeout, fallback=None, late=None, background=False):
+        self.name = name
+        self.start = start
+        self.timeout = timeout
+        self.fallback = fallback  # fallback(error) when start() raises or times out
+        self.late = late  # late(result) when start() finishes after timing out, e.g. to release it
+        self.background = background
+        self.state = 'pending'  # Then 'ready', 'failed' or 'timed out'
+        self.result = None
+        self.error = None
+        self.seconds = None
+        self.done = threading.Event()
+        self.exited = threading.Event()  # start() has returned, even if it timed out long before
+
+    @property
+    def ready(self):
+        return self.state == 'ready'
+
+
+class ComponentInitializer:
+    """Start components concurrently, each with its own timeout and fallback"""
+
+    def __init__(self, metrics=None):
+        self.metrics = metrics
+        self.components = {}
+        self.lock = threading.Lock()  # Each component's outcome is decided exactly once
+        self.output_lock = threading.Lock()  # Keeps one component's report and fallback together
+        self.started = None
+
+    def add(self, name, start, timeout, fallback=None, late=None, background=False):
+        self.components[name] = Component(name, start, timeout, fallback, late, background)
+        return self
+
+    def run(self):
+        """Start every component and wait for the foreground ones; returns them by name"""
+        self.started = time.perf_counter()
+        for component in self.components.values():
+            threading.Thread(target=self.start_component, args=(component,), daemon=True,
+                             name=f"init-{component.name}").start()
+            if component.background:
+                timer = threading.Timer(component.timeout, self.expire, args=(component,))
+                timer.daemon = True
+                timer.start()
+
+        for component in self.components.values():
+            if component.background:
+                continue
+            remaining = component.timeout - (time.perf_counter() - self.started)
+            if not component.done.wait(max(0.0, remaining)):
+                self.expire(component)
+
+        foreground = [c for c in self.components.values() if not c.background]
+        if foreground:
+            elapsed = time.perf_counter() - self.started
+            serial = sum(c.seconds for c in foreground)
+            print(f"🚀 {sum(c.ready for c in foreground)}/{len(foreground)} components up in {elapsed:.1f}s "
+                  f"({serial:.1f}s one after another)")
+        return self.components
+
+    def start_component(self, component):
+        try:
+            result = component.start()
+        except Exception as e:
+            self.finish(component, 'failed', error=e)
+            component.exited.set()
+            return
+        if not self.finish(component, 'ready', result=result) and component.late:
+            try:
+                component.late(result)
+            except Exception as e:
+                print(f"⚠️  {component.name} cleanup failed: {e}")
+        component.exited.set()
+
+    def expire(self, component):
+        self.finish(component, 'timed out', error=TimeoutError(f"not ready after {component.timeout:g}s"))
+
+    def finish(self, component, state, result=None, error=None):
+        """Record a component's outcome; False if it was already decided (it timed out first)"""
+        with self.lock:
+            if component.state != 'pending':
+                return False
+            component.state = state
+            component.result = result
+            component.error = error
+            component.seconds = time.perf_counter() - self.started
+
+        if self.metrics:
+            self.metrics.observe(f"startup_{component.name.lower().replace(' ', '_')}", component.seconds)
+        with self.output_lock:
+            if state == 'ready':
+                print(f"✅ {component.name} ready ({component.seconds:.1f}s)")
+            else:
+                print(f"⚠️  {component.name} {state}: {error}")
+                if component.fallback:
+                    try:
+                        component.fallback(error)
+                    except Exception as e:
+                        print(f"⚠️  {component.name} fallback failed: {e}")
+        component.done.set()
+        return True
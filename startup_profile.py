@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Startup-time profiling
+
+`python ai_eye_assistant.py --startup-profile` re-runs the assistant under
+`python -X importtime`, builds it, and exits as soon as it is ready. The
+report splits startup into the module imports done before __main__ runs
+and the assistant's init (camera, microphone, TTS, models), and lists the
+packages whose imports cost the most, with the phase they were paid in.
+Heavy packages should show up under init, loaded by the feature that
+needs them (see lazy_import.py), not under module imports.
+
+This module is imported by the entry points on every start, so it only
+uses the standard library and stays cheap.
+"""
+import os
+import re
+import subprocess
+import sys
+import time
+
+STARTUP_BUDGET = float(os.getenv('STARTUP_BUDGET', 0.3))  # Seconds allowed for importing an assistant module
+
+CHILD_ENV = 'AI_EYE_STARTUP_PROFILE'
+MARKER = 'startup-phase:'
+IMPORT_LINE = re.compile(r'^import time:\s*(\d+) \|\s*(\d+) \| ( *)(\S+)')
+
+
+def profiling():
+    """True inside the child process started by profile_startup()"""
+    return os.getenv(CHILD_ENV) == '1'
+
+
+def mark(phase):
+    """Record the start of a startup phase ('init', 'ready'); no-op unless profiling"""
+    if profiling():
+        print(f"{MARKER} {phase} {time.monotonic():.6f}", file=sys.stderr, flush=True)
+
+
+def parse_importtime(lines):
+    """Import records and phase marks from the stderr of `python -X importtime`
+
+    Each record is a dict with module, depth, self and cumulative seconds,
+    and the phase the import happened in. Lines that are neither are
+    returned as-is so they can be passed through.
+    """
+    records, marks, other = [], {}, []
+    phase = 'import'
+    for line in lines:
+        line = line.rstrip('\n')
+        if line.startswith(MARKER):
+            _, phase, at = line.split()
+            marks[phase] = float(at)
+            continue
+        match = IMPORT_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            records.append({
+                'module': module,
+                'depth': len(indent) // 2,
+                'self': int(self_us) / 1e6,
+                'cumulative': int(cumulative_us) / 1e6,
+                'phase': phase,
+            })
+        elif not line.startswith('import time:'):
+            other.append(line)
+    return records, marks, other
+
+
+def summarize(records, top=12):
+    """Import time per phase and the top packages by self time"""
+    phases = {}
+    packages = {}
+    for record in records:
+        phases[record['phase']] = phases.get(record['phase'], 0.0) + record['self']
+        name = record['module'].split('.')[0]
+        package = packages.setdefault(name, {'package': name, 'seconds': 0.0, 'modules': 0,
+                                             'phase': record['phase']})
+        package['seconds'] += record['self']
+        package['modules'] += 1
+    slowest = sorted(packages.values(), key=lambda p: p['seconds'], reverse=True)[:top]
+    return {'phases': phases, 'packages': slowest}
+
+
+def profile_startup(argv, top=12):
+    """Run an entry point (argv as in sys.argv, minus --startup-profile) and report its startup
+
+    Returns the child's exit code.
+    """
+    env = dict(os.environ, **{CHILD_ENV: '1'})
+    command = [sys.executable, '-X', 'importtime'] + list(argv)
+    started = time.monotonic()
+    process = subprocess.Popen(command, env=env, stderr=subprocess.PIPE, text=True)
+    _, stderr = process.communicate()
+    finished = time.monotonic()
+
+    records, marks, other = parse_importtime(stderr.splitlines())
+    for line in other:
+        print(line, file=sys.stderr)
+
+    # Imports during cleanup after 'ready' aren't startup cost
+    summary = summarize([r for r in records if r['phase'] != 'ready'], top)
+    phases = summary['phases']
+    init_at = marks.get('init', finished)
+    ready_at = marks.get('ready')
+
+    print(f"\n⏱️  Startup profile: {' '.join(os.path.basename(a) for a in argv)}")
+    if ready_at is None:
+        print(f"⚠️  Never became ready (exit code {process.returncode}); showing imports up to the exit")
+    else:
+        print(f"   Ready in {ready_at - started:.2f}s")
+    print(f"   Interpreter and module imports: {init_at - started:.2f}s "
+          f"({phases.get('import', 0.0):.2f}s importing)")
+    if 'init' in marks:
+        print(f"   Assistant init: {(ready_at or finished) - init_at:.2f}s "
+              f"({phases.get('init', 0.0):.2f}s importing on first use)")
+    if phases.get('import', 0.0) > STARTUP_BUDGET:
+        print(f"⚠️  Module imports are over the {STARTUP_BUDGET:.2f}s STARTUP_BUDGET")
+
+    print("   Slowest imports by package (self time):")
+    for package in summary['packages']:
+        print(f"     {package['package']:<24} {package['seconds'] * 1000:7.1f}ms "
+              f"{package['modules']:4d} modules  ({package['phase']})")
+    return process.returncode
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Incremental speech extraction from streamed model output
+
+Instead of waiting for the full response and running prepare_speech_text
+on it, StreamingSpeechParser is fed tokens as they arrive, tracks which
+Scene/Currently/Next Action/Notice section it is in, and hands every
+complete sentence to a callback (normally the TTS backend) straight away.
+"""
+import re
+
+# Section marker → (section name, phrasing for the first spoken sentence)
+SECTION_MARKERS = [
+    ('Next Action:', 'next_action', "I predict you'll {}"),
+    ('Currently:', 'currently', "You're currently {}"),
+    ('I Notice:', 'notice', None),
+    ('Notice:', 'notice', None),
+    ('Scene:', 'scene', "I can see {}"),
+]
+
+EMOJI_PATTERN = re.compile('[\U0001F300-\U0001FAFF\u2600-\u27BF\uFE0F]')
+SENTENCE_END = re.compile(r'[.!?](?=\s)')
+
+# How much of a line we'll hold back while waiting for a section marker to finish arriving
+MARKER_LOOKAHEAD = 24
+
+
+def clean_for_speech(text):
+    """Strip emojis, markdown and template brackets from a piece of model output"""
+    text = EMOJI_PATTERN.sub('', text)
+    text = text.replace('*', '').replace('[', '').replace(']', '')
+    return ' '.join(text.split())
+
+
+class StreamingSpeechParser:
+    """Turn a token stream into speakable sentences as soon as each one completes"""
+
+    def __init__(self, on_sentence, spoken_sections=('scene', 'currently', 'next_action'),
+                 sectioned=True, fallback="I'm analyzing what I see."):
+        # sectioned=False treats the whole stream as plain conversation and speaks every sentence
+        self.on_sentence = on_sentence
+        self.spoken_sections = spoken_sections
+        self.sectioned = sectioned
+        self.fallback = fallback
+
+        self.text = ''
+        self.line = ''
+        self.line_resolved = not sectioned
+        self.section = None
+        self.section_sentences = 0
+        self.sentences_spoken = 0
+
+    def feed(self, chunk):
+        """Consume the next streamed chunk of text"""
+        self.text += chunk
+        self.line += chunk
+
+        while '\n' in self.line:
+            line, self.line = self.line.split('\n', 1)
+            self._consume(line, complete=True)
+            self.line_resolved = not self.sectioned
+
+        self.line = self._consume(self.line, complete=False)
+
+    def finish(self):
+        """Flush whatever is left and return the full response text"""
+        self._consume(self.line, complete=True)
+        self.line = ''
+        if self.sentences_spoken == 0 and self.sectioned and self.fallback:
+            self._speak(self.fallback)
+        return self.text
+
+    def _resolve_section(self, line, complete):
+        """Detect a section marker at the start of a line; returns the remaining content or None to wait"""
+        for marker, section, _ in SECTION_MARKERS:
+            index = line.find(marker)
+            if index != -1:
+                self.section = section
+                self.section_sentences = 0
+                self.line_resolved = True
+                return line[index + len(marker):]
+
+        if complete or len(line) > MARKER_LOOKAHEAD:
+            # No marker on this line: it continues the current section
+            self.line_resolved = True
+            return line
+        return None
+
+    def _consume(self, line, complete):
+        """Emit finished sentences from a line; returns the unconsumed remainder"""
+        if not self.line_resolved:
+            content = self._resolve_section(line, complete)
+            if content is None:
+                return line
+        else:
+            content = line
+
+        while True:
+            match = SENTENCE_END.search(content)
+            if not match:
+                break
+            self._emit(content[:match.end()])
+            content = content[match.end():]
+
+        if complete:
+            self._emit(content)
+            return ''
+        return content
+
+    def _emit(self, sentence):
+        sentence = clean_for_speech(sentence)
+        if not any(char.isalnum() for char in sentence):
+            return
+
+        if not self.sectioned:
+            self._speak(sentence)
+            return
+
+        if self.section not in self.spoken_sections:
+            return
+
+        if self.section_sentences == 0:
+            template = next(t for _, name, t in SECTION_MARKERS if name == self.section)
+            if template:
+                sentence = template.format(sentence[0].lower() + sentence[1:])
+        self.section_sentences += 1
+        self._speak(sentence)
+
+    def _speak(self, sentence):
+        self.sentences_spoken += 1
+        self.on_sentence(sentence)
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Temporal context for scene analysis
+
+Keeps a short window of recent frames (every frame at a minimum spacing, or
+only motion-selected keyframes) so one generate call can look at how the
+scene evolved instead of a single still. The frames go to the model either
+together in images=[...] ('multi' mode) or tiled into one labelled contact
+sheet ('mosaic' mode), with a prompt that tells it they are in time order.
+"""
+import math
+import time
+from collections import deque
+
+from change_detector import to_grayscale
+from frame_encoder import image_size
+from lazy_import import lazy_import
+
+cv2 = lazy_import('cv2')
+np = lazy_import('numpy')
+
+
+class FrameEntry:
+    """One frame in the window, with its encoded forms and mosaic tile memoized"""
+
+    def __init__(self, image, timestamp):
+        self.image = image
+        self.timestamp = timestamp
+        self.encoded = {}  # (width, height) → encoded image data
+        self.tile = None  # Downscaled BGR copy used in mosaics
+
+
+class FrameHistory:
+    """Window of the last `size` frames, ending with the current one
+
+    selection='recent' keeps frames at least `min_interval` seconds apart;
+    selection='keyframes' additionally requires a visible change (mean
+    absolute grey-level difference ≥ keyframe_threshold) from the previous
+    kept frame, so a still scene doesn't fill the window with duplicates.
+    """
+
+    def __init__(self, size=4, selection='recent', min_interval=1.0, keyframe_threshold=8.0):
+        if size < 1:
+            raise ValueError("size must be at least 1")
+        self.size = size
+        self.selection = selection
+        self.min_interval = min_interval
+        self.keyframe_threshold = keyframe_threshold
+        self.window = deque(maxlen=max(size - 1, 0))  # Earlier frames, oldest first
+        self.current = None  # Latest frame, always the last one sent
+        self._last_gray = None
+
+    def add(self, image, timestamp=None):
+        """Record a new frame (copied, since capture buffers get reused)"""
+        timestamp = time.time() if timestamp is None else timestamp
+        image = image.copy()
+
+        # The frame being replaced as "current" is the candidate for the window
+        previous, self.current = self.current, FrameEntry(image, timestamp)
+        if previous is None or self.window.maxlen == 0:
+            return
+
+        last_kept = self.window[-1].timestamp if self.window else None
+        if last_kept is not None and previous.timestamp - last_kept < self.min_interval:
+            return
+        if self.selection == 'keyframes':
+            gray = to_grayscale(previous.image)
+            if self.window and self._last_gray is not None:
+                mad = np.mean(np.abs(gray.astype(np.int16) - self._last_gray.astype(np.int16)))
+                if mad < self.keyframe_threshold:
+                    return
+            self._last_gray = gray
+        self.window.append(previous)
+
+    def frames(self):
+        """Frames to send, oldest first, ending with the current frame"""
+        if self.current is None:
+            return []
+        return list(self.window) + [self.current]
+
+    def span(self):
+        """Seconds covered by the window"""
+        frames = self.frames()
+        return frames[-1].timestamp - frames[0].timestamp if frames else 0.0
+
+    def clear(self):
+        self.window.clear()
+        self.current = None
+        self._last_gray = None
+
+    def __len__(self):
+        return len(self.window) + (self.current is not None)
+
+
+def frame_labels(entries):
+    """Relative time labels like 't-6s', 't-3s', 'now'"""
+    if not entries:
+        return []
+    now = entries[-1].timestamp
+    labels = [f"t-{now - entry.timestamp:.0f}s" for entry in entries[:-1]]
+    return labels + ['now']
+
+
+def temporal_prompt(count, span):
+    """Scene prompt for `count` frames in time order covering `span` seconds"""
+    return f"""
+            You are observing through a webcam. These {count} images are frames from the last {span:.0f} seconds,
+            in order from oldest to newest; the last image is right now.
+            Use how things change between the frames to understand what the person is doing and where it's heading:
+
+            🎬 Scene: [What do you see now? Be specific about objects, lighting, setting]
+            👤 Currently: [What is the person doing RIGHT NOW, and what did they just do across these frames?]
+            🔮 Next Action: [Extrapolate the movement across the frames: what will they most likely do in the next 10-30 seconds? Be realistic and specific]
+            💡 I Notice: [One specific detail or change that stands out]
+
+            Keep each section to 1-2 sentences. Focus on observable facts and changes between frames.
+            """
+
+
+class MosaicBuilder:
+    """Tile a frame window into one labelled grid image within a fixed pixel budget
+
+    One vision-encoder pass over the mosaic is far cheaper than one pass per
+    frame. Tiles are read left to right, top to bottom, oldest first; resized
+    tiles are memoized on each FrameEntry so only the new frame is resized.
+    """
+
+    def __init__(self, pixel_budget=786432, columns=None, gap=4):
+        self.pixel_budget = pixel_budget
+        self.columns = columns
+        self.gap = gap
+        self._canvas = None
+
+    def layout(self, count, width, height):
+        """(columns, rows, tile_width, tile_height) for `count` frames of the given size"""
+        columns = self.columns or math.ceil(math.sqrt(count))
+        rows = math.ceil(count / columns)
+        scale = min(1.0, math.sqrt(self.pixel_budget / (columns * rows * width * height)))
+        return columns, rows, max(1, int(width * scale)), max(1, int(height * scale))
+
+    def tile(self, entry, size):
+        tile = entry.tile
+        if tile is None or (tile.shape[1], tile.shape[0]) != size:
+            image = to_bgr(entry.image)
+            tile = cv2.resize(image, size, interpolation=cv2.INTER_AREA)
+            entry.tile = tile
+        return tile
+
+    def build(self, entries, labels=None):
+        """BGR ndarray mosaic of the entries (FrameEntry objects), labelled with their times
+
+        The returned array is the builder's canvas and is reused by the next build().
+        """
+        labels = labels or frame_labels(entries)
+        width, height = image_size(entries[0].image)
+        columns, rows, tile_width, tile_height = self.layout(len(entries), width, height)
+        shape = (rows * tile_height + (rows - 1) * self.gap, columns * tile_width + (columns - 1) * self.gap, 3)
+
+        if self._canvas is None or self._canvas.shape != shape:
+            self._canvas = np.zeros(shape, np.uint8)
+        else:
+            self._canvas.fill(0)
+        canvas = self._canvas
+
+        font_scale = max(0.4, tile_height / 240)
+        thickness = max(1, round(font_scale * 2))
+        for index, (entry, label) in enumerate(zip(entries, labels)):
+            row, column = divmod(index, columns)
+            y = row * (tile_height + self.gap)
+            x = column * (tile_width + self.gap)
+            canvas[y:y + tile_height, x:x + tile_width] = self.tile(entry, (tile_width, tile_height))
+
+            text = f"{index + 1}: {label}"
+            origin = (x + 6, y + int(24 * font_scale) + 4)
+            cv2.putText(canvas, text, origin, cv2.FONT_HERSHEY_SIMPLEX, font_scale, (0, 0, 0), thickness + 2)
+            cv2.putText(canvas, text, origin, cv2.FONT_HERSHEY_SIMPLEX, font_scale, (255, 255, 255), thickness)
+        return canvas
+
+
+def to_bgr(image):
+    """BGR ndarray for a BGR ndarray or PIL image"""
+    if isinstance(image, np.ndarray):
+        return image
+    return cv2.cvtColor(np.asarray(image.convert('RGB')), cv2.COLOR_RGB2BGR)
+
+
+def build_mosaic(images, timestamps=None, pixel_budget=786432, columns=None):
+    """Mosaic of plain images (oldest first); timestamps default to one second apart"""
+    timestamps = timestamps or list(range(len(images)))
+    entries = [FrameEntry(image, timestamp) for image, timestamp in zip(images, timestamps)]
+    return MosaicBuilder(pixel_budget, columns).build(entries)
+
+
+def mosaic_prompt(count, span):
+    """Scene prompt for a mosaic of `count` frames covering `span` seconds"""
+    return f"""
+            You are observing through a webcam. This image is a grid of {count} numbered frames from the last
+            {span:.0f} seconds, read left to right and top to bottom, oldest first. Each tile is labelled with its
+            time; the last tile ("now") is the current moment.
+            Use how things change between the tiles to understand what the person is doing and where it's heading:
+
+            🎬 Scene: [What do you see now? Be specific about objects, lighting, setting]
+            👤 Currently: [What is the person doing RIGHT NOW, and what did they just do across these frames?]
+            🔮 Next Action: [Extrapolate the movement across the frames: what will they most likely do in the next 10-30 seconds? Be realistic and specific]
+            💡 I Notice: [One specific detail or change that stands out]
+
+            Keep each section to 1-2 sentences. Describe the scene, not the grid layout.
+            """
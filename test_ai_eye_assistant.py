@@ -4,8 +4,10 @@ from PIL import Image
 import io
 import base64
 from ai_eye_assistant import AIEyeAssistant
+from temporal_analysis import FrameHistory
 
 class TestAIEyeAssistant(unittest.TestCase):
+    @patch('ai_eye_assistant.WARMUP_MODEL', False)
     @patch('ai_eye_assistant.cv2.VideoCapture')
     def setUp(self, mock_video_capture):
         # Mock the webcam
@@ -27,12 +29,40 @@ class TestAIEyeAssistant(unittest.TestCase):
         img = Image.open(io.BytesIO(decoded_img))
         self.assertEqual(img.size, (640, 480), "Image size should be 640x480")
 
-    @patch('ai_eye_assistant.ollama.generate')
-    def test_analyze_scene(self, mock_generate):
+    def test_analyze_scene(self):
         """Test scene analysis with a mock response"""
-        mock_generate.return_value = {'response': "Mock analysis result"}
-        result = self.assistant.analyze_scene(self.black_image)
+        with patch.object(self.assistant.backend.client, 'generate') as mock_generate:
+            mock_generate.return_value = {'response': "Mock analysis result"}
+            result = self.assistant.analyze_scene(self.black_image)
         self.assertEqual(result, "Mock analysis result", "Should return the mock analysis result")
+        self.assertIn('keep_alive', mock_generate.call_args.kwargs, "Every call should keep the model loaded")
+
+    def test_analyze_scene_streaming(self):
+        """Streamed analyses hand each finished sentence to the callback"""
+        chunks = ["🎬 Scene: A dark ", "room. ", "\n👤 Currently: Nothing", " visible."]
+        spoken = []
+        with patch.object(self.assistant.backend.client, 'generate') as mock_generate:
+            mock_generate.return_value = iter({'response': chunk} for chunk in chunks)
+            result = self.assistant.analyze_scene(self.black_image, on_sentence=spoken.append)
+        self.assertEqual(result, "".join(chunks))
+        self.assertEqual(spoken, ["I can see a dark room.", "You're currently nothing visible."])
+        self.assertIn('first_sentence_latency', self.assistant.last_analysis_info)
+
+    def test_analyze_scene_temporal(self):
+        """Temporal mode sends the frame window in a single request, oldest first"""
+        self.assistant.frame_history = FrameHistory(size=3, min_interval=0)
+        self.assistant.change_detector = None
+        self.assistant.analysis_cache = None
+        frames = [Image.new('RGB', (64, 48), (shade, shade, shade)) for shade in (0, 80, 160)]
+        with patch.object(self.assistant.backend.client, 'generate') as mock_generate:
+            mock_generate.return_value = {'response': "Mock temporal analysis"}
+            for frame in frames:
+                result = self.assistant.analyze_scene(frame)
+        self.assertEqual(result, "Mock temporal analysis")
+        self.assertEqual(mock_generate.call_count, 3)
+        self.assertEqual(len(mock_generate.call_args.kwargs['images']), 3)
+        self.assertIn("3 images", mock_generate.call_args.kwargs['prompt'])
+        self.assertEqual(self.assistant.last_analysis_info['frames'], 3)
 
     def tearDown(self):
         self.assistant.cleanup()
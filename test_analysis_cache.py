@@ -0,0 +1,61 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+import numpy as np
+from PIL import Image
+from analysis_cache import AnalysisCache, context_key, hamming_distance, perceptual_hash
+
+class TestAnalysisCache(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.frame = rng.integers(0, 255, (480, 640, 3), dtype=np.uint8)
+        self.context = context_key("prompt", "llama3.2-vision", {'num_predict': 200})
+
+    def test_similar_frames_have_close_hashes(self):
+        noisy = np.clip(self.frame.astype(int) + 3, 0, 255).astype(np.uint8)
+        self.assertLessEqual(hamming_distance(perceptual_hash(self.frame), perceptual_hash(noisy)), 6)
+
+    def test_hit_within_tolerance(self):
+        cache = AnalysisCache()
+        cache.put(self.frame, self.context, "A desk")
+        noisy = np.clip(self.frame.astype(int) + 3, 0, 255).astype(np.uint8)
+        self.assertEqual(cache.get(noisy, self.context), "A desk")
+        self.assertEqual(cache.stats()['hits'], 1)
+
+    def test_context_and_colour_are_part_of_the_key(self):
+        """Different options, or flat images of different colours, must not share entries"""
+        cache = AnalysisCache()
+        blue = Image.new('RGB', (640, 480), (100, 150, 200))
+        cache.put(blue, self.context, "Blue scene")
+        other_context = context_key("prompt", "llama3.2-vision", {'num_predict': 100})
+        self.assertIsNone(cache.get(blue, other_context))
+        self.assertIsNone(cache.get(Image.new('RGB', (640, 480), (200, 150, 100)), self.context))
+        self.assertEqual(cache.get(blue.copy(), self.context), "Blue scene")
+
+    def test_lru_eviction(self):
+        cache = AnalysisCache(max_entries=2, max_distance=0)
+        colours = [(0, 0, 0), (255, 255, 255), (255, 0, 0)]
+        images = [Image.new('RGB', (64, 64), colour) for colour in colours]
+        cache.put(images[0], self.context, "first")
+        cache.put(images[1], self.context, "second")
+        cache.get(images[0], self.context)  # Touch the first entry
+        cache.put(images[2], self.context, "third")
+        self.assertEqual(cache.get(images[0], self.context), "first")
+        self.assertIsNone(cache.get(images[1], self.context))
+
+    def test_ttl_expiry(self):
+        cache = AnalysisCache(ttl=10)
+        with patch('analysis_cache.time.time', return_value=1000):
+            cache.put(self.frame, self.context, "old")
+        with patch('analysis_cache.time.time', return_value=1011):
+            self.assertIsNone(cache.get(self.frame, self.context))
+
+    def test_persistence(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'cache.json')
+            AnalysisCache(path=path).put(self.frame, self.context, "Persisted")
+            self.assertEqual(AnalysisCache(path=path).get(self.frame, self.context), "Persisted")
+
+if __name__ == "__main__":
+    unittest.main()
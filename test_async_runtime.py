@@ -0,0 +1,113 @@
+import asyncio
+import unittest
+from unittest.mock import MagicMock, patch
+import speech_recognition as sr
+from async_runtime import AsyncAssistantRuntime
+from inference_scheduler import RequestCancelled, RequestScheduler
+from ollama_backend import OllamaBackend
+from metrics import MetricsRegistry
+
+class FakeAsyncClient:
+    """Stands in for ollama.AsyncClient with a fixed response delay"""
+    def __init__(self, delay):
+        self.delay = delay
+
+    async def generate(self, **kwargs):
+        await asyncio.sleep(self.delay)
+        return {'response': f"reply to {kwargs['prompt']}"}
+
+def make_assistant():
+    assistant = MagicMock()
+    assistant.enable_tts = False
+    assistant.backend = OllamaBackend()
+    assistant.metrics = MetricsRegistry()
+    assistant.requests = RequestScheduler(metrics=assistant.metrics)
+    assistant.prepare_scene_request.return_value = (None, {'model': 'm', 'prompt': 'scene', 'options': {}})
+    assistant.conversation_request.return_value = ('hello', {})
+    assistant.scene_analysis_failed.side_effect = lambda error: f"❌ Analysis failed: {error}"
+    return assistant
+
+class TestAsyncAssistantRuntime(unittest.TestCase):
+    def test_question_and_analysis_take_turns(self):
+        runtime = AsyncAssistantRuntime(make_assistant(), client=FakeAsyncClient(0.1))
+
+        async def both():
+            return await asyncio.gather(runtime.analyze('image'), runtime.respond('hello'))
+
+        analysis, reply = asyncio.run(both())
+        self.assertEqual(analysis, "reply to scene")
+        self.assertEqual(reply, "reply to hello")
+        stages = runtime.assistant.metrics.histograms['stage_seconds']
+        self.assertEqual(stages[(('stage', 'inference'),)].count, 1)
+        self.assertEqual(stages[(('stage', 'llm'),)].count, 1)
+        self.assertEqual(runtime.assistant.requests.stats()['interactive']['completed'], 1)
+        self.assertEqual(runtime.assistant.requests.stats()['periodic']['completed'], 1)
+
+    def test_question_cancels_queued_analysis(self):
+        runtime = AsyncAssistantRuntime(make_assistant(), client=FakeAsyncClient(0.2))
+
+        async def question_while_analysis_is_queued():
+            analyzing = asyncio.create_task(runtime.analyze('image'))
+            await asyncio.sleep(0.05)  # Holds the model
+            queued = asyncio.create_task(runtime.analyze('image'))
+            await asyncio.sleep(0.05)  # Waits for it
+            reply = await runtime.respond('hello')
+            return await asyncio.gather(analyzing, queued, return_exceptions=True) + [reply]
+
+        analysis, queued, reply = asyncio.run(question_while_analysis_is_queued())
+        self.assertEqual(analysis, "reply to scene")
+        self.assertIsInstance(queued, RequestCancelled)
+        self.assertEqual(reply, "reply to hello")
+        self.assertEqual(runtime.assistant.requests.stats()['periodic']['cancelled'], 1)
+
+    @patch('async_runtime.REQUEST_TIMEOUT', 0.05)
+    def test_analysis_timeout(self):
+        runtime = AsyncAssistantRuntime(make_assistant(), client=FakeAsyncClient(1))
+        result = asyncio.run(runtime.analyze('image'))
+        self.assertEqual(result, "❌ Analysis failed: timed out after 0s")
+
+    def test_run_shuts_down_cleanly_when_capture_ends(self):
+        assistant = make_assistant()
+        assistant.capture_observation.return_value = None
+        runtime = AsyncAssistantRuntime(assistant, client=FakeAsyncClient(0))
+        runtime.listen_once = MagicMock(side_effect=sr.WaitTimeoutError())
+
+        asyncio.run(asyncio.wait_for(runtime.run(), timeout=2))
+        self.assertTrue(all(task.done() for task in runtime.tasks))
+
+    def test_look_question_gets_a_fresh_look(self):
+        assistant = make_assistant()
+        assistant.describe_now.return_value = True
+        runtime = AsyncAssistantRuntime(assistant, client=FakeAsyncClient(0))
+        runtime.respond = MagicMock(side_effect=AssertionError("answered without looking"))
+
+        async def ask():
+            task = asyncio.create_task(runtime.conversation_loop())
+            await runtime.utterances.put("What do you see right now?")
+            await asyncio.sleep(0.05)
+            task.cancel()
+        asyncio.run(ask())
+        assistant.describe_now.assert_called_once_with()
+        runtime.respond.assert_not_called()
+
+    def test_listening_waits_for_a_late_calibration(self):
+        assistant = make_assistant()
+        runtime = AsyncAssistantRuntime(assistant, client=FakeAsyncClient(0))
+        calls = []
+        assistant.wait_for_calibration.side_effect = lambda: calls.append('calibration')
+        assistant.check_calibration.side_effect = lambda: calls.append('check')
+
+        def listen_once():
+            calls.append('listen')
+            raise sr.WaitTimeoutError()
+        runtime.listen_once = listen_once
+
+        async def listen_briefly():
+            task = asyncio.create_task(runtime.listen_loop())
+            await asyncio.sleep(0.05)
+            task.cancel()
+        asyncio.run(listen_briefly())
+        self.assertEqual(calls[:3], ['calibration', 'check', 'listen'])
+
+if __name__ == "__main__":
+    unittest.main()
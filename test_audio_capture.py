@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Tests for continuous audio capture: ring buffer, VAD segmentation and WAV input
+"""
+import os
+import shutil
+import tempfile
+import unittest
+import wave
+
+import numpy as np
+
+from audio_capture import AudioCapture, EnergyVAD, RingBuffer, SAMPLE_RATE, UtteranceSegmenter, WavStream
+from speech_backends import RecognitionWorker, SpeechBackend
+
+
+class DurationBackend(SpeechBackend):
+    """'Transcribes' an utterance as its length in tenths of a second"""
+
+    def recognize(self, audio):
+        return str(round(len(audio.frame_data) / (2 * audio.sample_rate) * 10))
+
+
+def tone(seconds, amplitude=8000, rate=SAMPLE_RATE):
+    t = np.arange(int(rate * seconds)) / rate
+    return (amplitude * np.sin(2 * np.pi * 300 * t)).astype(np.int16)
+
+
+def noise(seconds, amplitude=50, rate=SAMPLE_RATE):
+    return np.random.default_rng(0).normal(0, amplitude, int(rate * seconds)).astype(np.int16)
+
+
+def write_wav(path, samples, rate=SAMPLE_RATE, channels=1):
+    if channels > 1:
+        samples = np.repeat(samples, channels)
+    with wave.open(path, 'wb') as f:
+        f.setnchannels(channels)
+        f.setsampwidth(2)
+        f.setframerate(rate)
+        f.writeframes(samples.tobytes())
+
+
+class TestRingBuffer(unittest.TestCase):
+    def test_wraps_and_reads_by_absolute_offset(self):
+        ring = RingBuffer(8)
+        ring.write(b'abcdef')
+        ring.write(b'ghij')
+        self.assertEqual(ring.written, 10)
+        self.assertEqual(ring.read(4, 10), b'efghij')
+        self.assertEqual(ring.read(6), b'ghij')
+
+    def test_overwritten_bytes_are_clipped(self):
+        ring = RingBuffer(4)
+        ring.write(b'abcdefg')
+        self.assertEqual(ring.oldest(), 3)
+        self.assertEqual(ring.read(0, 7), b'defg')
+
+
+class TestUtteranceSegmenter(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def capture(self, samples, **kwargs):
+        path = os.path.join(self.tmp, 'speech.wav')
+        write_wav(path, samples, **kwargs)
+        utterances = []
+        capture = AudioCapture(WavStream(path), utterances.append,
+                               UtteranceSegmenter(preroll=0.2, hangover=0.3))
+        capture.run()
+        return utterances, capture
+
+    def test_splits_utterances_on_silence(self):
+        samples = np.concatenate([noise(0.5), tone(0.6), noise(0.8), tone(0.4), noise(0.5)])
+        utterances, capture = self.capture(samples)
+        self.assertEqual(len(utterances), 2)
+        self.assertEqual(capture.stats()['utterances'], 2)
+
+        # Pre-roll + speech + hangover, give or take a frame
+        first = len(utterances[0].frame_data) / (2 * SAMPLE_RATE)
+        self.assertAlmostEqual(first, 0.2 + 0.6 + 0.3, delta=0.07)
+
+    def test_preroll_keeps_the_start_of_speech(self):
+        samples = np.concatenate([noise(0.5), tone(0.6), noise(0.5)])
+        utterances, _ = self.capture(samples)
+        pcm = np.frombuffer(utterances[0].frame_data, dtype=np.int16)
+        onset = np.argmax(np.abs(pcm) > 1000) / SAMPLE_RATE
+        self.assertGreaterEqual(onset, 0.15)  # Quiet lead-in before the first loud sample
+
+    def test_short_clicks_are_ignored(self):
+        samples = np.concatenate([noise(0.5), tone(0.03), noise(0.8)])
+        utterances, _ = self.capture(samples)
+        self.assertEqual(utterances, [])
+
+    def test_long_speech_is_cut_into_pieces(self):
+        segmenter = UtteranceSegmenter(preroll=0.2, hangover=0.3, max_utterance=1.0)
+        pieces = []
+        frames = np.concatenate([noise(0.3), tone(2.5), noise(0.5)]).tobytes()
+        for i in range(0, len(frames) - segmenter.frame_bytes + 1, segmenter.frame_bytes):
+            piece = segmenter.process(frames[i:i + segmenter.frame_bytes])
+            if piece:
+                pieces.append(piece)
+        self.assertEqual(len(pieces), 3)
+        # Only the first piece carries pre-roll; the next one carries straight on
+        self.assertEqual(len(pieces[0]) - len(pieces[1]), int(0.2 * SAMPLE_RATE) * 2)
+
+    def test_stereo_44k_wav_is_converted(self):
+        rate = 44100
+        samples = np.concatenate([noise(0.5, rate=rate), tone(0.6, rate=rate), noise(0.6, rate=rate)])
+        utterances, _ = self.capture(samples, rate=rate, channels=2)
+        self.assertEqual(len(utterances), 1)
+        self.assertEqual(utterances[0].sample_rate, SAMPLE_RATE)
+
+    def test_wav_feeds_the_recognition_worker(self):
+        path = os.path.join(self.tmp, 'question.wav')
+        write_wav(path, np.concatenate([noise(0.5), tone(0.5), noise(0.7), tone(1.0), noise(0.5)]))
+        heard = []
+        worker = RecognitionWorker(DurationBackend(), heard.append)
+        capture = AudioCapture(WavStream(path), worker.submit, UtteranceSegmenter(preroll=0.2, hangover=0.3))
+        capture.start().thread.join(timeout=5)
+        worker.join()
+        worker.stop()
+        self.assertEqual(heard, ['10', '15'])
+
+    def test_noise_floor_adapts(self):
+        vad = EnergyVAD(ratio=3.0, min_energy=10)
+        for _ in range(50):
+            vad.is_speech(noise(0.03, amplitude=400).tobytes())
+        self.assertFalse(vad.is_speech(noise(0.03, amplitude=600).tobytes()))
+        self.assertTrue(vad.is_speech(tone(0.03).tobytes()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Tests for offline batch analysis of video files and image folders
+"""
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+import cv2
+import numpy as np
+
+from batch_analyze import BatchAnalyzer, chunks, load_checkpoint, plan
+
+
+def write_test_video(path, frames=30, fps=10, size=(64, 48)):
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'MJPG'), fps, size)
+    for i in range(frames):
+        frame = np.zeros((size[1], size[0], 3), np.uint8)
+        frame[:, (i * 4) % size[0]:(i * 4) % size[0] + 4] = 255
+        writer.write(frame)
+    writer.release()
+
+
+class CountingBackend:
+    """Stand-in backend that records calls and tracks how many run at once"""
+
+    def __init__(self, delay=0.0, fail=False):
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def generate(self, **kwargs):
+        with self.lock:
+            self.calls += 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.delay)
+            if self.fail:
+                raise ConnectionError("ollama down")
+            return {'response': f"🎬 Scene: {len(kwargs['images'][0])} bytes"}
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+
+class TestBatchAnalyze(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.video = os.path.join(self.tmp, 'recording.avi')
+        write_test_video(self.video)  # 3 seconds at 10 fps
+        self.output = os.path.join(self.tmp, 'analyses.jsonl')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def read_output(self):
+        with open(self.output) as f:
+            return [json.loads(line) for line in f]
+
+    def test_plan_samples_video_and_images(self):
+        folder = os.path.join(self.tmp, 'photos')
+        os.mkdir(folder)
+        for name in ('b.png', 'a.jpg', 'c.png'):
+            cv2.imwrite(os.path.join(folder, name), np.zeros((8, 8, 3), np.uint8))
+        open(os.path.join(folder, 'notes.txt'), 'w').close()
+
+        items = plan([self.video, folder], every=1.0, stride=2)
+        self.assertEqual([item.get('frame') for item in items[:3]], [0, 10, 20])
+        self.assertEqual([item['timestamp'] for item in items[:3]], [0.0, 1.0, 2.0])
+        self.assertEqual([os.path.basename(item['source']) for item in items[3:]], ['a.jpg', 'c.png'])
+
+        # Video and image items never share a chunk
+        self.assertEqual([len(chunk) for chunk in chunks(items, 8)], [3, 2])
+
+    def test_unreadable_inputs_are_skipped(self):
+        broken = os.path.join(self.tmp, 'broken.mp4')
+        with open(broken, 'w') as f:
+            f.write("not a video")
+        with mock.patch('builtins.print') as printed:
+            items = plan([broken, self.video, os.path.join(self.tmp, 'missing.mp4')], every=1.0)
+        self.assertEqual({item['source'] for item in items}, {self.video})
+        self.assertEqual(printed.call_count, 2)
+
+    def test_streams_results_with_bounded_concurrency(self):
+        backend = CountingBackend(delay=0.02)
+        analyzer = BatchAnalyzer(self.output, backend=backend, concurrency=2, workers=2,
+                                 max_side=32, chunk_size=2)
+        summary = analyzer.run(plan([self.video], every=0.5))
+
+        entries = self.read_output()
+        self.assertEqual(summary['analyzed'], 6)
+        self.assertEqual(sorted(entry['frame'] for entry in entries), [0, 5, 10, 15, 20, 25])
+        self.assertTrue(all(entry['analysis'].startswith('🎬') for entry in entries))
+        self.assertTrue(all(max(entry['resolution']) == 32 for entry in entries))
+        self.assertNotIn('image', entries[0])
+        self.assertLessEqual(backend.max_in_flight, 2)
+
+    def test_resume_skips_finished_frames(self):
+        items = plan([self.video], every=1.0)
+        BatchAnalyzer(self.output, backend=CountingBackend(), workers=1).run(items)
+
+        # Drop the last result and leave a half-written line, as a killed run would
+        with open(self.output) as f:
+            lines = f.readlines()
+        with open(self.output, 'w') as f:
+            f.writelines(lines[:-1])
+            f.write('{"key": "trunc')
+
+        backend = CountingBackend()
+        summary = BatchAnalyzer(self.output, backend=backend, workers=1).run(items, resume=True)
+        self.assertEqual(backend.calls, 1)
+        self.assertEqual(summary['skipped'], 2)
+        self.assertEqual(len(load_checkpoint(self.output)), 3)
+
+    def test_failed_frames_are_retried_on_resume(self):
+        items = plan([self.video], every=1.0)
+        summary = BatchAnalyzer(self.output, backend=CountingBackend(fail=True), workers=1).run(items)
+        self.assertEqual(summary['failed'], 3)
+        self.assertEqual(self.read_output()[0]['error'], "ollama down")
+
+        backend = CountingBackend()
+        BatchAnalyzer(self.output, backend=backend, workers=1).run(items, resume=True)
+        self.assertEqual(backend.calls, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Tests for the benchmark harness, run against the local fake Ollama server
+"""
+import json
+import os
+import socket
+import tempfile
+import unittest
+
+import ollama
+
+from benchmark import build_scenarios, percentile, run_benchmarks, summarize
+from fake_ollama_server import FakeOllamaServer
+
+
+class TestStatistics(unittest.TestCase):
+    """Percentile and summary helpers"""
+
+    def test_percentile_interpolates(self):
+        values = [1, 2, 3, 4, 5]
+        self.assertEqual(percentile(values, 50), 3)
+        self.assertAlmostEqual(percentile(values, 95), 4.8)
+        self.assertIsNone(percentile([], 50))
+
+    def test_summarize_ignores_missing_samples(self):
+        summary = summarize([None, 2.0, 4.0])
+        self.assertEqual(summary['p50'], 3.0)
+        self.assertEqual(summary['min'], 2.0)
+        self.assertIsNone(summarize([None]))
+
+    def test_build_scenarios(self):
+        scenarios = build_scenarios(sizes=[(320, 240), (640, 480)], num_predicts=[50], text=True)
+        self.assertEqual([s['name'] for s in scenarios],
+                         ['vision-320x240-n50', 'vision-640x480-n50', 'text-n50'])
+
+    def test_build_temporal_scenarios(self):
+        scenarios = build_scenarios(sizes=[(320, 240)], num_predicts=[50], text=False, temporal_frames=4)
+        self.assertEqual([s['name'] for s in scenarios],
+                         ['vision-320x240-n50', 'multi4-320x240-n50', 'mosaic4-320x240-n50'])
+
+
+class TestFakeServer(unittest.TestCase):
+    """The fake server speaks enough of the Ollama API for the real client"""
+
+    def setUp(self):
+        self.server = FakeOllamaServer(latency=0.01, token_rate=1000).start()
+        self.client = ollama.Client(host=self.server.url)
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_non_streaming_generate(self):
+        response = self.client.generate(model='llama3.2-vision', prompt='Hi', options={'num_predict': 3})
+        self.assertTrue(response['done'])
+        self.assertEqual(response['eval_count'], 3)
+        self.assertTrue(response['response'])
+
+    def test_streaming_generate_respects_num_predict(self):
+        chunks = list(self.client.generate(model='llama3.2-vision', prompt='Hi', stream=True,
+                                           options={'num_predict': 5}))
+        self.assertEqual(len(chunks), 6)
+        self.assertTrue(chunks[-1]['done'])
+        self.assertEqual(chunks[-1]['eval_count'], 5)
+
+    def test_ps_and_tags(self):
+        self.assertEqual(self.client.list().models[0].model, 'llama3.2-vision:latest')
+        self.assertEqual(len(self.client.ps().models), 1)
+
+    def test_unknown_model_is_404(self):
+        with self.assertRaises(ollama.ResponseError) as ctx:
+            self.client.generate(model='missing-model', prompt='Hi')
+        self.assertEqual(ctx.exception.status_code, 404)
+
+
+class TestBenchmarkHarness(unittest.TestCase):
+    """End-to-end harness run against the fake server"""
+
+    def test_run_writes_json_results(self):
+        scenarios = build_scenarios(sizes=[(320, 240)], num_predicts=[10], text=True)
+        with FakeOllamaServer(latency=0.05, token_rate=500) as server, tempfile.TemporaryDirectory() as tmp:
+            output = os.path.join(tmp, 'results.json')
+            run_benchmarks(host=server.url, iterations=2, warmup=0, scenarios=scenarios, output=output)
+            with open(output) as f:
+                results = json.load(f)
+
+        self.assertEqual(results['meta']['iterations'], 2)
+        self.assertEqual(len(results['scenarios']), 2)
+        for result in results['scenarios']:
+            self.assertEqual(result['iterations'], 2)
+            self.assertEqual(result['errors'], [])
+            self.assertGreaterEqual(result['ttft']['p50'], 0.05)
+            self.assertLess(result['ttft']['p50'], result['latency']['p50'])
+            self.assertEqual(result['tokens']['p50'], 10)
+            self.assertAlmostEqual(result['tokens_per_sec']['p50'], 500, delta=1)
+            self.assertEqual(set(result['stages']), {'encode', 'request', 'parse'})
+
+    def test_mosaic_costs_about_one_frame(self):
+        scenarios = build_scenarios(sizes=[(320, 240)], num_predicts=[5], text=False, temporal_frames=4)
+        with FakeOllamaServer(latency=0.01, token_rate=1000, image_overhead=0.05) as server:
+            results = run_benchmarks(host=server.url, iterations=1, warmup=0, scenarios=scenarios)
+        ttft = {result['kind']: result['ttft']['p50'] for result in results['scenarios']}
+        self.assertGreater(ttft['multi'], ttft['vision'] + 0.1)
+        self.assertLess(ttft['mosaic'], ttft['vision'] + 0.05)
+
+    def test_unreachable_server_is_reported_not_raised(self):
+        with socket.socket() as s:
+            s.bind(('127.0.0.1', 0))
+            port = s.getsockname()[1]  # Closed once we leave the block
+
+        scenarios = build_scenarios(sizes=[(320, 240)], num_predicts=[5], text=False)
+        results = run_benchmarks(host=f"http://127.0.0.1:{port}", iterations=2, warmup=1, scenarios=scenarios)
+        result = results['scenarios'][0]
+        self.assertEqual(result['iterations'], 0)
+        self.assertIsNone(result['latency'])
+        self.assertEqual(len(result['errors']), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
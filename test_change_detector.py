@@ -0,0 +1,41 @@
+import unittest
+import numpy as np
+from PIL import Image
+from change_detector import FrameChangeDetector
+
+class TestFrameChangeDetector(unittest.TestCase):
+    def setUp(self):
+        self.detector = FrameChangeDetector(mad_threshold=4.0, motion_threshold=0.02, max_skips=0)
+        self.frame = np.full((480, 640, 3), 100, dtype=np.uint8)
+
+    def test_first_frame_always_changes(self):
+        self.assertTrue(self.detector.has_changed(self.frame))
+
+    def test_identical_frames_are_skipped(self):
+        """Sensor-noise level differences should not trigger a new analysis"""
+        self.detector.has_changed(self.frame)
+        noisy = self.frame.copy()
+        noisy[::7, ::7] += 2
+        self.assertFalse(self.detector.has_changed(noisy))
+        self.assertEqual(self.detector.stats(), {'executed': 1, 'skipped': 1, 'skip_ratio': 0.5})
+
+    def test_local_motion_triggers_analysis(self):
+        """A moving object should count as a change even if the mean difference is small"""
+        self.detector.has_changed(self.frame)
+        moved = self.frame.copy()
+        moved[200:280, 300:380] = 255
+        self.assertTrue(self.detector.has_changed(moved))
+
+    def test_accepts_pil_images(self):
+        image = Image.new('RGB', (640, 480), (100, 150, 200))
+        self.assertTrue(self.detector.has_changed(image))
+        self.assertFalse(self.detector.has_changed(image.copy()))
+        self.assertTrue(self.detector.has_changed(Image.new('RGB', (640, 480), (200, 200, 100))))
+
+    def test_max_skips_forces_refresh(self):
+        detector = FrameChangeDetector(max_skips=2)
+        results = [detector.has_changed(self.frame) for _ in range(4)]
+        self.assertEqual(results, [True, False, False, True])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import io
+import unittest
+import cv2
+import numpy as np
+from PIL import Image
+from frame_encoder import FrameEncoder, ResolutionPolicy
+
+class TestFrameEncoder(unittest.TestCase):
+    def setUp(self):
+        self.encoder = FrameEncoder(quality=90)
+
+    def test_bgr_frame_round_trip(self):
+        frame = np.zeros((480, 640, 3), dtype=np.uint8)
+        frame[:, :, 2] = 200  # Red in BGR order
+        data = self.encoder.encode(frame)
+        self.assertIsInstance(data, bytes)
+        decoded = cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR)
+        self.assertEqual(decoded.shape, (480, 640, 3))
+        self.assertAlmostEqual(int(decoded[..., 2].mean()), 200, delta=3)
+
+    def test_pil_images_keep_their_colours(self):
+        """PIL input is RGB and must be swapped to BGR before encoding"""
+        data = self.encoder.encode(Image.new('RGB', (64, 64), (255, 0, 0)))
+        decoded = Image.open(io.BytesIO(data)).convert('RGB')
+        r, g, b = decoded.getpixel((32, 32))
+        self.assertGreater(r, 240)
+        self.assertLess(g + b, 20)
+
+    def test_conversion_buffer_is_reused(self):
+        image = Image.new('RGB', (64, 64), (10, 20, 30))
+        self.encoder.encode(image)
+        buffer = self.encoder._bgr
+        self.encoder.encode(image)
+        self.assertIs(self.encoder._bgr, buffer)
+
+class TestResolutionPolicy(unittest.TestCase):
+    def test_fixed_max_side_keeps_aspect_ratio(self):
+        policy = ResolutionPolicy(max_side=640)
+        frame = np.zeros((1080, 1920, 3), dtype=np.uint8)
+        resized, size = policy.apply(frame)
+        self.assertEqual(size, (640, 360))
+        self.assertEqual(resized.shape, (360, 640, 3))
+
+    def test_pixel_budget_and_no_upscaling(self):
+        policy = ResolutionPolicy(pixel_budget=640 * 480)
+        self.assertEqual(policy.target_size(1280, 960), (640, 480))
+        self.assertEqual(policy.target_size(320, 240), (320, 240))
+        _, size = policy.apply(Image.new('RGB', (1280, 960)))
+        self.assertEqual(size, (640, 480))
+
+    def test_auto_mode_steps_down_when_too_slow_and_probes_back_up(self):
+        policy = ResolutionPolicy(mode='auto', latency_target=2.0, probe_every=3, smoothing=1.0)
+        size = policy.target_size(1920, 1080)
+        self.assertEqual(size, (1280, 720))
+
+        policy.record_latency(size, 4.0)
+        size = policy.target_size(1920, 1080)
+        self.assertEqual(size, (1024, 576))
+
+        # Comfortably under target for a while: probe the larger tier again
+        for _ in range(3):
+            policy.record_latency(size, 1.0)
+        self.assertEqual(policy.target_size(1920, 1080), (1280, 720))
+
+    def test_auto_mode_skips_tiers_larger_than_the_image(self):
+        """A 640x480 camera can't be helped by the 1280/1024/768 tiers"""
+        policy = ResolutionPolicy(mode='auto', latency_target=2.0)
+        policy.record_latency(policy.target_size(640, 480), 5.0)
+        self.assertEqual(policy.target_size(640, 480), (512, 384))
+
+if __name__ == "__main__":
+    unittest.main()
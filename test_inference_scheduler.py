@@ -0,0 +1,197 @@
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+from ai_eye_assistant import AIEyeAssistant
+from inference_scheduler import INTERACTIVE, ON_DEMAND, PERIODIC, RequestCancelled, RequestScheduler
+from metrics import MetricsRegistry
+
+def wait_until(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+class FakeBackend:
+    """Answers scene analyses (calls with images) and replies; scene analyses wait for `release`"""
+    def __init__(self):
+        self.calls = []
+        self.release = threading.Event()
+
+    def generate(self, **kwargs):
+        if kwargs.get('images'):
+            self.calls.append('scene')
+            self.release.wait(2)
+            return {'response': "🎬 Scene: A desk with a laptop.\n👤 Currently: Typing."}
+        self.calls.append('reply')
+        return {'response': "Hi there!"}
+
+class TestRequestScheduler(unittest.TestCase):
+    def start_request(self, scheduler, priority, name, log, release=None):
+        """Run a request on its own thread, logging when it gets the model or is cancelled"""
+        def request():
+            try:
+                with scheduler.request(priority):
+                    log.append(name)
+                    if release:
+                        release.wait(2)
+            except RequestCancelled:
+                log.append(f"{name} cancelled")
+
+        thread = threading.Thread(target=request)
+        thread.start()
+        return thread
+
+    def test_user_goes_first_and_cancels_queued_observations(self):
+        metrics = MetricsRegistry()
+        scheduler = RequestScheduler(metrics=metrics)
+        log = []
+        release = threading.Event()
+        threads = [self.start_request(scheduler, PERIODIC, 'observation', log, release)]
+        wait_until(lambda: log == ['observation'])
+        threads.append(self.start_request(scheduler, PERIODIC, 'next observation', log))
+        threads.append(self.start_request(scheduler, ON_DEMAND, 'look', log))
+        wait_until(lambda: len(scheduler.pending) == 2)
+        threads.append(self.start_request(scheduler, INTERACTIVE, 'reply', log))
+        wait_until(lambda: 'next observation cancelled' in log)
+
+        release.set()  # The running observation can't be interrupted, only finished
+        for thread in threads:
+            thread.join(2)
+
+        self.assertEqual(log, ['observation', 'next observation cancelled', 'reply', 'look'])
+        stats = scheduler.stats()
+        self.assertEqual(stats['periodic']['cancelled'], 1)
+        self.assertGreater(stats['interactive']['avg_wait'], 0)
+        waits = metrics.histograms['stage_seconds']
+        self.assertEqual(waits[(('stage', 'queue_wait_interactive'),)].count, 1)
+        self.assertEqual(waits[(('stage', 'queue_wait_periodic'),)].count, 1)
+
+    def test_observations_hold_off_after_the_user_speaks(self):
+        scheduler = RequestScheduler(holdoff=0.2)
+        scheduler.run(lambda: None, INTERACTIVE)
+        started = time.monotonic()
+        scheduler.run(lambda: None, PERIODIC)
+        self.assertGreaterEqual(time.monotonic() - started, 0.15)
+
+        started = time.monotonic()
+        scheduler.run(lambda: None, ON_DEMAND)
+        self.assertLess(time.monotonic() - started, 0.1)
+
+class TestAssistantScheduling(unittest.TestCase):
+    """The assistant's conversation and observations sharing one model through its RequestScheduler"""
+
+    @patch('ai_eye_assistant.WARMUP_MODEL', False)
+    @patch('ai_eye_assistant.ENABLE_TTS', False)
+    @patch.object(AIEyeAssistant, 'init_speech_recognition', lambda self: None)
+    @patch('ai_eye_assistant.sr.Microphone', MagicMock())
+    def setUp(self):
+        with patch('builtins.print'):
+            self.assistant = AIEyeAssistant(demo_mode=True, background_listening=False)
+        self.assistant.change_detector = None
+        self.assistant.analysis_cache = None
+        self.assistant.requests.holdoff = 0
+        self.fake = FakeBackend()
+        patcher = patch.object(self.assistant.backend, 'generate', self.fake.generate)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.fake.release.set)
+
+    def in_background(self, fn, *args):
+        thread = threading.Thread(target=fn, args=args, daemon=True)
+        thread.start()
+        return thread
+
+    def test_question_cancels_queued_observation(self):
+        assistant = self.assistant
+        outcomes = []
+
+        def observe(count):
+            try:
+                outcomes.append(assistant.analyze_scene(assistant.create_demo_image(count)[0]))
+            except RequestCancelled:
+                outcomes.append('deferred')
+
+        with patch('builtins.print'):
+            threads = [self.in_background(observe, 0)]
+            self.assertTrue(wait_until(lambda: self.fake.calls == ['scene']))
+            threads.append(self.in_background(observe, 1))
+            self.assertTrue(wait_until(lambda: len(assistant.requests.pending) == 1))
+            threads.append(self.in_background(assistant.handle_speech_input, "hello there"))
+            self.assertTrue(wait_until(lambda: 'deferred' in outcomes))
+
+            self.fake.release.set()
+            for thread in threads:
+                thread.join(2)
+
+        self.assertEqual(self.fake.calls, ['scene', 'reply'])
+        self.assertEqual(assistant.requests.stats()['periodic']['cancelled'], 1)
+        self.assertEqual(assistant.requests.stats()['interactive']['completed'], 1)
+
+    def test_look_question_analyzes_a_fresh_frame(self):
+        self.fake.release.set()
+        with patch('builtins.print'):
+            self.assistant.handle_speech_input("What do you see?")
+
+        self.assertEqual(self.fake.calls, ['scene'])
+        self.assertEqual(self.assistant.requests.stats()['on_demand']['completed'], 1)
+        self.assertIn("Typing", self.assistant.previous_analysis)
+
+    def test_look_question_goes_ahead_of_queued_observation(self):
+        assistant = self.assistant
+        requests = assistant.requests
+        granted = []
+        acquire = requests.acquire
+
+        def logged_acquire(priority):
+            request = acquire(priority)
+            granted.append(priority)
+            return request
+
+        def hold_model():
+            with requests.request(PERIODIC):
+                hold.wait(2)
+
+        hold = threading.Event()
+        self.fake.release.set()
+        with patch.object(requests, 'acquire', logged_acquire), patch('builtins.print'):
+            threads = [self.in_background(hold_model)]
+            self.assertTrue(wait_until(lambda: granted == [PERIODIC]))
+            threads.append(self.in_background(assistant.analyze_scene, assistant.create_demo_image(1)[0]))
+            self.assertTrue(wait_until(lambda: len(requests.pending) == 1))
+            threads.append(self.in_background(assistant.handle_speech_input, "what can you see?"))
+            self.assertTrue(wait_until(lambda: len(requests.pending) == 2))
+
+            hold.set()
+            for thread in threads:
+                thread.join(2)
+
+        self.assertEqual(granted, [PERIODIC, ON_DEMAND, PERIODIC])
+        self.assertEqual(self.fake.calls, ['scene', 'scene'])
+
+    def test_look_question_shares_the_frame_being_analyzed(self):
+        assistant = self.assistant
+        with patch('builtins.print'):
+            observing = self.in_background(assistant.analyze_scene, assistant.create_demo_image(0)[0])
+            self.assertTrue(wait_until(lambda: self.fake.calls == ['scene']))
+            looking = self.in_background(assistant.handle_speech_input, "what do you see?")
+            self.assertTrue(wait_until(lambda: assistant.scene_flights.stats()['coalesced'] == 1))
+
+            self.fake.release.set()
+            observing.join(2)
+            looking.join(2)
+
+        self.assertEqual(self.fake.calls, ['scene'])
+        self.assertIn("Typing", assistant.previous_analysis)
+
+    def test_conversation_thread_answers_queued_speech(self):
+        with patch('builtins.print'):
+            self.assistant.start_conversation()
+            self.assistant.speech_queue.put("hello there")
+            self.assertTrue(wait_until(lambda: self.fake.calls == ['reply']))
+            self.assistant.speech_queue.put(None)
+
+if __name__ == "__main__":
+    unittest.main()
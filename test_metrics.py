@@ -0,0 +1,95 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+import urllib.request
+from metrics import Histogram, JsonlDumper, MetricsRegistry, MetricsServer
+
+class TestHistogram(unittest.TestCase):
+    def test_buckets_sum_and_count(self):
+        histogram = Histogram(buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 0.5, 5.0):
+            histogram.observe(value)
+        self.assertEqual(histogram.counts, [1, 2, 1])
+        self.assertEqual(histogram.count, 4)
+        self.assertAlmostEqual(histogram.sum, 6.05)
+
+    def test_quantile_interpolates_within_bucket(self):
+        histogram = Histogram(buckets=(1.0, 2.0))
+        for _ in range(10):
+            histogram.observe(1.5)
+        self.assertAlmostEqual(histogram.quantile(0.5), 1.5)
+        self.assertIsNone(Histogram().quantile(0.5))
+
+class TestMetricsRegistry(unittest.TestCase):
+    def test_timer_records_stage(self):
+        metrics = MetricsRegistry()
+        with metrics.timer('encode'):
+            time.sleep(0.01)
+        snapshot = metrics.histogram('stage_seconds', stage='encode').snapshot()
+        self.assertEqual(snapshot['count'], 1)
+        self.assertGreaterEqual(snapshot['sum'], 0.01)
+
+    def test_timer_records_on_exception(self):
+        metrics = MetricsRegistry()
+        with self.assertRaises(ValueError):
+            with metrics.timer('inference'):
+                raise ValueError("boom")
+        self.assertEqual(metrics.histogram('stage_seconds', stage='inference').count, 1)
+
+    def test_disabled_registry_records_nothing(self):
+        metrics = MetricsRegistry(enabled=False)
+        with metrics.timer('encode'):
+            pass
+        metrics.inc('analyses_total', source='model')
+        self.assertEqual(metrics.histograms, {})
+        self.assertEqual(metrics.counters, {})
+
+    def test_prometheus_text(self):
+        metrics = MetricsRegistry(buckets=(0.1, 1.0))
+        metrics.observe('encode', 0.05)
+        metrics.observe('encode', 0.5)
+        metrics.inc('analyses_total', source='cache')
+        text = metrics.render_prometheus()
+        self.assertIn('ai_eye_analyses_total{source="cache"} 1', text)
+        self.assertIn('ai_eye_stage_seconds_bucket{stage="encode",le="0.1"} 1', text)
+        self.assertIn('ai_eye_stage_seconds_bucket{stage="encode",le="+Inf"} 2', text)
+        self.assertIn('ai_eye_stage_seconds_count{stage="encode"} 2', text)
+
+    def test_timer_overhead_is_small(self):
+        metrics = MetricsRegistry()
+        iterations = 20000
+        started = time.perf_counter()
+        for _ in range(iterations):
+            with metrics.timer('overhead'):
+                pass
+        per_sample = (time.perf_counter() - started) / iterations
+        self.assertLess(per_sample, 50e-6, "Timing a stage should cost microseconds")
+
+class TestExporters(unittest.TestCase):
+    def test_metrics_endpoint(self):
+        metrics = MetricsRegistry()
+        metrics.observe('camera_read', 0.002)
+        server = MetricsServer(metrics, port=0)
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{server.port}/metrics") as response:
+                body = response.read().decode()
+        finally:
+            server.stop()
+        self.assertIn('ai_eye_stage_seconds_count{stage="camera_read"} 1', body)
+
+    def test_jsonl_dump(self):
+        metrics = MetricsRegistry()
+        metrics.observe('inference', 1.2)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'metrics.jsonl')
+            dumper = JsonlDumper(metrics, path, interval=60)
+            dumper.stop()
+            with open(path) as f:
+                entry = json.loads(f.readline())
+        self.assertEqual(entry['histograms']['stage_seconds'][0]['stage'], 'inference')
+        self.assertEqual(entry['histograms']['stage_seconds'][0]['count'], 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Tests for persisted microphone calibration
+"""
+import json
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from types import SimpleNamespace
+
+import numpy as np
+import speech_recognition as sr
+
+from mic_calibration import MicCalibration, device_key
+
+
+class FakeSource:
+    """Open audio source producing noise at a fixed RMS level"""
+
+    SAMPLE_RATE = 16000
+    CHUNK = 1024
+
+    def __init__(self, level):
+        rng = np.random.default_rng(0)
+        self.buffer = np.clip(rng.normal(0, level, self.CHUNK), -32768, 32767).astype(np.int16).tobytes()
+        self.reads = 0
+        self.stream = self
+
+    def read(self, size):
+        self.reads += 1
+        return self.buffer
+
+
+class TestMicCalibration(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp, 'mic.json')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_calibration_is_reused_on_next_start(self):
+        recognizer = sr.Recognizer()
+        MicCalibration(self.path).calibrate(recognizer, FakeSource(400), 'USB Mic@16000')
+        self.assertGreater(recognizer.energy_threshold, 300)
+
+        restarted = sr.Recognizer()
+        restarted.dynamic_energy_ratio = 9.0
+        self.assertTrue(MicCalibration(self.path).restore(restarted, 'USB Mic@16000'))
+        self.assertEqual(restarted.energy_threshold, recognizer.energy_threshold)
+        self.assertEqual(restarted.dynamic_energy_ratio, recognizer.dynamic_energy_ratio)
+        self.assertFalse(MicCalibration(self.path).restore(sr.Recognizer(), 'Other Mic@44100'))
+
+    def test_noise_floor_is_measured_while_calibrating(self):
+        calibration = MicCalibration(self.path)
+        entry = calibration.calibrate(sr.Recognizer(), FakeSource(200), 'mic')
+        self.assertAlmostEqual(entry['noise_floor'], 200, delta=15)
+
+    def test_stale_calibration_is_ignored(self):
+        MicCalibration(self.path).calibrate(sr.Recognizer(), FakeSource(200), 'mic')
+        calibration = MicCalibration(self.path, max_age=60)
+        self.assertIsNotNone(calibration.fresh('mic'))
+        self.assertIsNone(calibration.fresh('mic', now=time.time() + 61))
+
+    def test_verify_recalibrates_only_on_drift(self):
+        calibration = MicCalibration(self.path, drift_ratio=2.0)
+        recognizer = sr.Recognizer()
+        calibration.calibrate(recognizer, FakeSource(200), 'mic')
+        quiet_threshold = recognizer.energy_threshold
+
+        same_room = FakeSource(250)
+        self.assertFalse(calibration.verify(recognizer, same_room, 'mic'))
+        self.assertLess(same_room.reads, 5)  # A quick look, not a full calibration
+        self.assertEqual(recognizer.energy_threshold, quiet_threshold)
+
+        self.assertTrue(calibration.verify(recognizer, FakeSource(1000), 'mic'))
+        self.assertGreater(recognizer.energy_threshold, quiet_threshold)
+        with open(self.path) as f:
+            self.assertAlmostEqual(json.load(f)['mic']['noise_floor'], 1000, delta=60)
+
+    def test_unreadable_cache_starts_empty(self):
+        with open(self.path, 'w') as f:
+            f.write('{not json')
+        self.assertEqual(MicCalibration(self.path).entries, {})
+
+    def test_device_key_without_pyaudio(self):
+        def no_pyaudio():
+            raise AttributeError("PyAudio not available")
+
+        microphone = SimpleNamespace(pyaudio_module=SimpleNamespace(PyAudio=no_pyaudio),
+                                     device_index=2, SAMPLE_RATE=44100)
+        self.assertEqual(device_key(microphone), 'device-2@44100')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,212 @@
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+import cv2
+import numpy as np
+from camera_sources import CameraSource, parse_source
+from frame_encoder import FrameEncoder, ResolutionPolicy
+from inference_scheduler import InferenceScheduler
+from metrics import MetricsRegistry
+from multi_camera import MultiCameraObserver, make_names_unique, parse_priorities
+from observation_memory import ObservationMemory
+
+def write_test_video(path, frames=6, size=(64, 48)):
+    """Small MJPG video with a bar sweeping across, so every frame differs"""
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'MJPG'), 10, size)
+    for i in range(frames):
+        frame = np.zeros((size[1], size[0], 3), np.uint8)
+        frame[:, (i * 10) % size[0]:(i * 10) % size[0] + 10] = 255
+        writer.write(frame)
+    writer.release()
+
+def wait_until(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("Timed out waiting for condition")
+        time.sleep(0.01)
+
+class TestInferenceScheduler(unittest.TestCase):
+    def test_priorities_share_the_model_proportionally(self):
+        order = []
+        scheduler = InferenceScheduler(lambda name, item: order.append(name), queue_depth=20)
+        scheduler.add_source('front', priority=2)
+        scheduler.add_source('back', priority=1)
+        for i in range(12):
+            scheduler.submit('front', i)
+            scheduler.submit('back', i)
+
+        scheduler.start()
+        wait_until(lambda: scheduler.pending() == 0)
+        scheduler.stop()
+        self.assertEqual(order[:9].count('front'), 6)
+        self.assertEqual(order[:9].count('back'), 3)
+
+    def test_newest_item_replaces_stale_one(self):
+        handled = []
+        scheduler = InferenceScheduler(lambda name, item: handled.append(item))
+        for item in ('old', 'older', 'newest'):
+            scheduler.submit('cam', item)
+        scheduler.start()
+        wait_until(lambda: scheduler.pending() == 0)
+        scheduler.stop()
+        self.assertEqual(handled, ['newest'])
+        self.assertEqual(scheduler.stats()['sources']['cam']['dropped'], 2)
+
+    def test_global_concurrency_limit(self):
+        def slow(name, item):
+            time.sleep(0.05)
+
+        scheduler = InferenceScheduler(slow, max_concurrency=2)
+        scheduler.start()
+        for name in ('a', 'b', 'c', 'd'):
+            scheduler.submit(name, 1)
+        wait_until(lambda: scheduler.pending() == 0)
+        scheduler.stop()
+        self.assertEqual(scheduler.max_in_flight, 2)
+
+    def test_idle_source_does_not_bank_credit(self):
+        scheduler = InferenceScheduler(lambda name, item: None, queue_depth=10)
+        scheduler.add_source('busy')
+        scheduler.add_source('idle')
+        for i in range(5):
+            scheduler.submit('busy', i)
+        for _ in range(5):
+            scheduler._next_job()
+
+        # The idle source joins level with the busy one instead of getting 5 jobs in a row
+        for i in range(3):
+            scheduler.submit('idle', i)
+            scheduler.submit('busy', i)
+        order = [scheduler._next_job()[0].name for _ in range(4)]
+        self.assertEqual(sorted(order), ['busy', 'busy', 'idle', 'idle'])
+
+    def test_errors_are_reported_and_counted(self):
+        errors = []
+
+        def fail(name, item):
+            raise RuntimeError("model unavailable")
+
+        scheduler = InferenceScheduler(fail, on_error=lambda name, item, e: errors.append(str(e)))
+        scheduler.start()
+        scheduler.submit('cam', 1)
+        wait_until(lambda: scheduler.pending() == 0)
+        scheduler.stop()
+        self.assertEqual(errors, ["model unavailable"])
+        self.assertEqual(scheduler.stats()['sources']['cam']['failed'], 1)
+
+class TestCameraSource(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.video = os.path.join(self.tmp, 'door.avi')
+        write_test_video(self.video, frames=3)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_parse_source(self):
+        self.assertEqual(parse_source('0'), 0)
+        self.assertEqual(parse_source('rtsp://cam/stream'), 'rtsp://cam/stream')
+        self.assertEqual(CameraSource('1').name, 'cam1')
+        self.assertEqual(CameraSource(self.video).name, 'door.avi')
+
+    def test_reads_video_file_until_end(self):
+        source = CameraSource(self.video)
+        self.assertTrue(source.open())
+        frames = [source.read() for _ in range(4)]
+        source.close()
+        self.assertTrue(all(frame is not None for frame in frames[:3]))
+        self.assertIsNone(frames[3])
+
+    def test_looping_file_rewinds(self):
+        source = CameraSource(self.video, loop=True)
+        source.open()
+        frames = [source.read() for _ in range(5)]
+        source.close()
+        self.assertTrue(all(frame is not None for frame in frames))
+
+    def test_priorities_argument(self):
+        self.assertEqual(parse_priorities(['cam0=2', 'rtsp://a=b@host/x=0.5']),
+                         {'cam0': 2.0, 'rtsp://a=b@host/x': 0.5})
+
+    def test_same_file_names_get_unique_names(self):
+        sources = make_names_unique([CameraSource('/a/cam.mp4'), CameraSource('/b/cam.mp4'),
+                                     CameraSource('rtsp://host/cam.mp4'), CameraSource('0')])
+        self.assertEqual([source.name for source in sources], ['cam.mp4', 'cam.mp4-2', 'cam.mp4-3', 'cam0'])
+
+class TestMultiCameraObserver(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.videos = []
+        for name in ('front.avi', 'back.avi'):
+            path = os.path.join(self.tmp, name)
+            write_test_video(path, frames=4)
+            self.videos.append(path)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def make_assistant(self, generate):
+        encoder = FrameEncoder()
+        return SimpleNamespace(
+            backend=SimpleNamespace(generate=generate),
+            scene_request=lambda: ("Describe the scene", {'num_predict': 10}),
+            encode_image=encoder.encode,
+            resolution_policy=ResolutionPolicy(),
+            analysis_cache=None,
+            metrics=MetricsRegistry(),
+            enable_tts=False,
+            observation_count=0,
+            previous_analysis=None,
+            memory=ObservationMemory(),
+        )
+
+    def test_sources_share_one_backend(self):
+        lock = threading.Lock()
+        in_flight = {'now': 0, 'max': 0}
+
+        def generate(**kwargs):
+            with lock:
+                in_flight['now'] += 1
+                in_flight['max'] = max(in_flight['max'], in_flight['now'])
+            time.sleep(0.01)
+            with lock:
+                in_flight['now'] -= 1
+            return {'response': "🎬 Scene: A test pattern."}
+
+        assistant = self.make_assistant(generate)
+        analyses = []
+        sources = [CameraSource(path, interval=0.02) for path in self.videos]
+        observer = MultiCameraObserver(assistant, sources, max_concurrency=1, change_gating=False,
+                                       show_windows=False, on_analysis=lambda name, a: analyses.append(name))
+        observer.run()
+
+        self.assertEqual(set(analyses), {'front.avi', 'back.avi'})
+        self.assertEqual(in_flight['max'], 1)
+        self.assertEqual(assistant.observation_count, len(analyses))
+        self.assertTrue(assistant.previous_analysis.startswith('['))
+        self.assertIn('.avi] A test pattern.', assistant.memory.context())
+
+    def test_duplicate_names_are_rejected(self):
+        sources = [CameraSource(path) for path in (self.videos[0], self.videos[0])]
+        with self.assertRaises(ValueError):
+            MultiCameraObserver(self.make_assistant(None), sources, show_windows=False)
+
+    def test_failed_analysis_is_reported(self):
+        def generate(**kwargs):
+            raise ConnectionError("ollama down")
+
+        assistant = self.make_assistant(generate)
+        observer = MultiCameraObserver(assistant, [CameraSource(self.videos[0], interval=0.02)],
+                                       change_gating=False, show_windows=False)
+        observer.run()
+        stats = observer.scheduler.stats()['sources']['front.avi']
+        self.assertGreaterEqual(stats['failed'], 1)
+        self.assertEqual(stats['completed'], 0)
+
+if __name__ == "__main__":
+    unittest.main()
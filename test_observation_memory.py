@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Tests for the bounded observation memory behind conversation replies
+"""
+import threading
+import time
+import unittest
+from datetime import datetime, timedelta
+
+from observation_memory import ObservationMemory, estimate_tokens
+
+START = datetime(2024, 1, 1, 9, 0, 0)
+
+
+def analysis(i):
+    return (f"🎬 Scene: A home office with a desk, a lamp and a bookshelf, seen for the {i}th time.\n"
+            f"👤 Currently: Typing on a laptop, task number {i}.\n"
+            f"🔮 Next Action: Reaching for the coffee mug.")
+
+
+def fill(memory, count):
+    for i in range(count):
+        memory.add(analysis(i), at=START + timedelta(minutes=i))
+
+
+def wait_for(condition, timeout=2):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+class TestObservationMemory(unittest.TestCase):
+    def test_observations_are_parsed_into_sections(self):
+        memory = ObservationMemory()
+        memory.add(analysis(1), at=START)
+        self.assertEqual(memory.context(), "- [09:00:00] Typing on a laptop, task number 1. "
+                                           "A home office with a desk, a lamp and a bookshelf, seen for the 1th time.")
+
+    def test_failed_analyses_are_not_remembered(self):
+        memory = ObservationMemory()
+        memory.add("❌ Analysis failed: connection refused")
+        self.assertEqual(memory.context(), '')
+        self.assertEqual(memory.stats()['observations'], 0)
+
+    def test_ring_buffer_is_bounded(self):
+        memory = ObservationMemory(size=3, compact_batch=100)
+        fill(memory, 5)
+        self.assertEqual([o.activity for o in memory.recent],
+                         [f"Typing on a laptop, task number {i}." for i in (2, 3, 4)])
+        self.assertEqual(len(memory.evicted), 2)
+
+    def test_old_observations_are_summarized_in_the_background(self):
+        calls = []
+        summarizer_threads = set()
+
+        def summarize(summary, observations):
+            calls.append((summary, [o.activity for o in observations]))
+            summarizer_threads.add(threading.get_ident())
+            return f"Worked through {len(calls) * 2} tasks."
+
+        memory = ObservationMemory(size=2, compact_batch=2, summarize=summarize)
+        fill(memory, 6)
+        self.assertTrue(wait_for(lambda: memory.stats()['compactions'] == 2))
+
+        self.assertNotIn(threading.get_ident(), summarizer_threads)
+        self.assertEqual(calls[0], ('', ["Typing on a laptop, task number 0.", "Typing on a laptop, task number 1."]))
+        self.assertEqual(calls[1][0], "Worked through 2 tasks.")
+        self.assertEqual(len(memory.recent), 2)
+        context = memory.context()
+        self.assertTrue(context.startswith("Earlier in this session: Worked through 4 tasks."))
+        self.assertIn("task number 5", context)
+        self.assertNotIn("task number 3", context)
+
+    def test_activities_are_listed_when_summarizing_fails(self):
+        def summarize(summary, observations):
+            raise ConnectionError("ollama down")
+
+        memory = ObservationMemory(size=1, compact_batch=2, summarize=summarize)
+        memory.add(analysis(1), at=START)
+        memory.add(analysis(1), at=START + timedelta(minutes=1))
+        memory.add(analysis(2), at=START + timedelta(minutes=2))
+        memory.add(analysis(3), at=START + timedelta(minutes=3))
+        self.assertTrue(wait_for(lambda: memory.summary))
+        self.assertEqual(memory.summary, "09:00 Typing on a laptop, task number 1.")
+
+    def test_context_stays_within_budget_however_long_the_session(self):
+        memory = ObservationMemory(size=8, token_budget=200, compact_batch=4,
+                                   summarize=lambda summary, observations: summary + ' ' + analysis(0) * 3)
+        for count in (1, 10, 100, 500):
+            fill(memory, count)
+            self.assertTrue(wait_for(lambda: not memory.compacting))
+            context = memory.context()
+            self.assertLessEqual(estimate_tokens(context), 200)
+            self.assertIn("task number", context)
+        self.assertLessEqual(estimate_tokens(memory.summary), memory.summary_budget + 1)
+        self.assertLessEqual(len(memory.evicted), 4)
+
+    def test_smaller_budget_keeps_the_newest_observations(self):
+        memory = ObservationMemory(size=8)
+        fill(memory, 8)
+        context = memory.context(budget=70)
+        self.assertLessEqual(estimate_tokens(context), 70)
+        self.assertIn("task number 7", context)
+        self.assertNotIn("task number 0", context)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+import time
+import threading
+import unittest
+from observation_pipeline import LatestFrameQueue, ObservationPipeline
+
+class TestLatestFrameQueue(unittest.TestCase):
+    def test_newest_item_wins(self):
+        """A full queue should drop the stale item and keep the newest"""
+        frames = LatestFrameQueue(maxsize=1)
+        frames.put(1)
+        frames.put(2)
+        frames.put(3)
+        self.assertEqual(frames.get(timeout=0.1), 3)
+        self.assertEqual(frames.dropped, 2)
+
+class TestObservationPipeline(unittest.TestCase):
+    def test_slow_inference_drops_stale_frames(self):
+        """Capture keeps running while inference is busy, and only fresh frames are analyzed"""
+        counter = iter(range(1000))
+        analyzed = []
+        narrated = []
+        done = threading.Event()
+
+        def analyze(item):
+            time.sleep(0.05)
+            analyzed.append(item)
+            return item
+
+        def narrate(item):
+            narrated.append(item)
+            if len(narrated) >= 3:
+                done.set()
+            return item
+
+        pipeline = ObservationPipeline(
+            capture=lambda: next(counter),
+            preprocess=lambda item: item,
+            analyze=analyze,
+            narrate=narrate,
+            capture_interval=0.005,
+        )
+        pipeline.start()
+        self.assertTrue(done.wait(timeout=5), "Pipeline should narrate results")
+        pipeline.stop()
+
+        stats = pipeline.stats()
+        self.assertGreater(stats['captured'], stats['analyzed'])
+        self.assertGreater(stats['dropped_frames'], 0)
+        self.assertEqual(analyzed, sorted(analyzed), "Frames should be analyzed in capture order")
+
+    def test_skipped_frames_are_not_counted_as_analyses(self):
+        """Inference returning None (unchanged frame, deferred for the user) isn't an analysis"""
+        counter = iter(range(6))
+        stopped = threading.Event()
+
+        def capture():
+            item = next(counter, None)
+            if item is None:
+                stopped.wait(2)  # Returning None would stop the pipeline before the queued frames are analyzed
+            return item
+
+        pipeline = ObservationPipeline(
+            capture=capture,
+            preprocess=lambda item: item,
+            analyze=lambda item: item if item % 3 == 0 else None,
+            narrate=lambda item: item,
+            queue_size=10,
+        )
+        pipeline.start()
+        deadline = time.monotonic() + 2
+        while pipeline.analyzed + pipeline.skipped < 6 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        stopped.set()
+        pipeline.stop()
+
+        stats = pipeline.stats()
+        self.assertEqual((stats['analyzed'], stats['skipped']), (2, 4))
+
+    def test_capture_returning_none_stops_pipeline(self):
+        """The pipeline stops when the capture stage runs out of frames"""
+        pipeline = ObservationPipeline(
+            capture=lambda: None,
+            preprocess=lambda item: item,
+            analyze=lambda item: item,
+            narrate=lambda item: item,
+        )
+        pipeline.start()
+        time.sleep(0.2)
+        self.assertFalse(pipeline.is_running())
+        pipeline.stop()
+
+if __name__ == "__main__":
+    unittest.main()
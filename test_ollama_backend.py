@@ -0,0 +1,98 @@
+import asyncio
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+import ollama
+from ollama_backend import OllamaBackend, full_model_name, get_backend, parse_keep_alive
+
+class TestOllamaBackend(unittest.TestCase):
+    def setUp(self):
+        self.backend = OllamaBackend(keep_alive='10m')
+        self.backend.client = MagicMock()
+
+    def test_shared_backend(self):
+        self.assertIs(get_backend(), get_backend())
+
+    def test_keep_alive_applied_to_every_call(self):
+        self.backend.generate(model='m', prompt='hi')
+        self.assertEqual(self.backend.client.generate.call_args.kwargs['keep_alive'], '10m')
+        self.backend.generate(model='m', prompt='hi', keep_alive=0)
+        self.assertEqual(self.backend.client.generate.call_args.kwargs['keep_alive'], 0)
+
+    def test_identical_overlapping_requests_are_sent_once(self):
+        def generate(**kwargs):
+            time.sleep(0.2)
+            return {'response': kwargs['prompt']}
+
+        self.backend.client.generate.side_effect = generate
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(
+            self.backend.generate(model='m', prompt='What do you see?', images=[b'frame'])))
+            for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+
+        self.assertEqual(self.backend.client.generate.call_count, 1)
+        self.assertEqual(results, [{'response': 'What do you see?'}] * 2)
+        self.assertEqual(self.backend.stats()['coalesced'], 1)
+
+    def test_identical_overlapping_async_requests_are_sent_once(self):
+        client = MagicMock()
+        calls = []
+
+        async def generate(**kwargs):
+            calls.append(kwargs)
+            await asyncio.sleep(0.1)
+            return {'response': kwargs['prompt']}
+
+        client.generate = generate
+
+        async def both():
+            request = dict(model='m', prompt='What do you see?', images=[b'frame'])
+            return await asyncio.gather(self.backend.agenerate(client, **request),
+                                        self.backend.agenerate(client, **request))
+
+        self.assertEqual(asyncio.run(both()), [{'response': 'What do you see?'}] * 2)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(calls[0]['keep_alive'], '10m')
+        self.assertEqual(self.backend.stats()['coalesced'], 1)
+
+    def test_parse_keep_alive(self):
+        self.assertEqual(parse_keep_alive('-1'), -1)
+        self.assertEqual(parse_keep_alive('30m'), '30m')
+
+    def test_loaded_model_must_match_name_and_tag(self):
+        self.backend.client.ps.return_value = MagicMock(models=[MagicMock(model='llava:7b'),
+                                                                MagicMock(model='llama3.2-vision:latest')])
+        self.assertTrue(self.backend.is_loaded('llava:7b'))
+        self.assertFalse(self.backend.is_loaded('llava:13b'))
+        self.assertFalse(self.backend.is_loaded('llava'))
+        self.assertTrue(self.backend.is_loaded('llama3.2-vision'))
+        self.assertEqual(full_model_name('localhost:5000/llava'), 'localhost:5000/llava:latest')
+
+    def test_warmup_records_cold_then_warm_latency(self):
+        self.backend.client.ps.return_value = MagicMock(models=[])
+        with patch('ollama_backend.time.time', side_effect=[100.0, 108.0]), patch('builtins.print'):
+            self.assertTrue(self.backend.warmup('llama3.2-vision'))
+        warmup_call = self.backend.client.generate.call_args.kwargs
+        self.assertEqual(len(warmup_call['images']), 1)
+        self.assertEqual(warmup_call['options'], {'num_predict': 1})
+
+        with patch('ollama_backend.time.time', side_effect=[200.0, 201.5]):
+            self.backend.generate(model='llama3.2-vision', prompt='hi')
+        stats = self.backend.stats()
+        self.assertEqual(stats['cold_latency'], 8.0)
+        self.assertFalse(stats['was_loaded'])
+        self.assertEqual(stats['warm_median'], 1.5)
+
+    def test_warmup_reports_missing_model(self):
+        self.backend.client.generate.side_effect = ollama.ResponseError('model not found', 404)
+        with patch('builtins.print') as mock_print:
+            self.assertFalse(self.backend.warmup('missing-model'))
+        self.assertIn('ollama pull missing-model', mock_print.call_args.args[0])
+
+if __name__ == "__main__":
+    unittest.main()
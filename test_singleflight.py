@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Tests for coalescing identical in-flight requests
+"""
+import asyncio
+import threading
+import time
+import unittest
+
+import numpy as np
+
+from singleflight import SingleFlight, request_key
+
+
+def in_threads(count, target):
+    results = [None] * count
+
+    def run(i):
+        results[i] = target()
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    return results
+
+
+class TestRequestKey(unittest.TestCase):
+    def test_same_request_same_key(self):
+        frame = np.zeros((4, 4, 3), np.uint8)
+        self.assertEqual(
+            request_key(model='m', prompt='p', images=[frame], options={'num_predict': 10, 'temperature': 0.3}),
+            request_key(model='m', prompt='p', images=[frame.copy()], options={'temperature': 0.3, 'num_predict': 10}),
+        )
+
+    def test_any_difference_changes_the_key(self):
+        base = dict(model='m', prompt='p', images=[b'jpeg'], options={'num_predict': 10})
+        key = request_key(**base)
+        self.assertNotEqual(key, request_key(**dict(base, model='other')))
+        self.assertNotEqual(key, request_key(**dict(base, prompt='other')))
+        self.assertNotEqual(key, request_key(**dict(base, images=[b'other jpeg'])))
+        self.assertNotEqual(key, request_key(**dict(base, options={'num_predict': 20})))
+        self.assertNotEqual(key, request_key(**dict(base, stream=True)))
+
+
+class TestSingleFlight(unittest.TestCase):
+    def test_overlapping_calls_share_one_run(self):
+        flights = SingleFlight()
+        calls = []
+
+        def slow():
+            calls.append(1)
+            time.sleep(0.2)
+            return {'response': "A desk"}
+
+        results = in_threads(3, lambda: flights.do('key', slow))
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [{'response': "A desk"}] * 3)
+        self.assertEqual(flights.stats(), {'calls': 3, 'coalesced': 2, 'in_flight': 0})
+
+        # Once it has finished, the same request runs again
+        flights.do('key', slow)
+        self.assertEqual(len(calls), 2)
+
+    def test_error_reaches_everyone_sharing_the_call(self):
+        flights = SingleFlight()
+
+        def fail():
+            time.sleep(0.1)
+            raise ConnectionError("ollama down")
+
+        def call():
+            try:
+                flights.do('key', fail)
+            except ConnectionError as e:
+                return str(e)
+
+        self.assertEqual(in_threads(2, call), ["ollama down"] * 2)
+
+    def test_late_joiner_gets_the_whole_stream(self):
+        flights = SingleFlight()
+        second_chunk = threading.Event()
+        calls = []
+
+        def stream():
+            calls.append(1)
+            yield 'A '
+            second_chunk.wait(2)
+            yield 'desk'
+
+        first = flights.stream('key', stream)
+        self.assertEqual(next(first), 'A ')
+        second = flights.stream('key', stream)
+        self.assertTrue(flights.shared())
+        second_chunk.set()
+
+        self.assertEqual(''.join(second), 'A desk')
+        self.assertEqual(''.join(first), 'desk')
+        self.assertEqual(len(calls), 1)
+
+    def test_stream_finishes_for_joiners_when_starter_stops_reading(self):
+        flights = SingleFlight()
+        joined = threading.Event()
+
+        def stream():
+            yield 'A '
+            joined.wait(2)
+            yield 'desk'
+
+        first = flights.stream('key', stream)
+        second = flights.stream('key', lambda: iter(['never used']))
+        joined.set()
+        first.close()
+        self.assertEqual(''.join(second), 'A desk')
+
+    def test_coroutines_share_a_task(self):
+        flights = SingleFlight()
+        calls = []
+
+        async def slow():
+            calls.append(1)
+            await asyncio.sleep(0.1)
+            return 'A desk'
+
+        async def three_callers():
+            return await asyncio.gather(*(flights.ado('key', slow) for _ in range(3)))
+
+        self.assertEqual(asyncio.run(three_callers()), ['A desk'] * 3)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(flights.stats(), {'calls': 3, 'coalesced': 2, 'in_flight': 0})
+
+    def test_caller_giving_up_does_not_cancel_the_others(self):
+        flights = SingleFlight()
+
+        async def slow():
+            await asyncio.sleep(0.1)
+            return 'A desk'
+
+        async def one_times_out():
+            impatient = asyncio.wait_for(flights.ado('key', slow), 0.01)
+            return await asyncio.gather(impatient, flights.ado('key', slow), return_exceptions=True)
+
+        impatient, patient = asyncio.run(one_times_out())
+        self.assertIsInstance(impatient, asyncio.TimeoutError)
+        self.assertEqual(patient, 'A desk')
+
+    def test_task_is_cancelled_once_every_caller_gives_up(self):
+        flights = SingleFlight()
+        finished = []
+
+        async def slow():
+            await asyncio.sleep(0.1)
+            finished.append(1)
+
+        async def times_out():
+            with self.assertRaises(asyncio.TimeoutError):
+                await asyncio.wait_for(flights.ado('key', slow), 0.01)
+            await asyncio.sleep(0.2)
+
+        asyncio.run(times_out())
+        self.assertEqual(finished, [])
+        self.assertEqual(flights.stats()['in_flight'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Tests for speech recognition backends and the background recognition worker
+"""
+import importlib.util
+import threading
+import time
+import unittest
+
+import speech_recognition as sr
+
+from benchmark import benchmark_speech, load_speech_audio
+from metrics import MetricsRegistry
+from speech_backends import GoogleBackend, RecognitionWorker, SpeechBackend, SphinxBackend, VoskBackend, \
+    create_speech_backend
+
+
+class ScriptedBackend(SpeechBackend):
+    """Returns scripted results, taking `delay` seconds per phrase"""
+
+    name = 'scripted'
+
+    def __init__(self, delay=0.0):
+        super().__init__()
+        self.delay = delay
+
+    def recognize(self, audio):
+        time.sleep(self.delay)
+        if audio == 'mumble':
+            raise sr.UnknownValueError()
+        if audio == 'broken':
+            raise sr.RequestError("engine crashed")
+        return audio
+
+
+class TestRecognitionWorker(unittest.TestCase):
+    def test_slow_recognition_does_not_block_capture(self):
+        heard = []
+        worker = RecognitionWorker(ScriptedBackend(delay=0.1), heard.append, MetricsRegistry())
+        started = time.monotonic()
+        for phrase in ('hello', 'what do you see', 'thanks'):
+            worker.submit(phrase)
+        self.assertLess(time.monotonic() - started, 0.05)
+
+        worker.join()
+        worker.stop()
+        self.assertEqual(heard, ['hello', 'what do you see', 'thanks'])
+        self.assertEqual(worker.metrics.histograms['stage_seconds'][(('stage', 'recognize'),)].count, 3)
+
+    def test_unintelligible_and_failed_phrases_are_counted(self):
+        heard = []
+        worker = RecognitionWorker(ScriptedBackend(), heard.append)
+        for phrase in ('mumble', 'broken', 'hello'):
+            worker.submit(phrase)
+        worker.join()
+        worker.stop()
+        self.assertEqual(heard, ['hello'])
+        self.assertEqual((worker.recognized, worker.unintelligible, worker.failed), (1, 1, 1))
+        self.assertFalse(any(thread.is_alive() for thread in worker.threads))
+
+    def test_transcripts_arrive_in_capture_order(self):
+        backend = ScriptedBackend()
+        delays = {'first': 0.15, 'second': 0.0, 'third': 0.05}
+        backend.recognize = lambda audio: time.sleep(delays[audio]) or audio
+        heard = []
+        worker = RecognitionWorker(backend, heard.append, workers=3)
+        for phrase in delays:
+            worker.submit(phrase)
+        self.assertTrue(worker.join(timeout=2))
+        worker.stop()
+        self.assertEqual(heard, ['first', 'second', 'third'])
+
+    def test_backlog_drops_oldest_waiting_phrase(self):
+        heard = []
+        metrics = MetricsRegistry()
+        worker = RecognitionWorker(ScriptedBackend(delay=0.1), heard.append, metrics, workers=1, max_pending=1)
+        for phrase in ('one', 'two', 'three', 'four'):
+            worker.submit(phrase)
+            time.sleep(0.01)  # 'one' is picked up straight away, the rest queue behind it
+        worker.join(timeout=2)
+        worker.stop()
+
+        self.assertEqual(heard, ['one', 'four'])
+        stats = worker.stats()
+        self.assertEqual((stats['submitted'], stats['dropped'], stats['recognized']), (4, 2, 2))
+        self.assertEqual(metrics.counters['speech_segments_total'][(('outcome', 'dropped'),)].value, 2)
+
+    def test_blocking_overflow_applies_backpressure(self):
+        heard = []
+        worker = RecognitionWorker(ScriptedBackend(delay=0.05), heard.append, workers=1, max_pending=1,
+                                   overflow='block')
+        started = time.monotonic()
+        for phrase in ('one', 'two', 'three'):
+            worker.submit(phrase)
+        self.assertGreaterEqual(time.monotonic() - started, 0.04)  # Waited for 'one' to finish
+        worker.join(timeout=2)
+        worker.stop()
+        self.assertEqual(heard, ['one', 'two', 'three'])
+        self.assertEqual(worker.dropped, 0)
+
+
+class TestSpeechBackends(unittest.TestCase):
+    def test_load_runs_once(self):
+        calls = []
+        backend = ScriptedBackend()
+        backend._load = lambda: calls.append(1)
+        backend.load().load()
+        self.assertEqual(calls, [1])
+        self.assertTrue(backend.loaded)
+
+    def test_missing_local_engine_falls_back_to_google_only_when_allowed(self):
+        try:
+            backend = create_speech_backend('vosk', fallback='none')
+        except sr.RequestError as e:
+            self.assertIn('SPEECH_FALLBACK', str(e))
+        else:
+            self.assertIsInstance(backend, VoskBackend)
+            self.skipTest("A Vosk model is installed here")
+
+        self.assertIsInstance(create_speech_backend('vosk', fallback='google'), GoogleBackend)
+        with self.assertRaises(ValueError):
+            create_speech_backend('whisper-large')
+
+    def test_missing_vosk_model_is_a_request_error(self):
+        with self.assertRaises(sr.RequestError):
+            VoskBackend(model_path='/nonexistent/vosk-model').load()
+
+    @unittest.skipUnless(importlib.util.find_spec('pocketsphinx'), "pocketsphinx is not installed")
+    def test_sphinx_decoder_is_reused(self):
+        backend = SphinxBackend().load()
+        decoder = backend.decoder
+        audio = load_speech_audio(seconds=0.5)
+        threads = [threading.Thread(target=self.recognize_quietly, args=(backend, audio)) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertIs(backend.decoder, decoder)
+
+    @staticmethod
+    def recognize_quietly(backend, audio):
+        try:
+            backend.recognize(audio)
+        except sr.UnknownValueError:
+            pass
+
+    def test_benchmark_reports_unavailable_backends(self):
+        results = benchmark_speech(['vosk'], load_speech_audio(seconds=0.5), iterations=1)
+        if 'skipped' not in results[0]:
+            self.skipTest("A Vosk model is installed here")
+        self.assertEqual(results[0]['backend'], 'vosk')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Tests for lazy imports and the startup-time budget
+"""
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+import cv2
+import numpy as np
+
+from camera_sources import open_camera
+from lazy_import import LazyModule, lazy_import
+from metrics import MetricsRegistry
+from startup import ComponentInitializer
+from startup_profile import STARTUP_BUDGET, parse_importtime, summarize
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+HEAVY = ('cv2', 'numpy', 'ollama', 'pyttsx3', 'PIL', 'speech_recognition')
+
+
+def run_python(*args):
+    return subprocess.run([sys.executable, *args], cwd=HERE, capture_output=True, text=True, timeout=60)
+
+
+class TestLazyImport(unittest.TestCase):
+    def test_module_loads_on_first_use(self):
+        module = LazyModule('json')
+        self.assertFalse(module.loaded)
+        self.assertEqual(module.dumps([1]), '[1]')
+        self.assertTrue(module.loaded)
+
+    def test_patching_goes_through_to_the_real_module(self):
+        module = LazyModule('json')
+        with mock.patch.object(module, 'dumps', return_value='patched'):
+            import json
+            self.assertEqual(json.dumps([1]), 'patched')
+        self.assertEqual(module.dumps([1]), '[1]')
+
+    def test_already_imported_module_is_returned_as_is(self):
+        self.assertIs(lazy_import('os'), os)
+
+
+class TestColdStart(unittest.TestCase):
+    def test_heavy_dependencies_wait_for_first_use(self):
+        result = run_python('-c', "import sys, ai_eye_assistant, ai_eye_speech_assistant, minimal_assistant; "
+                                  f"print(','.join(m for m in {HEAVY!r} if m in sys.modules))")
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.strip(), '')
+
+    def test_cold_start_within_budget(self):
+        # Best of three, so a busy machine doesn't fail the test
+        seconds = []
+        for _ in range(3):
+            result = run_python('-X', 'importtime', '-c', 'import ai_eye_speech_assistant')
+            self.assertEqual(result.returncode, 0, result.stderr)
+            records, _, _ = parse_importtime(result.stderr.splitlines())
+            seconds.append(next(r['cumulative'] for r in records if r['module'] == 'ai_eye_speech_assistant'))
+        self.assertLess(min(seconds), STARTUP_BUDGET)
+
+
+class TestStartupProfile(unittest.TestCase):
+    def test_imports_are_split_by_phase_and_package(self):
+        stderr = [
+            "import time: self [us] | cumulative | imported package",
+            "import time:       500 |        500 |   json.decoder",
+            "import time:      1000 |       1500 | json",
+            "startup-phase: init 12.5",
+            "import time:     30000 |      30000 |     ollama._types",
+            "import time:     10000 |      40000 |   ollama",
+            "Traceback (most recent call last):",
+            "startup-phase: ready 13.0",
+            "import time:      2000 |       2000 | atexit_helper",
+        ]
+        records, marks, other = parse_importtime(stderr)
+        self.assertEqual(marks, {'init': 12.5, 'ready': 13.0})
+        self.assertEqual(other, ["Traceback (most recent call last):"])
+        self.assertEqual(records[0]['depth'], 1)
+
+        summary = summarize([r for r in records if r['phase'] != 'ready'])
+        self.assertAlmostEqual(summary['phases']['import'], 0.0015)
+        self.assertAlmostEqual(summary['phases']['init'], 0.04)
+        slowest = summary['packages'][0]
+        self.assertEqual((slowest['package'], slowest['modules'], slowest['phase']), ('ollama', 2, 'init'))
+
+
+class TestComponentInitializer(unittest.TestCase):
+    def test_components_start_concurrently(self):
+        metrics = MetricsRegistry()
+        initializer = ComponentInitializer(metrics)
+        for name in ('Camera', 'Microphone', 'Speech output'):
+            initializer.add(name, lambda: time.sleep(0.2) or 'up', timeout=2)
+        started = time.monotonic()
+        with mock.patch('builtins.print'):
+            components = initializer.run()
+        self.assertLess(time.monotonic() - started, 0.5)
+        self.assertTrue(all(c.ready and c.result == 'up' for c in components.values()))
+        self.assertEqual(metrics.histograms['stage_seconds'][(('stage', 'startup_speech_output'),)].count, 1)
+
+    def test_failed_and_slow_components_fall_back(self):
+        fallbacks, released = [], threading.Event()
+
+        def broken():
+            raise RuntimeError("no camera")
+
+        initializer = ComponentInitializer()
+        initializer.add('Camera', broken, timeout=1, fallback=fallbacks.append)
+        initializer.add('Microphone', lambda: time.sleep(0.3) or 'mic', timeout=0.1, fallback=fallbacks.append,
+                        late=lambda result: released.set())
+        with mock.patch('builtins.print'):
+            components = initializer.run()
+            self.assertTrue(released.wait(1))  # The late result is handed back for cleanup
+
+        self.assertEqual((components['Camera'].state, components['Microphone'].state), ('failed', 'timed out'))
+        self.assertTrue(components['Camera'].exited.is_set())
+        self.assertIsInstance(fallbacks[0], RuntimeError)
+        self.assertIsInstance(fallbacks[1], TimeoutError)
+
+    def test_timed_out_component_reports_when_it_really_exits(self):
+        calibrated = threading.Event()
+        initializer = ComponentInitializer()
+        initializer.add('Microphone', lambda: calibrated.wait(1), timeout=0.05)
+        with mock.patch('builtins.print'):
+            microphone = initializer.run()['Microphone']
+        self.assertTrue(microphone.done.is_set())
+        self.assertFalse(microphone.exited.is_set())  # Still holding the microphone
+        calibrated.set()
+        self.assertTrue(microphone.exited.wait(1))
+
+    def test_background_components_do_not_hold_up_startup(self):
+        loaded = threading.Event()
+        initializer = ComponentInitializer()
+        initializer.add('Model', lambda: loaded.wait(1), timeout=2, background=True)
+        started = time.monotonic()
+        with mock.patch('builtins.print'):
+            components = initializer.run()
+            self.assertLess(time.monotonic() - started, 0.2)
+            self.assertEqual(components['Model'].state, 'pending')
+            loaded.set()
+            self.assertTrue(components['Model'].done.wait(1))
+        self.assertTrue(components['Model'].ready)
+
+
+class TestOpenCamera(unittest.TestCase):
+    def test_first_frame_comes_with_the_capture(self):
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp)
+        path = os.path.join(tmp, 'clip.avi')
+        writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'MJPG'), 10, (64, 48))
+        for _ in range(3):
+            writer.write(np.full((48, 64, 3), 128, np.uint8))
+        writer.release()
+
+        cap, frame = open_camera(path)
+        cap.release()
+        self.assertEqual(frame.shape[:2], (48, 64))
+        with self.assertRaises(RuntimeError):
+            open_camera(os.path.join(tmp, 'missing.avi'))
+
+
+if __name__ == '__main__':
+    unittest.main()
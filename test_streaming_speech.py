@@ -0,0 +1,52 @@
+import unittest
+from streaming_speech import StreamingSpeechParser, clean_for_speech
+
+ANALYSIS = """
+🎬 Scene: A desk with a laptop. The lighting is warm.
+👤 Currently: Typing on the keyboard.
+🔮 Next Action: Reach for the coffee mug.
+💡 I Notice: A plant on the left.
+"""
+
+class TestStreamingSpeechParser(unittest.TestCase):
+    def feed_in_chunks(self, parser, text, size=3):
+        for i in range(0, len(text), size):
+            parser.feed(text[i:i + size])
+        return parser.finish()
+
+    def test_sentences_spoken_per_section(self):
+        spoken = []
+        parser = StreamingSpeechParser(spoken.append)
+        full_text = self.feed_in_chunks(parser, ANALYSIS)
+        self.assertEqual(full_text, ANALYSIS)
+        self.assertEqual(spoken, [
+            "I can see a desk with a laptop.",
+            "The lighting is warm.",
+            "You're currently typing on the keyboard.",
+            "I predict you'll reach for the coffee mug.",
+        ])
+
+    def test_first_sentence_emitted_before_stream_ends(self):
+        """The first sentence must reach TTS while the rest is still generating"""
+        spoken = []
+        parser = StreamingSpeechParser(spoken.append)
+        parser.feed("🎬 Scene: A desk with a laptop. The ")
+        self.assertEqual(spoken, ["I can see a desk with a laptop."])
+
+    def test_plain_conversation(self):
+        spoken = []
+        parser = StreamingSpeechParser(spoken.append, sectioned=False)
+        self.feed_in_chunks(parser, "Hello there! I can see you at your desk. Nice setup", size=5)
+        self.assertEqual(spoken, ["Hello there!", "I can see you at your desk.", "Nice setup"])
+
+    def test_fallback_when_no_sections(self):
+        spoken = []
+        parser = StreamingSpeechParser(spoken.append)
+        self.feed_in_chunks(parser, "Something unexpected")
+        self.assertEqual(spoken, ["I'm analyzing what I see."])
+
+    def test_clean_for_speech(self):
+        self.assertEqual(clean_for_speech(" 🔮 **[Reach for the mug]** "), "Reach for the mug")
+
+if __name__ == "__main__":
+    unittest.main()
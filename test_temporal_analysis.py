@@ -0,0 +1,98 @@
+import unittest
+import numpy as np
+from PIL import Image
+from temporal_analysis import FrameHistory, MosaicBuilder, build_mosaic, frame_labels, mosaic_prompt, temporal_prompt
+
+def solid(value):
+    return np.full((48, 64, 3), value, np.uint8)
+
+class TestFrameHistory(unittest.TestCase):
+    def test_window_ends_with_current_frame(self):
+        history = FrameHistory(size=3, min_interval=0)
+        for i, value in enumerate((10, 20, 30, 40)):
+            history.add(solid(value), timestamp=i)
+        frames = history.frames()
+        self.assertEqual([int(f.image[0, 0, 0]) for f in frames], [20, 30, 40])
+        self.assertEqual(history.span(), 2)
+        self.assertEqual(len(history), 3)
+
+    def test_frames_are_copied(self):
+        history = FrameHistory(size=2, min_interval=0)
+        buffer = solid(10)
+        history.add(buffer, timestamp=0)
+        buffer[:] = 99  # Capture loops reuse their frame buffer
+        history.add(buffer, timestamp=1)
+        self.assertEqual([int(f.image[0, 0, 0]) for f in history.frames()], [10, 99])
+
+    def test_min_interval_spaces_out_the_window(self):
+        history = FrameHistory(size=3, min_interval=1.0)
+        for i in range(6):
+            history.add(solid(i * 10), timestamp=i * 0.25)
+        timestamps = [f.timestamp for f in history.frames()]
+        self.assertEqual(timestamps, [0.0, 1.0, 1.25])
+
+    def test_keyframes_skip_a_still_scene(self):
+        history = FrameHistory(size=4, selection='keyframes', min_interval=0, keyframe_threshold=8)
+        for i, value in enumerate((10, 11, 12, 13, 100, 101)):
+            history.add(solid(value), timestamp=i)
+        # 11-13 barely differ from 10, so only the jump to 100 becomes a new keyframe
+        self.assertEqual([int(f.image[0, 0, 0]) for f in history.frames()], [10, 100, 101])
+
+    def test_single_frame_window(self):
+        history = FrameHistory(size=1)
+        history.add(solid(1), timestamp=0)
+        history.add(solid(2), timestamp=5)
+        self.assertEqual(len(history.frames()), 1)
+
+class TestTemporalPrompt(unittest.TestCase):
+    def test_labels_are_relative_to_now(self):
+        history = FrameHistory(size=3, min_interval=0)
+        for t in (0, 3, 6):
+            history.add(solid(t), timestamp=t)
+        self.assertEqual(frame_labels(history.frames()), ['t-6s', 't-3s', 'now'])
+
+    def test_prompt_describes_the_window(self):
+        prompt = temporal_prompt(4, 6.2)
+        self.assertIn("4 images", prompt)
+        self.assertIn("last 6 seconds", prompt)
+        self.assertIn("Next Action:", prompt)
+
+class TestMosaic(unittest.TestCase):
+    def test_layout_fits_pixel_budget(self):
+        builder = MosaicBuilder(pixel_budget=640 * 480)
+        columns, rows, tile_width, tile_height = builder.layout(4, 640, 480)
+        self.assertEqual((columns, rows), (2, 2))
+        self.assertEqual((tile_width, tile_height), (320, 240))
+        self.assertEqual(builder.layout(5, 640, 480)[:2], (3, 2))
+
+    def test_mosaic_tiles_frames_in_order(self):
+        frames = [solid(value) for value in (40, 80, 120, 160)]
+        mosaic = build_mosaic(frames, pixel_budget=64 * 48, columns=2)
+        self.assertEqual(mosaic.shape, (2 * 24 + 4, 2 * 32 + 4, 3))
+        # Sample the bottom-right corner of each tile, below the label
+        corners = [mosaic[22, 30], mosaic[22, 66], mosaic[50, 30], mosaic[50, 66]]
+        self.assertEqual([int(c[0]) for c in corners], [40, 80, 120, 160])
+
+    def test_tiles_are_labelled(self):
+        mosaic = build_mosaic([solid(0), solid(0)], pixel_budget=2 * 320 * 240)
+        self.assertGreater(mosaic.max(), 0, "Time labels should be drawn onto the tiles")
+
+    def test_old_tiles_are_reused(self):
+        history = FrameHistory(size=3, min_interval=0)
+        builder = MosaicBuilder(pixel_budget=3 * 32 * 24)
+        for i in range(3):
+            history.add(solid(i * 50), timestamp=i)
+        builder.build(history.frames())
+        first_tile = history.frames()[0].tile
+        builder.build(history.frames())
+        self.assertIs(history.frames()[0].tile, first_tile)
+
+    def test_accepts_pil_images(self):
+        mosaic = build_mosaic([Image.new('RGB', (64, 48), (255, 0, 0))] * 2, pixel_budget=2 * 64 * 48)
+        self.assertEqual(tuple(int(v) for v in mosaic[40, 60]), (0, 0, 255))
+
+    def test_mosaic_prompt(self):
+        self.assertIn("grid of 4 numbered frames", mosaic_prompt(4, 3))
+
+if __name__ == "__main__":
+    unittest.main()
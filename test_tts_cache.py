@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Tests for the synthesized-audio cache and its use by the TTS worker
+"""
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+
+from metrics import MetricsRegistry
+from tts_cache import TMP_SUFFIX, TTSCache
+from tts_worker import TTSBackend, TTSWorker
+
+
+class RenderingBackend(TTSBackend):
+    """Speaks instantly and renders fake WAV files, recording both"""
+
+    name = 'rendering'
+
+    def __init__(self):
+        self.spoken = []
+        self.rendered = []
+        self.render_threads = set()
+
+    def speak(self, text):
+        self.spoken.append(text)
+        return True
+
+    def render(self, text, path):
+        self.render_threads.add(threading.get_ident())
+        self.rendered.append(text)
+        with open(path, 'wb') as f:
+            f.write(b'RIFF' + text.encode())
+
+
+class RecordingPlayer:
+    """Stands in for ClipPlayer: remembers which clips were played"""
+
+    def __init__(self):
+        self.played = []
+
+    def play(self, path):
+        with open(path, 'rb') as f:
+            self.played.append(f.read()[4:].decode())
+        return True
+
+    def stop(self):
+        pass
+
+
+def wait_for(condition, timeout=2):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+class TestTTSCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def write(self, text, path):
+        with open(path, 'wb') as f:
+            f.write(b'x' * 100)
+
+    def test_key_depends_on_text_and_voice_only(self):
+        cache = TTSCache(self.directory)
+        self.assertEqual(cache.key("Observation  complete.", 'say@175'), cache.key("Observation complete.", 'say@175'))
+        self.assertNotEqual(cache.key("Observation complete.", 'say@175'), cache.key("Observation complete.", 'say@200'))
+
+        path = cache.render("Observation complete.", 'say@175', self.write)
+        self.assertEqual(cache.get("Observation complete.", 'say@175'), path)
+        self.assertIsNone(cache.get("Observation complete.", 'espeak@175'))
+        self.assertEqual(TTSCache(self.directory).get("Observation complete.", 'say@175'), path)
+
+    def test_least_recently_played_clip_is_evicted(self):
+        cache = TTSCache(self.directory, max_bytes=250)
+        first = cache.render("first", 'v', self.write)
+        cache.render("second", 'v', self.write)
+        cache.get("first", 'v')
+        cache.render("third", 'v', self.write)
+
+        self.assertTrue(os.path.exists(first))
+        self.assertIsNone(cache.get("second", 'v'))
+        self.assertEqual(len(os.listdir(self.directory)), 2)
+        self.assertEqual(cache.stats()['evictions'], 1)
+
+    def test_failed_render_leaves_nothing_behind(self):
+        cache = TTSCache(self.directory)
+
+        def fail(text, path):
+            with open(path, 'wb') as f:
+                f.write(b'partial')
+            raise RuntimeError("engine crashed")
+
+        with self.assertRaises(RuntimeError):
+            cache.render("Hello", 'v', fail)
+        self.assertEqual(os.listdir(self.directory), [])
+        self.assertIsNone(cache.get("Hello", 'v'))
+
+    def test_clip_half_rendered_before_a_crash_is_discarded(self):
+        clip = TTSCache(self.directory).render("Hello", 'v', self.write)
+        with open(clip + TMP_SUFFIX, 'wb') as f:
+            f.write(b'partial')
+
+        cache = TTSCache(self.directory)
+        self.assertEqual(cache.stats()['clips'], 1)
+        self.assertEqual(os.listdir(self.directory), [os.path.basename(clip)])
+
+
+class TestCachedSpeech(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.cache = TTSCache(directory)
+        self.backend = RenderingBackend()
+        self.player = RecordingPlayer()
+        self.metrics = MetricsRegistry()
+        self.worker = TTSWorker(self.backend, self.metrics, cache=self.cache, player=self.player).start()
+        self.addCleanup(self.worker.stop)
+
+    def test_prerendered_phrases_play_from_the_cache(self):
+        self.worker.prerender(["Observation complete.", "I'm analyzing what I see."])
+        self.assertTrue(wait_for(lambda: len(self.cache.entries) == 2))
+        self.assertEqual(self.backend.render_threads, {self.worker.thread.ident})
+
+        self.worker.say("Observation complete.")
+        self.assertTrue(self.worker.join(timeout=2))
+        self.assertEqual(self.player.played, ["Observation complete."])
+        self.assertEqual(self.backend.spoken, [])
+        self.assertEqual(self.metrics.counters['tts_cache_total'][(('result', 'hit'),)].value, 1)
+
+    def test_phrase_is_cached_once_it_repeats(self):
+        for _ in range(2):
+            self.worker.say("Hello! I'm doing well.")
+            self.assertTrue(self.worker.join(timeout=2))
+        self.worker.say("A one-off description")
+        self.assertTrue(self.worker.join(timeout=2))
+        self.assertTrue(wait_for(lambda: self.backend.rendered))
+
+        self.worker.say("Hello! I'm doing well.")
+        self.assertTrue(self.worker.join(timeout=2))
+        self.assertEqual(self.backend.rendered, ["Hello! I'm doing well."])
+        self.assertEqual(self.backend.spoken, ["Hello! I'm doing well."] * 2 + ["A one-off description"])
+        self.assertEqual(self.player.played, ["Hello! I'm doing well."])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Tests for the single-owner TTS worker and its backends
+"""
+import os
+import select
+import shutil
+import stat
+import subprocess
+import tempfile
+import threading
+import time
+import unittest
+
+from metrics import MetricsRegistry
+from tts_worker import REPLY, EspeakBackend, TTSBackend, TTSWorker
+
+
+class ScriptedBackend(TTSBackend):
+    """Records what it says; each utterance takes `delay` seconds unless interrupted"""
+
+    name = 'scripted'
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.spoken = []
+        self.interrupted = threading.Event()
+        self.speaking = 0
+        self.max_speaking = 0
+        self.threads = set()
+
+    def start(self):
+        self.threads.add(threading.get_ident())
+
+    def speak(self, text):
+        self.threads.add(threading.get_ident())
+        self.speaking += 1
+        self.max_speaking = max(self.max_speaking, self.speaking)
+        self.interrupted.clear()
+        finished = not self.interrupted.wait(self.delay)
+        self.speaking -= 1
+        self.spoken.append(text if finished else f"{text} [interrupted]")
+        return finished
+
+    def stop(self):
+        self.interrupted.set()
+
+
+class TestTTSWorker(unittest.TestCase):
+    def start_worker(self, backend, **kwargs):
+        worker = TTSWorker(backend, **kwargs).start()
+        self.addCleanup(worker.stop)
+        return worker
+
+    def test_one_engine_thread_speaks_everything_in_order(self):
+        backend = ScriptedBackend(delay=0.02)
+        worker = self.start_worker(backend)
+        speak = worker.stream()
+        for sentence in ("I can see a desk.", "You're typing.", "I predict you'll stop."):
+            speak(sentence)
+        self.assertTrue(worker.join(timeout=2))
+        self.assertEqual(backend.spoken, ["I can see a desk.", "You're typing.", "I predict you'll stop."])
+        self.assertEqual(backend.max_speaking, 1)
+        self.assertEqual(len(backend.threads), 1)
+        self.assertNotIn(threading.get_ident(), backend.threads)
+
+    def test_reply_interrupts_narration(self):
+        backend = ScriptedBackend(delay=1.0)
+        metrics = MetricsRegistry()
+        worker = self.start_worker(backend, metrics=metrics)
+        worker.say("A long description of the room")
+        time.sleep(0.05)
+        worker.say("Some older narration")
+        worker.say("Hello! I'm doing well.", REPLY)
+        backend.delay = 0.0
+        self.assertTrue(worker.join(timeout=2))
+
+        self.assertEqual(backend.spoken, ["A long description of the room [interrupted]", "Hello! I'm doing well."])
+        self.assertEqual(metrics.counters['tts_utterances_total'][(('outcome', 'interrupted'),)].value, 1)
+        self.assertEqual(worker.stats()['coalesced'], 1)
+
+    def test_late_interrupt_spares_the_reply(self):
+        backend = ScriptedBackend(delay=0.2)
+        worker = self.start_worker(backend)
+        worker.say("A short description")
+        time.sleep(0.05)
+        narration = worker.current
+        self.assertTrue(worker.join(timeout=2))  # The narration ends before the interrupt lands...
+        worker.say("Hello! I'm doing well.", REPLY)
+        time.sleep(0.05)
+        worker.interrupt(narration)  # ...which then must not cut off the reply
+        self.assertTrue(worker.join(timeout=2))
+        self.assertEqual(backend.spoken, ["A short description", "Hello! I'm doing well."])
+
+    def test_newest_narration_replaces_queued_narration(self):
+        backend = ScriptedBackend(delay=0.1)
+        worker = self.start_worker(backend)
+        worker.say("First observation")
+        time.sleep(0.02)
+        older, newer = worker.stream(), worker.stream()
+        older("Second observation.")
+        older("Still the second.")
+        newer("Third observation.")
+        newer("Still the third.")
+        self.assertTrue(worker.join(timeout=2))
+        self.assertEqual(backend.spoken, ["First observation", "Third observation.", "Still the third."])
+        self.assertEqual(worker.stats()['coalesced'], 2)
+
+    def test_stale_narration_is_skipped_but_replies_are_not(self):
+        backend = ScriptedBackend(delay=0.15)
+        worker = self.start_worker(backend, stale_after=0.05)
+        worker.say("Busy", REPLY)
+        time.sleep(0.02)
+        worker.say("The answer is four.", REPLY)
+        worker.say("Old news.")
+        self.assertTrue(worker.join(timeout=2))
+        self.assertEqual(backend.spoken, ["Busy", "The answer is four."])
+        self.assertEqual(worker.stats()['stale'], 1)
+
+    def test_queue_is_bounded(self):
+        backend = ScriptedBackend(delay=0.1)
+        worker = self.start_worker(backend, max_pending=2)
+        worker.say("Busy", REPLY)
+        time.sleep(0.02)
+        for number in range(4):
+            worker.say(f"Reply {number}", REPLY)
+        self.assertTrue(worker.join(timeout=2))
+        self.assertEqual(backend.spoken, ["Busy", "Reply 0", "Reply 1"])
+        self.assertEqual(worker.stats()['dropped'], 2)
+
+    def test_engine_start_failure_is_raised(self):
+        class Broken(TTSBackend):
+            def start(self):
+                raise RuntimeError("no audio device")
+
+        with self.assertRaises(RuntimeError):
+            TTSWorker(Broken()).start()
+
+
+class TestEspeakBackend(unittest.TestCase):
+    def test_one_process_serves_every_utterance(self):
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp)
+        log = os.path.join(tmp, 'spoken.txt')
+        script = os.path.join(tmp, 'espeak-ng')
+        with open(script, 'w') as f:
+            f.write(f"#!/bin/sh\necho started >> {log}\nexec cat >> {log}\n")
+        os.chmod(script, os.stat(script).st_mode | stat.S_IEXEC)
+
+        backend = EspeakBackend(rate=60000)
+        backend.command = script
+        backend.spawn()
+        first = backend.process
+        self.assertTrue(backend.speak("Hello there."))
+        self.assertTrue(backend.speak("What a\nnice   day."))
+        self.assertIs(backend.process, first)
+
+        backend.stop()  # Interrupting drops the process; the next utterance starts a new one
+        self.assertTrue(backend.speak("Back again."))
+        backend.close()
+        with open(log) as f:
+            lines = f.read().splitlines()
+        self.assertEqual(lines, ["started", "Hello there.", "What a nice day.", "started", "Back again."])
+
+    @unittest.skipUnless(shutil.which('espeak-ng'), "espeak-ng not installed")
+    def test_real_espeak_speaks_each_line_before_stdin_closes(self):
+        backend = EspeakBackend()
+        backend.command = shutil.which('espeak-ng')
+        # Same command line as the live process, with the audio sent to a pipe instead of the sound card
+        process = subprocess.Popen(backend.arguments() + ['--stdout'], stdin=subprocess.PIPE,
+                                   stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        self.addCleanup(process.kill)
+        process.stdin.write(b"Hello there.\n")
+        process.stdin.flush()
+
+        # More than a WAV header (which may be written up front) means the line was synthesized
+        audio = b''
+        deadline = time.monotonic() + 5
+        while len(audio) <= 1024 and time.monotonic() < deadline:
+            readable, _, _ = select.select([process.stdout], [], [], 0.1)
+            if readable:
+                audio += os.read(process.stdout.fileno(), 4096)
+        self.assertGreater(len(audio), 1024, "espeak-ng said nothing while stdin was still open")
+        process.stdin.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
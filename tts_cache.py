@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Synthesized-audio cache
+
+Plenty of what the assistant says repeats word for word ("Observation
+complete.", "I'm analyzing what I see.", fallback replies). TTSCache keeps
+WAV renderings of such phrases on disk, named by a hash of the voice and the
+text, so a repeated phrase plays straight from the file with no synthesis
+delay. The directory is capped at TTS_CACHE_MB; the least recently played
+clips are deleted first.
+
+A phrase is rendered once it has been spoken twice (one-off narration never
+touches the disk), or up front for the fixed phrases passed to
+TTSWorker.prerender(). Rendering is done by the TTS worker when it has
+nothing to say, on the thread that owns the engine.
+"""
+import hashlib
+import os
+import shutil
+import subprocess
+import threading
+from collections import OrderedDict
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+TTS_CACHE = os.getenv('TTS_CACHE', 'true').lower() == 'true'
+TTS_CACHE_DIR = os.getenv('TTS_CACHE_DIR', '.tts_cache')
+TTS_CACHE_MB = float(os.getenv('TTS_CACHE_MB', 50))  # Disk space for cached clips
+
+# Clips are rendered under this suffix and renamed once complete (still .wav for renderers that go by extension)
+TMP_SUFFIX = '.tmp.wav'
+
+# WAV players, in order of preference
+PLAYERS = (['afplay'], ['aplay', '-q'], ['paplay'])
+
+
+def normalize(text):
+    return ' '.join(text.split())
+
+
+class ClipPlayer:
+    """Play WAV files through the first installed command-line player"""
+
+    def __init__(self):
+        self.command = next((player for player in PLAYERS if shutil.which(player[0])), None)
+        self.process = None
+        self.interrupted = False
+
+    @property
+    def available(self):
+        return self.command is not None
+
+    def play(self, path):
+        """Play a clip and block until done; False if stop() interrupted it"""
+        self.interrupted = False
+        self.process = subprocess.Popen(self.command + [path], stdout=subprocess.DEVNULL,
+                                        stderr=subprocess.DEVNULL)
+        self.process.wait()
+        return not self.interrupted and self.process.returncode == 0
+
+    def stop(self):
+        process = self.process
+        if process and process.poll() is None:
+            self.interrupted = True
+            process.terminate()
+
+
+class TTSCache:
+    """Content-addressed WAV clips with least-recently-played eviction under a size cap"""
+
+    def __init__(self, directory=TTS_CACHE_DIR, max_bytes=TTS_CACHE_MB * 1024 * 1024, max_tracked=512):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_tracked = max_tracked
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()  # key → size in bytes, least recently played first
+        self.seen = OrderedDict()  # key → times spoken without a clip, for phrases not cached yet
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        os.makedirs(directory, exist_ok=True)
+        self.load()
+
+    def load(self):
+        """Index clips left by earlier runs, oldest first; half-rendered clips from a crash are deleted"""
+        clips = []
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if name.endswith(TMP_SUFFIX):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            elif name.endswith('.wav'):
+                stat = os.stat(path)
+                clips.append((stat.st_mtime, name[:-4], stat.st_size))
+        for _, key, size in sorted(clips):
+            self.entries[key] = size
+
+    @property
+    def size(self):
+        return sum(self.entries.values())
+
+    def key(self, text, voice):
+        return hashlib.sha256(f"{voice}\n{normalize(text)}".encode()).hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.directory, f"{key}.wav")
+
+    def get(self, text, voice):
+        """Path of the clip for this text and voice, or None; marks it recently played"""
+        key = self.key(text, voice)
+        with self.lock:
+            if key not in self.entries:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+        path = self.path(key)
+        try:
+            os.utime(path)  # Keeps the LRU order across restarts
+        except OSError:
+            with self.lock:
+                self.entries.pop(key, None)  # Deleted behind our back
+            return None
+        return path
+
+    def contains(self, text, voice):
+        with self.lock:
+            return self.key(text, voice) in self.entries
+
+    def repeated(self, text, voice):
+        """Note that text was spoken live; True once it has come up before and deserves a clip"""
+        key = self.key(text, voice)
+        with self.lock:
+            count = self.seen.pop(key, 0) + 1
+            self.seen[key] = count
+            while len(self.seen) > self.max_tracked:
+                self.seen.popitem(last=False)
+            return count >= 2
+
+    def render(self, text, voice, render):
+        """Create the clip with render(text, path) unless it already exists"""
+        key = self.key(text, voice)
+        if self.contains(text, voice):
+            return self.path(key)
+        path = self.path(key)
+        tmp_path = path + TMP_SUFFIX
+        try:
+            render(text, tmp_path)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        with self.lock:
+            self.seen.pop(key, None)
+            self.entries[key] = os.path.getsize(path)
+            self.evict()
+        return path
+
+    def evict(self):
+        """Delete least recently played clips until the cache fits (lock held)"""
+        while len(self.entries) > 1 and sum(self.entries.values()) > self.max_bytes:
+            key, _ = self.entries.popitem(last=False)
+            self.evictions += 1
+            try:
+                os.remove(self.path(key))
+            except OSError:
+                pass
+
+    def stats(self):
+        with self.lock:
+            return {
+                'clips': len(self.entries),
+                'bytes': sum(self.entries.values()),
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
@@ -0,0 +1,480 @@
+#!/usr/bin/env python3
+"""
+Single-owner text-to-speech worker
+
+One thread owns one long-lived speech engine and speaks queued utterances
+one at a time, so speech never overlaps and no thread or engine is created
+per utterance. The queue is small and prioritised:
+
+- REPLY (answers to the user) go first and interrupt narration that is
+  being spoken; narration queued before the question is discarded
+- NARRATION (scene descriptions) is coalesced: a new narration replaces any
+  older one still waiting, and narration that has waited longer than
+  TTS_STALE_AFTER is skipped, since it describes a scene that has moved on
+
+Sentences streamed from one response share a group (see stream()), so
+coalescing never drops the middle of the description being read out.
+
+With a TTSCache (tts_cache.py), phrases that have been rendered to WAV play
+from disk instead of being synthesized again; the worker renders repeated
+and pre-registered phrases while it has nothing to say.
+
+Backends:
+- say:     macOS `say` (one process per utterance; it has no persistent mode)
+- espeak:  one long-running `espeak-ng` process reading an utterance per
+           line from stdin (Linux; apt install espeak-ng)
+- pyttsx3: one pyttsx3 engine, created on and only used by the worker thread
+"""
+import functools
+import os
+import shutil
+import subprocess
+import threading
+import time
+from collections import deque
+
+from dotenv import load_dotenv
+
+from lazy_import import lazy_import
+from startup import require_command
+from tts_cache import TTS_CACHE, ClipPlayer, TTSCache
+
+pyttsx3 = lazy_import('pyttsx3')
+
+load_dotenv()
+
+TTS_BACKEND = os.getenv('TTS_BACKEND', 'auto').lower()  # 'auto', 'say', 'espeak' or 'pyttsx3'
+TTS_RATE = int(os.getenv('TTS_RATE', 175))  # Words per minute
+TTS_QUEUE = int(os.getenv('TTS_QUEUE', 8))  # Utterances waiting to be spoken
+TTS_STALE_AFTER = float(os.getenv('TTS_STALE_AFTER', 10))  # Seconds before queued narration is skipped
+TTS_TIMEOUT = float(os.getenv('TTS_TIMEOUT', 30))  # Longest a single utterance may play
+
+REPLY = 0
+NARRATION = 1
+
+
+class TTSBackend:
+    """Base class: start the engine once, then speak one utterance at a time"""
+
+    name = 'base'
+    label = 'base'
+    rate = TTS_RATE
+
+    @property
+    def voice(self):
+        """Identifies how this backend sounds, so cached clips from another voice aren't reused"""
+        return f"{self.name}@{self.rate}"
+
+    def start(self):
+        """Called once, on the worker thread, before the first utterance"""
+
+    def speak(self, text):
+        """Speak and block until done; False if stop() interrupted it"""
+        raise NotImplementedError
+
+    def render(self, text, path):
+        """Synthesize text into a WAV file instead of playing it (worker thread only)"""
+        raise NotImplementedError
+
+    def stop(self):
+        """Interrupt the current utterance (called from other threads)"""
+
+    def close(self):
+        self.stop()
+
+
+class SayBackend(TTSBackend):
+    """macOS `say`, one process per utterance"""
+
+    name = 'say'
+    label = "macOS 'say' command"
+
+    def __init__(self, rate=TTS_RATE):
+        self.rate = rate
+        self.process = None
+        self.interrupted = False
+
+    def start(self):
+        require_command('say')
+
+    def speak(self, text):
+        self.interrupted = False
+        self.process = subprocess.Popen(['say', '-r', str(self.rate), text])
+        self.process.wait()
+        return not self.interrupted
+
+    def render(self, text, path):
+        subprocess.run(['say', '-r', str(self.rate), '-o', path, '--file-format=WAVE',
+                        '--data-format=LEI16@22050', text], check=True, timeout=TTS_TIMEOUT)
+
+    def stop(self):
+        process = self.process
+        if process and process.poll() is None:
+            self.interrupted = True
+            process.terminate()
+
+
+class EspeakBackend(TTSBackend):
+    """One persistent espeak-ng process reading an utterance per line from stdin"""
+
+    name = 'espeak'
+    label = "espeak-ng (persistent process)"
+
+    def __init__(self, rate=TTS_RATE):
+        self.rate = rate
+        self.command = None
+        self.process = None
+        self.lock = threading.Lock()
+        self.interrupted = threading.Event()
+
+    def start(self):
+        self.command = shutil.which('espeak-ng') or require_command('espeak')
+        self.spawn()
+
+    def arguments(self):
+        # No text and no --stdin: espeak-ng then speaks stdin line by line (--stdin would wait for EOF)
+        return [self.command, '-s', str(self.rate)]
+
+    def spawn(self):
+        self.process = subprocess.Popen(self.arguments(), stdin=subprocess.PIPE,
+                                        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, text=True)
+
+    def duration(self, line):
+        """How long espeak takes to say a line at our rate"""
+        return len(line.split()) * 60 / self.rate + 0.3
+
+    def speak(self, text):
+        line = ' '.join(text.split())
+        self.interrupted.clear()
+        with self.lock:
+            if self.process is None or self.process.poll() is not None:
+                self.spawn()  # First use, or stopped to interrupt the last utterance
+            self.process.stdin.write(line + '\n')
+            self.process.stdin.flush()
+        # espeak queues lines and plays them without reporting when one ends, so wait out its length
+        return not self.interrupted.wait(self.duration(line))
+
+    def render(self, text, path):
+        # A separate one-shot process, so a render never queues behind or cuts off the live stream
+        subprocess.run([self.command, '-s', str(self.rate), '-w', path, text], stdout=subprocess.DEVNULL,
+                       stderr=subprocess.DEVNULL, check=True, timeout=TTS_TIMEOUT)
+
+    def stop(self):
+        self.interrupted.set()
+        with self.lock:
+            # Dropping the process drops whatever it still had to say; the next utterance respawns it
+            if self.process and self.process.poll() is None:
+                self.process.kill()
+                self.process.wait()
+            self.process = None
+
+
+class Pyttsx3Backend(TTSBackend):
+    """One pyttsx3 engine, used only from the worker thread"""
+
+    name = 'pyttsx3'
+    label = "pyttsx3"
+
+    def __init__(self, rate=TTS_RATE):
+        self.rate = rate
+        self.engine = None
+        self.interrupted = False
+
+    def start(self):
+        self.engine = pyttsx3.init()
+        self.engine.setProperty('rate', self.rate)
+        # The engine isn't thread-safe, so stop() only raises a flag that the engine's own loop acts on
+        self.engine.connect('started-word', self.check_interrupted)
+
+    def check_interrupted(self, name, location, length):
+        if self.interrupted:
+            self.engine.stop()
+
+    def speak(self, text):
+        self.interrupted = False
+        self.engine.say(text)
+        self.engine.runAndWait()
+        return not self.interrupted
+
+    def render(self, text, path):
+        self.engine.save_to_file(text, path)
+        self.engine.runAndWait()
+        if not os.path.exists(path):
+            raise RuntimeError("engine wrote no audio")
+
+    def stop(self):
+        self.interrupted = True
+
+
+BACKENDS = {
+    'say': SayBackend,
+    'espeak': EspeakBackend,
+    'pyttsx3': Pyttsx3Backend,
+}
+
+
+class Utterance:
+    """Text waiting to be spoken"""
+
+    def __init__(self, text, priority, group, sequence):
+        self.text = text
+        self.priority = priority
+        self.group = group
+        self.sequence = sequence
+        self.queued_at = time.monotonic()
+
+
+class TTSWorker:
+    """Speak queued utterances one at a time on the thread that owns the engine"""
+
+    def __init__(self, backend, metrics=None, max_pending=TTS_QUEUE, stale_after=TTS_STALE_AFTER,
+                 timeout=TTS_TIMEOUT, cache=None, player=None):
+        self.backend = backend
+        self.metrics = metrics
+        self.cache = cache
+        self.player = player if cache else None
+        self.max_pending = max(1, max_pending)
+        self.stale_after = stale_after
+        self.timeout = timeout
+
+        self.pending = []  # Sorted by (priority, sequence)
+        self.renders = deque()  # Phrases to render into the cache while idle
+        self.current = None
+        self.rendering = None
+        self.sequence = 0
+        self.condition = threading.Condition()
+        self.running = True
+        self.started = threading.Event()
+        self.start_error = None
+        self.thread = None
+
+        self.outcomes = dict.fromkeys(('spoken', 'interrupted', 'coalesced', 'stale', 'dropped', 'failed'), 0)
+        self.max_queued = 0
+
+    def start(self):
+        """Start the worker thread and its engine; raises if the engine can't start"""
+        self.thread = threading.Thread(target=self.run, daemon=True, name='tts')
+        self.thread.start()
+        self.started.wait()
+        if self.start_error:
+            raise self.start_error
+        return self
+
+    def say(self, text, priority=NARRATION, group=None):
+        """Queue text to be spoken; never waits for speech"""
+        text = (text or '').strip()
+        if not text:
+            return
+        interrupted = None
+        with self.condition:
+            if not self.running:
+                return
+            self.sequence += 1
+            utterance = Utterance(text, priority, group if group is not None else self.sequence, self.sequence)
+            if priority == REPLY:
+                # The user is waiting: stop narrating, and forget narration from before the question
+                self.discard(lambda u: u.priority == NARRATION, 'coalesced')
+                if self.current is not None and self.current.priority == NARRATION:
+                    interrupted = self.current
+            else:
+                # Only the newest narration is worth saying
+                self.discard(lambda u: u.priority == NARRATION and u.group != utterance.group, 'coalesced')
+
+            if len(self.pending) >= self.max_pending:
+                narration = [u for u in self.pending if u.priority == NARRATION]
+                if not narration:
+                    self.count('dropped')  # Full of replies: keep the ones already queued
+                    return
+                self.pending.remove(narration[0])
+                self.count('dropped')
+            self.pending.append(utterance)
+            self.pending.sort(key=lambda u: (u.priority, u.sequence))
+            self.max_queued = max(self.max_queued, len(self.pending))
+            self.condition.notify_all()
+        if interrupted:
+            self.interrupt(interrupted)
+
+    def prerender(self, texts):
+        """Render phrases into the cache in the background, whenever nothing is waiting to be spoken"""
+        if not self.player:
+            return
+        with self.condition:
+            for text in texts:
+                if text and text not in self.renders and not self.cache.contains(text, self.backend.voice):
+                    self.renders.append(text)
+            self.condition.notify_all()
+
+    def interrupt(self, utterance=None):
+        """Cut off whatever is playing, live speech or a cached clip; given an utterance, only if it's still playing"""
+        # Holding the lock keeps the worker from moving on to the next utterance (say, the reply) meanwhile
+        with self.condition:
+            if utterance is not None and self.current is not utterance:
+                return
+            if self.player:
+                self.player.stop()
+            self.backend.stop()
+
+    def stream(self, priority=NARRATION):
+        """say() for the sentences of one streamed response, kept together as a group"""
+        return functools.partial(self.say, priority=priority, group=object())
+
+    def discard(self, matches, outcome):
+        kept = [u for u in self.pending if not matches(u)]
+        for _ in range(len(self.pending) - len(kept)):
+            self.count(outcome)
+        self.pending = kept
+
+    def count(self, outcome):
+        self.outcomes[outcome] += 1
+        if self.metrics:
+            self.metrics.inc('tts_utterances_total', outcome=outcome)
+
+    def play(self, text):
+        """Play the cached clip if there is one, otherwise synthesize live"""
+        if self.player:
+            voice = self.backend.voice
+            path = self.cache.get(text, voice)
+            if self.metrics:
+                self.metrics.inc('tts_cache_total', result='hit' if path else 'miss')
+            if path:
+                return self.player.play(path)
+            if self.cache.repeated(text, voice):
+                with self.condition:
+                    if text not in self.renders:
+                        self.renders.append(text)
+        return self.backend.speak(text)
+
+    def render(self, text):
+        started = time.perf_counter()
+        try:
+            self.cache.render(text, self.backend.voice, self.backend.render)
+        except Exception as e:
+            print(f"⚠️  Could not cache speech for '{text[:40]}': {e}")
+            return
+        if self.metrics:
+            self.metrics.observe('tts_render', time.perf_counter() - started)
+
+    def run(self):
+        try:
+            self.backend.start()
+        except Exception as e:
+            self.start_error = e
+            self.started.set()
+            return
+        self.started.set()
+
+        while True:
+            with self.condition:
+                while self.running and not self.pending and not self.renders:
+                    self.condition.wait()
+                if not self.running:
+                    break
+                if not self.pending:
+                    self.rendering = self.renders.popleft()
+                else:
+                    utterance = self.pending.pop(0)
+            if self.rendering:
+                # Nothing to say right now, so spend the time filling the cache
+                self.render(self.rendering)
+                with self.condition:
+                    self.rendering = None
+                    self.condition.notify_all()
+                continue
+
+            with self.condition:
+                waited = time.monotonic() - utterance.queued_at
+                if utterance.priority == NARRATION and waited > self.stale_after:
+                    self.count('stale')
+                    self.condition.notify_all()
+                    continue
+                self.current = utterance
+
+            if self.metrics:
+                self.metrics.observe('tts_wait', waited)
+            timer = threading.Timer(self.timeout, self.interrupt, args=(utterance,))  # Cap runaway utterances
+            timer.daemon = True
+            timer.start()
+            started = time.perf_counter()
+            try:
+                outcome = 'spoken' if self.play(utterance.text) else 'interrupted'
+            except Exception as e:
+                outcome = 'failed'
+                print(f"⚠️  Speech playback failed ({self.backend.name}): {e}")
+            finally:
+                timer.cancel()
+            if self.metrics:
+                self.metrics.observe('speak', time.perf_counter() - started)
+
+            with self.condition:
+                self.count(outcome)
+                self.current = None
+                self.condition.notify_all()
+
+        try:
+            self.backend.close()
+        except Exception as e:
+            print(f"⚠️  Could not close speech engine: {e}")
+
+    def join(self, timeout=None):
+        """Block until everything queued has been spoken or skipped"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self.condition:
+            while self.pending or self.current:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self.condition.wait(remaining)
+        return True
+
+    def stats(self):
+        with self.condition:
+            stats = dict(self.outcomes, queued=len(self.pending), max_queued=self.max_queued)
+        if self.player:
+            stats['cache'] = self.cache.stats()
+        return stats
+
+    def stop(self):
+        """Stop speaking and shut the engine down; queued utterances are discarded"""
+        with self.condition:
+            if not self.running:
+                return
+            self.running = False
+            self.renders.clear()
+            self.condition.notify_all()
+        self.interrupt()
+        if self.thread:
+            self.thread.join(timeout=2)
+
+
+def open_cache():
+    """The on-disk clip cache and a player for it, or (None, None) when disabled or nothing can play WAV"""
+    if not TTS_CACHE:
+        return None, None
+    player = ClipPlayer()
+    if not player.available:
+        print("⚠️  No WAV player (afplay, aplay, paplay) found, speech caching disabled")
+        return None, None
+    try:
+        return TTSCache(), player
+    except OSError as e:
+        print(f"⚠️  Speech cache unavailable: {e}")
+        return None, None
+
+
+def start_tts(name=TTS_BACKEND, metrics=None):
+    """Start a TTSWorker on the named backend, falling back to the other installed ones"""
+    cache, player = open_cache()
+    names = list(BACKENDS) if name == 'auto' else [name] + [n for n in BACKENDS if n != name]
+    errors = []
+    for candidate in names:
+        if candidate not in BACKENDS:
+            raise ValueError(f"Unknown TTS backend '{candidate}', choose from auto, {', '.join(BACKENDS)}")
+        try:
+            worker = TTSWorker(BACKENDS[candidate](), metrics, cache=cache, player=player).start()
+        except Exception as e:
+            errors.append(f"{candidate}: {e}")
+            continue
+        if errors and name != 'auto':
+            print(f"⚠️  {name} speech unavailable ({errors[0]}), using {worker.backend.label}")
+        return worker
+    raise RuntimeError(f"no speech engine available ({'; '.join(errors)})")